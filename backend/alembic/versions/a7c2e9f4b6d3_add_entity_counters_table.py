@@ -0,0 +1,60 @@
+"""add entity_counters table
+
+Revision ID: a7c2e9f4b6d3
+Revises: f6a4c9e2d8b1
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c2e9f4b6d3'
+down_revision: Union[str, Sequence[str], None] = 'f6a4c9e2d8b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'entity_counters',
+        sa.Column('scope', sa.String(length=16), nullable=False),
+        sa.Column('scope_id', sa.String(length=64), nullable=False, server_default=''),
+        sa.Column('kind', sa.String(length=32), nullable=False),
+        sa.Column('value', sa.BigInteger(), nullable=False, server_default=sa.text('0')),
+        sa.PrimaryKeyConstraint('scope', 'scope_id', 'kind'),
+    )
+    # Backfill from the rows that exist today
+    op.execute(
+        """
+        INSERT INTO entity_counters (scope, scope_id, kind, value)
+        SELECT 'system', '', 'order', COUNT(*) FROM orders
+        UNION ALL
+        SELECT 'warehouse', warehouse_id::text, 'order', COUNT(*) FROM orders GROUP BY warehouse_id
+        UNION ALL
+        SELECT 'customer', customer_id::text, 'order', COUNT(*) FROM orders GROUP BY customer_id
+        UNION ALL
+        SELECT 'system', '', 'product', COUNT(*) FROM products
+        UNION ALL
+        SELECT 'vendor', vendor_id::text, 'product', COUNT(*) FROM products GROUP BY vendor_id
+        UNION ALL
+        SELECT 'system', '', 'store', COUNT(*) FROM stores
+        UNION ALL
+        SELECT 'vendor', vendor_id::text, 'store', COUNT(*) FROM stores GROUP BY vendor_id
+        UNION ALL
+        SELECT 'system', '', 'vendor', COUNT(*) FROM vendors
+        UNION ALL
+        SELECT 'system', '', 'user', COUNT(*) FROM users
+        UNION ALL
+        SELECT 'warehouse', warehouse_id::text, 'user', COUNT(*) FROM users
+            WHERE warehouse_id IS NOT NULL GROUP BY warehouse_id
+        UNION ALL
+        SELECT 'system', '', 'customer', COUNT(*) FROM customers
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('entity_counters')
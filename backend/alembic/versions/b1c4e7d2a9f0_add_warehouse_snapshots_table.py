@@ -0,0 +1,32 @@
+"""add warehouse_snapshots table
+
+Revision ID: b1c4e7d2a9f0
+Revises: 91d0b8359bc5
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b1c4e7d2a9f0'
+down_revision: Union[str, Sequence[str], None] = '91d0b8359bc5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'warehouse_snapshots',
+        sa.Column('warehouse_id', sa.UUID(), sa.ForeignKey('warehouses.id', ondelete='CASCADE'), primary_key=True, nullable=False),
+        sa.Column('bin_stats', postgresql.JSONB(astext_type=sa.Text()), nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column('inbound_kpis', postgresql.JSONB(astext_type=sa.Text()), nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column('refreshed_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('warehouse_snapshots')
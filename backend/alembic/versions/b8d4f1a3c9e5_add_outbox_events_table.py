@@ -0,0 +1,38 @@
+"""add outbox_events table
+
+Revision ID: b8d4f1a3c9e5
+Revises: a7c2e9f4b6d3
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d4f1a3c9e5'
+down_revision: Union[str, Sequence[str], None] = 'a7c2e9f4b6d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'outbox_events',
+        sa.Column('id', sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column('event_type', sa.String(length=64), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('available_at', sa.DateTime(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default=sa.text('0')),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_outbox_events_available_at_id', 'outbox_events', ['available_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outbox_events_available_at_id', table_name='outbox_events')
+    op.drop_table('outbox_events')
@@ -0,0 +1,61 @@
+"""add inbound_kpi_counters table
+
+Revision ID: c3d8f1a6b2e4
+Revises: b1c4e7d2a9f0
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d8f1a6b2e4'
+down_revision: Union[str, Sequence[str], None] = 'b1c4e7d2a9f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'inbound_kpi_counters',
+        sa.Column('warehouse_id', sa.UUID(), sa.ForeignKey('warehouses.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('metric', sa.String(length=32), nullable=False),
+        sa.Column('value', sa.BigInteger(), nullable=False, server_default=sa.text('0')),
+        sa.PrimaryKeyConstraint('warehouse_id', 'day', 'metric'),
+    )
+    # Backfill from existing receipts. Running totals use the sentinel day 1970-01-01
+    # (app.services.inbound_kpi_counters.TOTALS_DAY); completions are attributed to
+    # the day the receipt was last updated, as the old live KPI did.
+    op.execute(
+        """
+        INSERT INTO inbound_kpi_counters (warehouse_id, day, metric, value)
+        SELECT warehouse_id, day, metric, SUM(n) FROM (
+            SELECT warehouse_id, DATE '1970-01-01' AS day, 'total' AS metric, 1 AS n FROM inbound_receipts
+            UNION ALL
+            SELECT warehouse_id, DATE '1970-01-01', lower(vendor_type::text), 1 FROM inbound_receipts
+            UNION ALL
+            SELECT warehouse_id, DATE '1970-01-01', 'open', 1 FROM inbound_receipts
+                WHERE status NOT IN ('COMPLETED', 'CANCELLED')
+            UNION ALL
+            SELECT warehouse_id, DATE '1970-01-01', 'pending', 1 FROM inbound_receipts
+                WHERE status = 'AWAITING_UNLOADING'
+            UNION ALL
+            SELECT warehouse_id, DATE '1970-01-01', 'allocated', 1 FROM inbound_receipts
+                WHERE status = 'ALLOCATED'
+            UNION ALL
+            SELECT warehouse_id, updated_at::date, 'completed', 1 FROM inbound_receipts
+                WHERE status = 'COMPLETED'
+            UNION ALL
+            SELECT warehouse_id, planned_arrival::date, 'open_planned', 1 FROM inbound_receipts
+                WHERE planned_arrival IS NOT NULL AND status NOT IN ('COMPLETED', 'CANCELLED')
+        ) AS contributions
+        GROUP BY warehouse_id, day, metric
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('inbound_kpi_counters')
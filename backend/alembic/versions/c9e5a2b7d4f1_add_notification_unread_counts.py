@@ -0,0 +1,41 @@
+"""add notification_unread_counts table
+
+Revision ID: c9e5a2b7d4f1
+Revises: b8d4f1a3c9e5
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e5a2b7d4f1'
+down_revision: Union[str, Sequence[str], None] = 'b8d4f1a3c9e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'notification_unread_counts',
+        sa.Column('user_id', sa.UUID(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('value', sa.BigInteger(), nullable=False, server_default=sa.text('0')),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+    op.create_index(
+        'ix_notifications_user_unread', 'notifications', ['user_id'],
+        postgresql_where=sa.text('NOT is_read'),
+    )
+    op.execute(
+        """
+        INSERT INTO notification_unread_counts (user_id, value)
+        SELECT user_id, COUNT(*) FROM notifications WHERE NOT is_read GROUP BY user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notifications_user_unread', table_name='notifications')
+    op.drop_table('notification_unread_counts')
@@ -0,0 +1,27 @@
+"""index stores.vendor_id and store_products.store_id
+
+Revision ID: d1f6b3c8e2a7
+Revises: c9e5a2b7d4f1
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1f6b3c8e2a7'
+down_revision: Union[str, Sequence[str], None] = 'c9e5a2b7d4f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Used by the grouped vendor summary (GET /vendors/summary)
+    op.create_index(op.f('ix_stores_vendor_id'), 'stores', ['vendor_id'], unique=False)
+    op.create_index(op.f('ix_store_products_store_id'), 'store_products', ['store_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_store_products_store_id'), table_name='store_products')
+    op.drop_index(op.f('ix_stores_vendor_id'), table_name='stores')
@@ -0,0 +1,44 @@
+"""add inbound receipt list indexes
+
+Revision ID: d4e2a7c9f1b3
+Revises: c3d8f1a6b2e4
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e2a7c9f1b3'
+down_revision: Union[str, Sequence[str], None] = 'c3d8f1a6b2e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keyset pagination on (created_at, id), optionally filtered by warehouse/status
+    op.create_index('ix_inbound_receipts_created_at_id', 'inbound_receipts', ['created_at', 'id'])
+    op.create_index(
+        'ix_inbound_receipts_warehouse_status_created_at',
+        'inbound_receipts',
+        ['warehouse_id', 'status', 'created_at'],
+    )
+    # Substring search on code/reference: func.lower(col).like('%term%')
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_inbound_receipts_code_trgm "
+        "ON inbound_receipts USING gin (lower(code) gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_inbound_receipts_reference_trgm "
+        "ON inbound_receipts USING gin (lower(reference) gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_inbound_receipts_reference_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_inbound_receipts_code_trgm")
+    op.drop_index('ix_inbound_receipts_warehouse_status_created_at', table_name='inbound_receipts')
+    op.drop_index('ix_inbound_receipts_created_at_id', table_name='inbound_receipts')
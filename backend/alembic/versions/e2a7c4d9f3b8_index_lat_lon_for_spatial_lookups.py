@@ -0,0 +1,29 @@
+"""index latitude/longitude for spatial lookups
+
+Revision ID: e2a7c4d9f3b8
+Revises: d1f6b3c8e2a7
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a7c4d9f3b8'
+down_revision: Union[str, Sequence[str], None] = 'd1f6b3c8e2a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Bounding-box prefilter of app.services.spatial_index
+    op.create_index('ix_stores_lat_lon', 'stores', ['latitude', 'longitude'], unique=False)
+    op.create_index('ix_warehouses_lat_lon', 'warehouses', ['latitude', 'longitude'], unique=False)
+    op.create_index('ix_communities_lat_lon', 'communities', ['latitude', 'longitude'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_communities_lat_lon', table_name='communities')
+    op.drop_index('ix_warehouses_lat_lon', table_name='warehouses')
+    op.drop_index('ix_stores_lat_lon', table_name='stores')
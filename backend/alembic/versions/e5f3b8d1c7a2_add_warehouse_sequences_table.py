@@ -0,0 +1,63 @@
+"""add warehouse_sequences table
+
+Revision ID: e5f3b8d1c7a2
+Revises: d4e2a7c9f1b3
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f3b8d1c7a2'
+down_revision: Union[str, Sequence[str], None] = 'd4e2a7c9f1b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# kind -> (WarehouseConfig.data key, max value); mirrors app.services.sequences.KINDS
+_KINDS = {
+    'crate': ('nextCrateSeq', 9999),
+    'rack': ('nextRackSeq', 999),
+    'receipt': ('nextReceiptSeq', 999999),
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        'warehouse_sequences',
+        sa.Column('warehouse_id', sa.UUID(), sa.ForeignKey('warehouses.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('kind', sa.String(length=16), nullable=False),
+        sa.Column('next_value', sa.Integer(), nullable=False),
+        sa.Column('max_value', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('warehouse_id', 'kind'),
+    )
+    # Seed from the counters currently kept in the warehouse config JSON
+    for kind, (key, max_value) in _KINDS.items():
+        op.execute(
+            f"""
+            INSERT INTO warehouse_sequences (warehouse_id, kind, next_value, max_value)
+            SELECT warehouse_id, '{kind}',
+                   CASE WHEN data->>'{key}' ~ '^[0-9]+$'
+                             AND (data->>'{key}')::bigint BETWEEN 1 AND {max_value}
+                        THEN (data->>'{key}')::int ELSE 1 END,
+                   {max_value}
+            FROM warehouse_configs
+            ON CONFLICT DO NOTHING
+            """
+        )
+
+
+def downgrade() -> None:
+    # Copy counters back into the JSON so the row-lock consumers resume where we stopped
+    for kind, (key, _max_value) in _KINDS.items():
+        op.execute(
+            f"""
+            UPDATE warehouse_configs c
+            SET data = jsonb_set(c.data, '{{{key}}}', to_jsonb(s.next_value))
+            FROM warehouse_sequences s
+            WHERE s.warehouse_id = c.warehouse_id AND s.kind = '{kind}'
+            """
+        )
+    op.drop_table('warehouse_sequences')
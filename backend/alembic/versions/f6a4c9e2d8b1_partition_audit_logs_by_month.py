@@ -0,0 +1,99 @@
+"""partition audit_logs by month
+
+Revision ID: f6a4c9e2d8b1
+Revises: e5f3b8d1c7a2
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6a4c9e2d8b1'
+down_revision: Union[str, Sequence[str], None] = 'e5f3b8d1c7a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_legacy")
+    op.execute("ALTER TABLE audit_logs_legacy RENAME CONSTRAINT audit_logs_pkey TO audit_logs_legacy_pkey")
+    op.execute(
+        """
+        CREATE TABLE audit_logs (
+            id UUID NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            actor_user_id UUID NOT NULL REFERENCES users (id),
+            entity_type VARCHAR NOT NULL,
+            entity_id VARCHAR,
+            action VARCHAR NOT NULL,
+            changes JSONB NOT NULL,
+            CONSTRAINT audit_logs_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    # One partition per month from the oldest row through two months ahead
+    op.execute(
+        """
+        DO $$
+        DECLARE m date;
+        BEGIN
+            FOR m IN
+                SELECT generate_series(
+                    date_trunc('month', LEAST(COALESCE((SELECT min(created_at) FROM audit_logs_legacy), now()), now())),
+                    date_trunc('month', now()) + interval '2 months',
+                    interval '1 month'
+                )::date
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF audit_logs FOR VALUES FROM (%L) TO (%L)',
+                    'audit_logs_y' || to_char(m, 'YYYY') || 'm' || to_char(m, 'MM'),
+                    m, (m + interval '1 month')::date
+                );
+            END LOOP;
+        END $$;
+        """
+    )
+    # Catches rows beyond the newest partition if the maintenance job falls behind
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+    op.execute(
+        """
+        INSERT INTO audit_logs (id, created_at, actor_user_id, entity_type, entity_id, action, changes)
+        SELECT id, created_at, actor_user_id, entity_type, entity_id, action, changes::jsonb
+        FROM audit_logs_legacy
+        """
+    )
+    op.execute("DROP TABLE audit_logs_legacy")
+    # Created on the parent, so every partition gets them
+    op.create_index('ix_audit_logs_entity_created', 'audit_logs', ['entity_type', 'entity_id', 'created_at'])
+    op.create_index('ix_audit_logs_actor_created', 'audit_logs', ['actor_user_id', 'created_at'])
+    op.create_index('ix_audit_logs_created_at', 'audit_logs', ['created_at'])
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_partitioned")
+    op.execute("ALTER TABLE audit_logs_partitioned RENAME CONSTRAINT audit_logs_pkey TO audit_logs_partitioned_pkey")
+    op.execute(
+        """
+        CREATE TABLE audit_logs (
+            id UUID NOT NULL,
+            actor_user_id UUID NOT NULL REFERENCES users (id),
+            entity_type VARCHAR NOT NULL,
+            entity_id VARCHAR,
+            action VARCHAR NOT NULL,
+            changes JSON NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            CONSTRAINT audit_logs_pkey PRIMARY KEY (id)
+        )
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO audit_logs (id, actor_user_id, entity_type, entity_id, action, changes, created_at)
+        SELECT id, actor_user_id, entity_type, entity_id, action, changes::json, created_at
+        FROM audit_logs_partitioned
+        """
+    )
+    # Drops the attached partitions with it
+    op.execute("DROP TABLE audit_logs_partitioned")
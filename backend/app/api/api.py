@@ -1,7 +1,7 @@
 # filepath: backend/app/api/api.py
 from fastapi import APIRouter
 
-from app.api.endpoints import users, communities, customers, addresses, warehouses, products, login, orders, vendors, milestone, crates, racks, bins, notifications, stores, config, inbound, drivers, vehicles, bays, outbound
+from app.api.endpoints import users, communities, customers, addresses, warehouses, products, login, orders, vendors, milestone, crates, racks, bins, notifications, stores, config, inbound, drivers, vehicles, bays, outbound, audit
 
 api_router = APIRouter()
 api_router.include_router(login.router, tags=["Login"])
@@ -24,4 +24,5 @@ api_router.include_router(config.router, tags=["Configuration"])
 api_router.include_router(inbound.router)
 api_router.include_router(drivers.router, prefix="/drivers", tags=["Drivers"])
 api_router.include_router(vehicles.router, prefix="/vehicles", tags=["Vehicles"])
-api_router.include_router(outbound.router, tags=["Outbound"])
\ No newline at end of file
+api_router.include_router(outbound.router, tags=["Outbound"])
+api_router.include_router(audit.router)
\ No newline at end of file
@@ -1,17 +1,17 @@
 # filepath: backend/app/api/deps.py
-from typing import Generator, Annotated
+from typing import AsyncGenerator, Generator, Annotated
 import uuid
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt
-from jose.exceptions import ExpiredSignatureError
-from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import logging
 
 from app import crud, models, schemas
-from app.core import security
+from app.core.auth_cache import Principal, principals
+from app.core.auth_context import AuthContext
 from app.core.config import settings
+from app.db.async_session import AsyncSessionLocal
 from app.db.session import SessionLocal
 from fastapi import Request
 
@@ -27,44 +27,99 @@ def get_db() -> Generator:
         yield db
     finally:
         db.close()
-        
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _decode_token(request: Request, token: str) -> schemas.TokenPayload:
+    """Token payload decoded once by AuthContextMiddleware (decoded here if absent)."""
+    ctx = getattr(request.state, "auth", None)
+    if ctx is None or ctx.token != token:
+        ctx = AuthContext.from_token(token)
+    if ctx.error is not None:
+        if ctx.error.status_code == status.HTTP_401_UNAUTHORIZED:
+            # Avoid stack trace spam for expected expiry events
+            log.warning("Token expired.")
+        else:
+            log.error("Rejected bearer token: %s", ctx.error.detail)
+        raise ctx.error
+    return ctx.payload
+
+
 def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
+    request: Request, db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
 ) -> models.User:
-    if not token or token.count('.') != 2:
-        log.error("Invalid token format: Token must have exactly 2 dots.")
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Invalid token format",
-        )
-    try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
-        )
-        token_data = schemas.TokenPayload(**payload)
-    except ExpiredSignatureError:
-        # Avoid stack trace spam for expected expiry events
-        log.warning("Token expired.")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token expired",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    except (jwt.JWTError, ValidationError):
-        log.error("Error decoding token or validating token schema.", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Could not validate credentials",
-        )
-    log.info(f"Token decoded for user_id: {token_data.sub}")
+    token_data = _decode_token(request, token)
+    log.debug("Token decoded for user_id: %s", token_data.sub)
     user = crud.user.get(db, id=token_data.sub)
     if not user:
-        log.warning(f"User with id {token_data.sub} not found in database.")
+        log.warning("User with id %s not found in database.", token_data.sub)
         raise HTTPException(status_code=404, detail="User not found")
-    log.info(f"User {user.email} (id: {user.id}) found in database.")
+    principals.put(Principal.from_user(user))
     return user
 
 
+def get_current_principal(
+    request: Request, db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
+) -> Principal:
+    """Authenticated principal from the process cache; the DB is only hit on a miss.
+
+    ``db`` checks out a connection lazily, so a cache hit never touches the pool.
+    """
+    token_data = _decode_token(request, token)
+    principal = principals.get(token_data.sub)
+    if principal is not None:
+        return principal
+    user = crud.user.get(db, id=token_data.sub)
+    if not user:
+        log.warning("User with id %s not found in database.", token_data.sub)
+        raise HTTPException(status_code=404, detail="User not found")
+    principal = Principal.from_user(user)
+    principals.put(principal)
+    return principal
+
+
+def get_current_active_principal(
+    principal: Principal = Depends(get_current_principal),
+) -> Principal:
+    if not principal.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return principal
+
+
+async def get_current_principal_async(
+    request: Request,
+    token: str = Depends(reusable_oauth2),
+    db: AsyncSession = Depends(get_async_db),
+) -> Principal:
+    """``get_current_principal`` for async endpoints: a cache miss awaits the lookup instead of using a thread."""
+    token_data = _decode_token(request, token)
+    principal = principals.get(token_data.sub)
+    if principal is not None:
+        return principal
+    try:
+        user = await db.get(models.User, uuid.UUID(str(token_data.sub)))
+    except ValueError:
+        user = None
+    if not user:
+        log.warning("User with id %s not found in database.", token_data.sub)
+        raise HTTPException(status_code=404, detail="User not found")
+    principal = Principal.from_user(user)
+    principals.put(principal)
+    return principal
+
+
+async def get_current_active_principal_async(
+    principal: Principal = Depends(get_current_principal_async),
+) -> Principal:
+    if not principal.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return principal
+
+
 def get_current_active_user(
     current_user: models.User = Depends(get_current_user),
 ) -> models.User:
@@ -85,16 +140,18 @@ def get_current_active_superuser(
     return current_user
 
 
-def ensure_not_viewer_for_write(request: Request, current_user: models.User = Depends(get_current_active_user)) -> None:
+def ensure_not_viewer_for_write(request: Request, principal: Principal = Depends(get_current_active_principal)) -> None:
     """Deny non-GET methods for VIEWER accounts."""
     if request.method.upper() in {"POST", "PUT", "PATCH", "DELETE"}:
-        role = str(getattr(current_user, "role", "")).upper()
-        if role == "VIEWER":
+        if principal.role == "VIEWER":
             raise HTTPException(status_code=403, detail="VIEWER cannot modify data")
 
 
-def get_effective_warehouse_id(current_user: models.User = Depends(get_current_active_user)) -> uuid.UUID | None:
-    """Return the warehouse_id to scope queries for non-admins; admins are global."""
+def get_effective_warehouse_id(current_user: Principal = Depends(get_current_active_principal)) -> uuid.UUID | None:
+    """Return the warehouse_id to scope queries for non-admins; admins are global.
+
+    Accepts a Principal (as a dependency) or a User (when called directly).
+    """
     role = str(getattr(current_user, "role", "")).upper()
     if role == "ADMIN":
         return None
@@ -46,9 +46,9 @@ def create_address(
     """
     Create new address.
     """
-    logger.info(f"📝 User '{current_user.id}' creating new address")
+    logger.info("📝 User '%s' creating new address", current_user.id)
     address = crud.address.create(db, obj_in=address_in)
-    logger.info(f"✅ Address '{address.id}' created successfully by user '{current_user.id}'.")
+    logger.info("✅ Address '%s' created successfully by user '%s'.", address.id, current_user.id)
     return address
 
 @router.get("/{address_id}", response_model=schemas.Address)
@@ -61,10 +61,10 @@ def read_address(
     """
     Get address by ID.
     """
-    logger.info(f"🔎 User '{current_user.id}' requesting address '{address_id}'.")
+    logger.info("🔎 User '%s' requesting address '%s'.", current_user.id, address_id)
     address = crud.address.get(db, id=address_id)
     if not address:
-        logger.warning(f"❌ Address '{address_id}' not found for request from user '{current_user.id}'.")
+        logger.warning("❌ Address '%s' not found for request from user '%s'.", address_id, current_user.id)
         raise HTTPException(status_code=404, detail="Address not found")
     return address
 
@@ -79,13 +79,13 @@ def update_address(
     """
     Update an address.
     """
-    logger.info(f"📝 User '{current_user.id}' attempting to update address '{address_id}'.")
+    logger.info("📝 User '%s' attempting to update address '%s'.", current_user.id, address_id)
     address = crud.address.get(db, id=address_id)
     if not address:
-        logger.warning(f"❌ Address '{address_id}' not found for update attempt by user '{current_user.id}'.")
+        logger.warning("❌ Address '%s' not found for update attempt by user '%s'.", address_id, current_user.id)
         raise HTTPException(status_code=404, detail="Address not found")
     address = crud.address.update(db, db_obj=address, obj_in=address_in)
-    logger.info(f"✅ Address '{address.id}' updated successfully by user '{current_user.id}'.")
+    logger.info("✅ Address '%s' updated successfully by user '%s'.", address.id, current_user.id)
     return address
 
 @router.delete("/{address_id}", response_model=schemas.Address)
@@ -98,11 +98,11 @@ def delete_address(
     """
     Delete an address.
     """
-    logger.info(f"🗑️ Admin '{current_user.id}' attempting to delete address '{address_id}'.")
+    logger.info("🗑️ Admin '%s' attempting to delete address '%s'.", current_user.id, address_id)
     address = crud.address.get(db, id=address_id)
     if not address:
-        logger.warning(f"❌ Address '{address_id}' not found for deletion attempt by admin '{current_user.id}'.")
+        logger.warning("❌ Address '%s' not found for deletion attempt by admin '%s'.", address_id, current_user.id)
         raise HTTPException(status_code=404, detail="Address not found")
     address = crud.address.remove(db, id=address_id)
-    logger.info(f"✅ Address '{address.id}' deleted successfully by admin '{current_user.id}'.")
+    logger.info("✅ Address '%s' deleted successfully by admin '%s'.", address.id, current_user.id)
     return address
@@ -0,0 +1,42 @@
+from typing import List, Optional
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session
+from app.api import deps
+from app.core.auth_cache import Principal
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.crud.crud_audit import audit as crud_audit
+from app.schemas.audit_log import AuditLog as AuditLogSchema
+
+router = APIRouter(prefix="/audit", tags=["Audit"])
+logger = logging.getLogger("app.api.endpoints.audit")
+
+@router.get("/{entity_type}/{entity_id}", response_model=List[AuditLogSchema])
+def get_entity_history(
+    entity_type: str,
+    entity_id: str,
+    response: Response,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    db: Session = Depends(deps.get_db),
+    current_user: Principal = Depends(deps.get_current_active_principal),
+):
+    """Change history of one entity (e.g. ``inbound_receipt``, ``inbound_line``, ``store_product``,
+    ``warehouse_config``), newest first."""
+    # Same access rules as the global feed: ADMIN everything, MANAGER their scope
+    if current_user.role not in {"ADMIN", "MANAGER"}:
+        raise HTTPException(status_code=403, detail="Not authorized to view audit logs")
+    if current_user.role == "MANAGER" and not crud_audit.manager_can_view(
+        db, entity_type=entity_type, entity_id=entity_id,
+        warehouse_id=str(current_user.warehouse_id) if current_user.warehouse_id else None,
+    ):
+        logger.warning("🚫 Manager '%s' denied audit history of %s/%s", current_user.id, entity_type, entity_id)
+        raise HTTPException(status_code=403, detail="Not authorized to view audit logs")
+
+    after = decode_cursor(cursor) if cursor else None
+    # Fetch one extra row to know whether another page exists
+    records = crud_audit.list_for_entity(db, entity_type=entity_type, entity_id=entity_id, limit=limit + 1, after=after)
+    if len(records) > limit:
+        records = records[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(records[-1].created_at, records[-1].id)
+    return [AuditLogSchema(**data) for data in crud_audit.with_names(db, records)]
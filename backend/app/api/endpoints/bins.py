@@ -10,6 +10,8 @@ from app.schemas.bin import Bin, BinCreate, BinUpdate, BinCreateRequest
 from app.models.user import User
 from app.crud.crud_config import config as cfg
 from app.services.bin_code import build_bin_code as build_bin_code_svc
+from app.services.free_bin_index import free_bins
+from app.services.rack_grid import materialize_rack_grid
 
 router = APIRouter()
 
@@ -34,7 +36,8 @@ def create_bin(
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_active_user),
 ):
-    if not crud_rack.rack.get(db, id=rack_id):
+    rack = crud_rack.rack.get(db, id=rack_id)
+    if not rack:
         raise HTTPException(status_code=404, detail="Rack not found")
     code = build_bin_code(db, rack_id, bin_in.stack_index, bin_in.bin_index)
     payload = BinCreate(
@@ -48,7 +51,9 @@ def create_bin(
         store_product_id=bin_in.store_product_id,
         quantity=bin_in.quantity,
     )
-    return crud_bin.bin.create(db, obj_in=payload)
+    created = crud_bin.bin.create(db, obj_in=payload)
+    free_bins.observe(rack.warehouse_id, [created])
+    return created
 
 @router.post("/racks/{rack_id}/bins:materialize")
 def materialize_bins(
@@ -58,44 +63,12 @@ def materialize_bins(
 ):
     """Create any missing Bin rows to fill the rack's stacks x bins_per_stack grid.
 
-    Returns a summary with counts and how many were created.
+    Returns a summary with counts, how many were created and elapsed_ms.
     """
     rack = crud_rack.rack.get(db, id=rack_id)
     if not rack:
         raise HTTPException(status_code=404, detail="Rack not found")
-    # Load existing coordinates for this rack
-    existing = crud_bin.bin.get_by_rack(db, rack_id)
-    coords = {(int(b.stack_index), int(b.bin_index)) for b in existing}
-    to_create = []
-    for s in range(int(rack.stacks or 0)):
-        for b in range(int(rack.bins_per_stack or 0)):
-            if (s, b) in coords:
-                continue
-            code = build_bin_code(db, rack_id, s, b)
-            to_create.append(BinCreate(
-                rack_id=rack_id,
-                stack_index=s,
-                bin_index=b,
-                code=code,
-                status="empty",
-                crate_id=None,
-                product_id=None,
-                store_product_id=None,
-                quantity=0,
-            ))
-    created = 0
-    for payload in to_create:
-        crud_bin.bin.create(db, obj_in=payload)
-        created += 1
-    # Summarize
-    total_expected = int((rack.stacks or 0) * (rack.bins_per_stack or 0))
-    return {
-        "rack_id": str(rack.id),
-        "rack_name": rack.name,
-        "expected": total_expected,
-        "existing": len(existing),
-        "created": created,
-    }
+    return materialize_rack_grid(db, rack)
 
 @router.put("/bins/{bin_id}", response_model=Bin)
 def update_bin(
@@ -112,7 +85,10 @@ def update_bin(
     new_bin = bin_in.bin_index if bin_in.bin_index is not None else db_bin.bin_index
     new_code = build_bin_code(db, db_bin.rack_id, int(new_stack), int(new_bin))
     update_payload = { **bin_in.model_dump(exclude_unset=True), 'code': new_code }
-    return crud_bin.bin.update(db, db_obj=db_bin, obj_in=update_payload)
+    updated = crud_bin.bin.update(db, db_obj=db_bin, obj_in=update_payload)
+    # Keep the free-bin index in step with manual status/product edits
+    free_bins.observe(updated.rack.warehouse_id, [updated])
+    return updated
 
 @router.delete("/bins/{bin_id}", response_model=Bin)
 def delete_bin(
@@ -123,4 +99,7 @@ def delete_bin(
     db_bin = crud_bin.bin.get(db, id=bin_id)
     if not db_bin:
         raise HTTPException(status_code=404, detail="Bin not found")
-    return crud_bin.bin.remove(db, id=bin_id)
+    warehouse_id = db_bin.rack.warehouse_id
+    removed = crud_bin.bin.remove(db, id=bin_id)
+    free_bins.invalidate(warehouse_id)
+    return removed
@@ -2,7 +2,7 @@
 from typing import List
 import uuid
 import logging
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.api import deps
@@ -11,6 +11,7 @@ from app import crud, schemas, models
 from app.models.milestone import MilestoneEntityType
 from app.models.user import User
 from app.schemas.community import Community, CommunityCreate, CommunityUpdate
+from app.services.spatial_index import spatial
 
 router = APIRouter()
 logger = logging.getLogger("app.api.endpoints.communities")
@@ -27,7 +28,7 @@ def read_communities(
     """
     Retrieve all communities.
     """
-    logger.info(f"ℹ️ User '{current_user.id}' listing all communities.")
+    logger.info("ℹ️ User '%s' listing all communities.", current_user.id)
     communities = crud_community.community.get_multi_by_warehouse(db, warehouse_id=warehouse_id, skip=skip, limit=limit)
     return communities
 
@@ -41,11 +42,25 @@ def create_community(
     """
     Create a new community.
     """
-    logger.info(f"ℹ️ User '{current_user.id}' attempting to create community: {community_in.name}")
+    logger.info("ℹ️ User '%s' attempting to create community: %s", current_user.id, community_in.name)
     new_community = crud_community.community.create(db, obj_in=community_in)
-    logger.info(f"✅ Community '{new_community.id}' created successfully by user '{current_user.id}'.")
+    logger.info("✅ Community '%s' created successfully by user '%s'.", new_community.id, current_user.id)
     return new_community
 
+@router.get("/nearby", response_model=List[Community])
+def read_nearby_communities(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(5.0, ge=0),
+    warehouse_id: uuid.UUID | None = None,
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    """Communities within radius_km of (lat, lon), nearest first."""
+    hits = spatial.nearby(db, "community", lat, lon, radius_km, limit=limit, warehouse_id=warehouse_id)
+    return spatial.rows(db, "community", hits)
+
 @router.get("/{community_id}", response_model=Community)
 def read_community(
     community_id: uuid.UUID,
@@ -55,10 +70,10 @@ def read_community(
     """
     Get a specific community by its ID.
     """
-    logger.info(f"ℹ️ User '{current_user.id}' requesting community '{community_id}'.")
+    logger.info("ℹ️ User '%s' requesting community '%s'.", current_user.id, community_id)
     db_community = crud_community.community.get(db, id=community_id)
     if db_community is None:
-        logger.warning(f"❌ Community '{community_id}' not found for request from user '{current_user.id}'.")
+        logger.warning("❌ Community '%s' not found for request from user '%s'.", community_id, current_user.id)
         raise HTTPException(status_code=404, detail="Community not found")
     return db_community
 
@@ -72,13 +87,13 @@ def update_community(
     """
     Update a community.
     """
-    logger.info(f"ℹ️ User '{current_user.id}' attempting to update community '{community_id}'.")
+    logger.info("ℹ️ User '%s' attempting to update community '%s'.", current_user.id, community_id)
     db_community = crud_community.community.get(db, id=community_id)
     if db_community is None:
-        logger.warning(f"❌ Community '{community_id}' not found for update attempt by user '{current_user.id}'.")
+        logger.warning("❌ Community '%s' not found for update attempt by user '%s'.", community_id, current_user.id)
         raise HTTPException(status_code=404, detail="Community not found")
     updated_community = crud_community.community.update(db, db_obj=db_community, obj_in=community_in)
-    logger.info(f"✅ Community '{updated_community.id}' updated successfully by user '{current_user.id}'.")
+    logger.info("✅ Community '%s' updated successfully by user '%s'.", updated_community.id, current_user.id)
     return updated_community
 
 @router.delete("/{community_id}", response_model=Community)
@@ -90,13 +105,13 @@ def delete_community(
     """
     Delete a community.
     """
-    logger.info(f"ℹ️ Admin '{current_user.id}' attempting to delete community '{community_id}'.")
+    logger.info("ℹ️ Admin '%s' attempting to delete community '%s'.", current_user.id, community_id)
     db_community = crud_community.community.get(db, id=community_id)
     if db_community is None:
-        logger.warning(f"❌ Community '{community_id}' not found for deletion attempt by admin '{current_user.id}'.")
+        logger.warning("❌ Community '%s' not found for deletion attempt by admin '%s'.", community_id, current_user.id)
         raise HTTPException(status_code=404, detail="Community not found")
     deleted_community = crud_community.community.remove(db, id=community_id)
-    logger.info(f"✅ Community '{deleted_community.id}' deleted successfully by admin '{current_user.id}'.")
+    logger.info("✅ Community '%s' deleted successfully by admin '%s'.", deleted_community.id, current_user.id)
     return deleted_community
 
 
@@ -1,7 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 import logging
 from sqlalchemy.orm import Session
 from app.api import deps
+from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.db.pool_metrics import pool_metrics
+from app.db.session import engine
 from app.crud.crud_config import config as crud_config
 from app.crud.crud_audit import audit as crud_audit
 from app.schemas.audit_log import AuditLog as AuditLogSchema
@@ -48,7 +53,7 @@ def get_warehouse_config(
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_active_user),
 ):
-    data = crud_config.get_warehouse(db, warehouse_id)
+    data = crud_config.get_warehouse(db, warehouse_id, with_sequences=True)
     if not data:
         logger.warning("❌ Warehouse config not found for %s", warehouse_id)
         raise HTTPException(status_code=404, detail="Config not found")
@@ -71,9 +76,35 @@ def put_warehouse_config(
     saved = crud_config.upsert_warehouse(db, warehouse_id, data=payload.model_dump(), actor_user_id=str(current_user.id))
     return WarehouseConfigSchema(**saved)
 
+def _db_pool_metrics() -> dict:
+    data = pool_metrics.snapshot(engine.pool)
+    data["metrics_enabled"] = settings.DB_POOL_METRICS_ENABLED
+    data["pre_ping"] = settings.DB_POOL_PRE_PING
+    data["recycle_seconds"] = settings.DB_POOL_RECYCLE_SECONDS
+    return data
+
+@router.get("/system/db-pool")
+def get_db_pool_metrics(
+    current_user: User = Depends(deps.get_current_active_superuser),
+):
+    """Connection pool gauges and checkout latency for sizing DB_POOL_* per deployment."""
+    return _db_pool_metrics()
+
+@router.post("/system/db-pool/reset")
+def reset_db_pool_metrics(
+    current_user: User = Depends(deps.get_current_active_superuser),
+):
+    """Return the current pool metrics, then start a new window (counters and latency samples)."""
+    data = _db_pool_metrics()
+    logger.info("🧹 DB pool metrics reset by user=%s", current_user.id)
+    pool_metrics.reset()
+    return data
+
 @router.get("/system/audit", response_model=list[AuditLogSchema])
 def get_system_audit(
-    limit: int = 100,
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_active_user),
 ):
@@ -83,41 +114,13 @@ def get_system_audit(
         raise HTTPException(status_code=403, detail="Not authorized to view audit logs")
 
     warehouse_id = getattr(current_user, "warehouse_id", None)
-    records = crud_audit.list_scoped(db, limit=limit, role=role, warehouse_id=str(warehouse_id) if warehouse_id else None)
-    result = []
-    for rec in records:
-        # Convert UUID fields to str for Pydantic
-        data = {
-            'id': str(rec.id),
-            'actor_user_id': str(rec.actor_user_id),
-            'entity_type': rec.entity_type,
-            'entity_id': rec.entity_id,
-            'action': rec.action,
-            'changes': rec.changes,
-            'created_at': rec.created_at,
-        }
-        # Optionally include actor name/role for UI without extra lookups
-        try:
-            from app.crud.crud_user import user as crud_user
-            actor = crud_user.get(db, id=rec.actor_user_id)
-            if actor:
-                data['actor_name'] = getattr(actor, 'name', None)
-                data['actor_role'] = getattr(actor, 'role', None)
-        except Exception:
-            pass
-        # Include entity_name for contact reveal events for better UX
-        try:
-            if rec.entity_type == 'vendor_contact_unmask' and rec.entity_id:
-                from app.crud.crud_vendor import vendor as crud_vendor
-                v = crud_vendor.get(db, id=rec.entity_id)
-                if v:
-                    data['entity_name'] = getattr(v, 'business_name', None)
-            elif rec.entity_type == 'customer_contact_unmask' and rec.entity_id:
-                from app.crud.crud_customer import customer as crud_customer
-                c = crud_customer.get(db, id=rec.entity_id)
-                if c:
-                    data['entity_name'] = getattr(c, 'name', None)
-        except Exception:
-            pass
-        result.append(AuditLogSchema(**data))
-    return result
+    after = decode_cursor(cursor) if cursor else None
+    # Fetch one extra row to know whether another page exists
+    records = crud_audit.list_scoped(
+        db, limit=limit + 1, role=role, warehouse_id=str(warehouse_id) if warehouse_id else None, after=after
+    )
+    if len(records) > limit:
+        records = records[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(records[-1].created_at, records[-1].id)
+    # Actor and entity names for the whole page in a fixed number of queries
+    return [AuditLogSchema(**data) for data in crud_audit.with_names(db, records)]
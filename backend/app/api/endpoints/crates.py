@@ -1,16 +1,75 @@
-from typing import List
+from typing import List, Optional
+import json
+import uuid
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 import logging
 
 from app import crud, models, schemas
 from app.api import deps
 from app.crud.crud_config import config as cfg
-from app.models.crate import CrateStatus
+from app.models.crate import CrateStatus, CrateType
+from app.services.sequences import KINDS
 
 router = APIRouter()
 logger = logging.getLogger("app.api.endpoints.crates")
 
+# Crates per INSERT/commit when bulk creating; each chunk is streamed once committed
+BULK_CHUNK_SIZE = 500
+
+_STATUS_MAP = {
+    'active': CrateStatus.ACTIVE,
+    'in_use': CrateStatus.IN_USE,
+    'reserved': CrateStatus.RESERVED,
+    'damaged': CrateStatus.DAMAGED,
+    'inactive': CrateStatus.INACTIVE,
+    'unavailable': CrateStatus.INACTIVE,
+}
+
+
+def _crate_name(wh_cfg: dict, seq: int) -> str:
+    short = (wh_cfg.get('shortCode') or '').upper()
+    crate_prefix = (wh_cfg.get('cratePrefix') or 'CRT').upper()
+    crate_suffix = (wh_cfg.get('crateSuffix') or '').upper()
+    name_core = f"{short}-{crate_prefix}-{str(seq).zfill(4)}"
+    return f"{name_core}{('-' + crate_suffix) if crate_suffix else ''}"
+
+
+def _free_crate_names(db: Session, warehouse_id, count: int) -> List[str]:
+    """Reserve crate numbers until ``count`` unused names are found.
+
+    The sequence wraps after 9999, so a reserved number can map to a crate that still
+    exists; those are skipped and replaced. Raises 409 if the warehouse runs out.
+    """
+    capacity = KINDS['crate'][0]
+    names, tried = {}, 0
+    while len(names) < count and tried < capacity:
+        wh_cfg, seqs = cfg.consume_crate_seq_block(db, str(warehouse_id), min(count - len(names), capacity - tried))
+        tried += len(seqs)
+        batch = [name for name in dict.fromkeys(_crate_name(wh_cfg, seq) for seq in seqs) if name not in names]
+        taken = crud.crate.existing_codes(db, batch)
+        names.update((name, None) for name in batch if name not in taken)
+    if len(names) < count:
+        raise HTTPException(status_code=409, detail=f"Only {len(names)} free crate numbers left for this warehouse.")
+    return list(names)
+
+
+def _initial_status(db: Session, requested: Optional[str]) -> CrateStatus:
+    # Determine initial status priority:
+    # 1) Client-provided status
+    # 2) System config defaultCrateStatus (supports 'unavailable' -> INACTIVE)
+    # 3) Hard fallback to INACTIVE
+    initial_status = None
+    if requested:
+        # requested may be a string; normalize and map
+        initial_status = _STATUS_MAP.get(str(requested).strip().lower(), None)
+    if initial_status is None:
+        sys_cfg = cfg.get_system(db) or {}
+        def_status_str = (sys_cfg.get('defaultCrateStatus') or '').strip().lower()
+        initial_status = _STATUS_MAP.get(def_status_str)
+    return initial_status or CrateStatus.INACTIVE
+
 
 @router.get("/", response_model=List[schemas.Crate])
 def read_crates(
@@ -22,9 +81,9 @@ def read_crates(
     """
     Retrieve crates.
     """
-    logger.info(f"🔍 User '{current_user.id}' fetching crates with skip={skip} and limit={limit}.")
+    logger.info("🔍 User '%s' fetching crates with skip=%s and limit=%s.", current_user.id, skip, limit)
     crates = crud.crate.get_multi(db, skip=skip, limit=limit)
-    logger.info(f"✅ Retrieved {len(crates)} crates for user '{current_user.id}'.")
+    logger.info("✅ Retrieved %s crates for user '%s'.", len(crates), current_user.id)
     return crates
 
 
@@ -38,41 +97,12 @@ def create_crate(
     """
     Create new crate using warehouse configuration sequencing.
     """
-    logger.info(f"ℹ️ User '{current_user.id}' attempting to create crate for warehouse: {crate_in.warehouse_id}.")
+    logger.info("ℹ️ User '%s' attempting to create crate for warehouse: %s.", current_user.id, crate_in.warehouse_id)
 
-    # Atomically consume next sequence under row lock
+    # Take the next crate number from the leased warehouse sequence
     wh_cfg, seq = cfg.consume_next_crate_seq(db, str(crate_in.warehouse_id))
-
-    short = (wh_cfg.get('shortCode') or '').upper()
-    crate_prefix = (wh_cfg.get('cratePrefix') or 'CRT').upper()
-    crate_suffix = (wh_cfg.get('crateSuffix') or '').upper()
-
-    name_core = f"{short}-{crate_prefix}-{str(seq).zfill(4)}"
-    name = f"{name_core}{('-' + crate_suffix) if crate_suffix else ''}"
-
-    # Determine initial status priority:
-    # 1) Client-provided status
-    # 2) System config defaultCrateStatus (supports 'unavailable' -> INACTIVE)
-    # 3) Hard fallback to INACTIVE
-    status_map = {
-        'active': CrateStatus.ACTIVE,
-        'in_use': CrateStatus.IN_USE,
-        'reserved': CrateStatus.RESERVED,
-        'damaged': CrateStatus.DAMAGED,
-        'inactive': CrateStatus.INACTIVE,
-        'unavailable': CrateStatus.INACTIVE,
-    }
-
-    initial_status = None
-    if getattr(crate_in, 'status', None):
-        # crate_in.status may be a string; normalize and map
-        initial_status = status_map.get(str(crate_in.status).strip().lower(), None)
-    if initial_status is None:
-        sys_cfg = cfg.get_system(db) or {}
-        def_status_str = (sys_cfg.get('defaultCrateStatus') or '').strip().lower()
-        initial_status = status_map.get(def_status_str)
-    if initial_status is None:
-        initial_status = CrateStatus.INACTIVE
+    name = _crate_name(wh_cfg, seq)
+    initial_status = _initial_status(db, crate_in.status)
 
     # Persist crate with optional status
     crate = crud.crate.create(
@@ -85,7 +115,7 @@ def create_crate(
         ),
     )
 
-    logger.info(f"✅ Crate '{crate.id}' created successfully by user '{current_user.id}'.")
+    logger.info("✅ Crate '%s' created successfully by user '%s'.", crate.id, current_user.id)
     return crate
 
 
@@ -100,13 +130,13 @@ def update_crate(
     """
     Update a crate.
     """
-    logger.info(f"ℹ️ User '{current_user.id}' attempting to update crate '{id}'.")
+    logger.info("ℹ️ User '%s' attempting to update crate '%s'.", current_user.id, id)
     crate = crud.crate.get(db=db, id=id)
     if not crate:
-        logger.warning(f"❌ Crate '{id}' not found for update by user '{current_user.id}'.")
+        logger.warning("❌ Crate '%s' not found for update by user '%s'.", id, current_user.id)
         raise HTTPException(status_code=404, detail="Crate not found")
     crate = crud.crate.update(db=db, db_obj=crate, obj_in=crate_in)
-    logger.info(f"✅ Crate '{id}' updated successfully by user '{current_user.id}'.")
+    logger.info("✅ Crate '%s' updated successfully by user '%s'.", id, current_user.id)
     return crate
 
 
@@ -120,12 +150,12 @@ def read_crate(
     """
     Get crate by ID.
     """
-    logger.info(f"🔍 User '{current_user.id}' fetching crate '{id}'.")
+    logger.info("🔍 User '%s' fetching crate '%s'.", current_user.id, id)
     crate = crud.crate.get(db=db, id=id)
     if not crate:
-        logger.warning(f"❌ Crate '{id}' not found for user '{current_user.id}'.")
+        logger.warning("❌ Crate '%s' not found for user '%s'.", id, current_user.id)
         raise HTTPException(status_code=404, detail="Crate not found")
-    logger.info(f"✅ Crate '{id}' retrieved successfully for user '{current_user.id}'.")
+    logger.info("✅ Crate '%s' retrieved successfully for user '%s'.", id, current_user.id)
     return crate
 
 
@@ -139,11 +169,65 @@ def delete_crate(
     """
     Delete a crate.
     """
-    logger.info(f"ℹ️ User '{current_user.id}' attempting to delete crate '{id}'.")
+    logger.info("ℹ️ User '%s' attempting to delete crate '%s'.", current_user.id, id)
     crate = crud.crate.get(db=db, id=id)
     if not crate:
-        logger.warning(f"❌ Crate '{id}' not found for deletion by user '{current_user.id}'.")
+        logger.warning("❌ Crate '%s' not found for deletion by user '%s'.", id, current_user.id)
         raise HTTPException(status_code=404, detail="Crate not found")
     crate = crud.crate.remove(db=db, id=id)
-    logger.info(f"✅ Crate '{id}' deleted successfully by user '{current_user.id}'.")
+    logger.info("✅ Crate '%s' deleted successfully by user '%s'.", id, current_user.id)
     return crate
+
+
+@router.post(":bulk", response_class=StreamingResponse)
+def create_crates_bulk(
+    *,
+    db: Session = Depends(deps.get_db),
+    bulk_in: schemas.CrateBulkCreateRequest,
+    current_user: models.User = Depends(deps.get_current_active_user),
+):
+    """
+    Create ``count`` crates in one request, streamed back as NDJSON (one crate per line).
+
+    The crate numbers are reserved up front (skipping numbers whose crate still exists
+    after the sequence wrapped), names and QR payloads are built in memory and rows are
+    written with multi-row INSERTs of BULK_CHUNK_SIZE, each chunk committed and
+    streamed before the next is written so label printing can start right away. If a
+    chunk fails, a final ``{"error": ...}`` line reports how many crates were created.
+    """
+    logger.info("ℹ️ User '%s' bulk creating %d crates for warehouse: %s.", current_user.id, bulk_in.count, bulk_in.warehouse_id)
+    # Validate and reserve up front so config errors and collisions still return a normal 4xx
+    names = _free_crate_names(db, bulk_in.warehouse_id, bulk_in.count)
+    status = _initial_status(db, bulk_in.status)
+    crate_type = bulk_in.type or CrateType.STANDARD
+    rows = []
+    for name in names:
+        # QR code encodes the crate name so scans show the human-readable code
+        rows.append({
+            'id': uuid.uuid4(),
+            'name': name,
+            'qr_code': name,
+            'status': status,
+            'type': crate_type,
+            'warehouse_id': bulk_in.warehouse_id,
+        })
+    user_id = current_user.id
+
+    def stream():
+        # get_db's session stays open until the response has been sent
+        created = 0
+        try:
+            for i in range(0, len(rows), BULK_CHUNK_SIZE):
+                chunk = rows[i:i + BULK_CHUNK_SIZE]
+                crud.crate.insert_many(db, chunk)
+                created += len(chunk)
+                for row in chunk:
+                    yield schemas.Crate.model_validate(row).model_dump_json() + "\n"
+        except Exception as e:
+            db.rollback()
+            logger.exception("❌ Bulk crate creation failed after %d crates for user '%s'.", created, user_id)
+            yield json.dumps({"error": str(e.__class__.__name__), "created": created}) + "\n"
+            return
+        logger.info("✅ Bulk created %d crates for user '%s'.", created, user_id)
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
@@ -8,7 +8,7 @@ import uuid
 from app import crud, models, schemas
 from app.core.privacy import mask_contact_dict
 from app.schemas.privacy import UnmaskRequest, UnmaskResponse
-from app.models.audit_log import AuditLog
+from app.services.audit_sink import audit_sink
 from datetime import datetime
 from app.api import deps
 
@@ -23,12 +23,12 @@ def read_customer_me(
     """
     Get current user's customer profile.
     """
-    logger.info(f"ℹ️ Endpoint /customers/me called by user: {current_user.email} (id: {current_user.id})")
+    logger.info("ℹ️ Endpoint /customers/me called by user: %s (id: %s)", current_user.email, current_user.id)
     customer = crud.customer.get_by_user_id(db, user_id=current_user.id)
     if not customer:
-        logger.warning(f"❌ No customer profile found for user_id: {current_user.id}")
+        logger.warning("❌ No customer profile found for user_id: %s", current_user.id)
         raise HTTPException(status_code=404, detail="Customer profile not found for the current user")
-    logger.info(f"✅ Found customer profile (id: {customer.id}) for user_id: {current_user.id}")
+    logger.info("✅ Found customer profile (id: %s) for user_id: %s", customer.id, current_user.id)
     return customer
 
 @router.get("/", response_model=List[schemas.Customer])
@@ -100,9 +100,9 @@ def create_customer(
         notes=notes,
     )
 
-    logger.info(f"📝 User '{current_user.id}' creating customer: {name}")
+    logger.info("📝 User '%s' creating customer: %s", current_user.id, name)
     new_customer = crud.customer.create(db, obj_in=c_in)
-    logger.info(f"✅ Customer '{new_customer.id}' created successfully by user '{current_user.id}'.")
+    logger.info("✅ Customer '%s' created successfully by user '%s'.", new_customer.id, current_user.id)
     return new_customer
 
 @router.get("/{customer_id}", response_model=schemas.Customer)
@@ -111,10 +111,10 @@ def read_customer(
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_user),
 ):
-    logger.info(f"🔎 User '{current_user.id}' requesting customer '{customer_id}'.")
+    logger.info("🔎 User '%s' requesting customer '%s'.", current_user.id, customer_id)
     db_customer = crud.customer.get(db, id=customer_id)
     if db_customer is None:
-        logger.warning(f"❌ Customer '{customer_id}' not found for request from user '{current_user.id}'.")
+        logger.warning("❌ Customer '%s' not found for request from user '%s'.", customer_id, current_user.id)
         raise HTTPException(status_code=404, detail="Customer not found")
     # Mask PII by default
     d = schemas.Customer.model_validate(db_customer).model_dump()
@@ -133,16 +133,15 @@ def unmask_customer_contact(
     if not cust:
         raise HTTPException(status_code=404, detail="Customer not found")
     # Record audit
-    db.add(
-        AuditLog(
-            actor_user_id=current_user.id,
-            entity_type="customer_contact_unmask",
-            entity_id=str(customer_id),
-            action="unmask",
-            changes={"reason": {"before": None, "after": payload.reason}},
-        )
+    # Written and committed before the contact details are returned
+    audit_sink.write(
+        db,
+        actor_user_id=current_user.id,
+        entity_type="customer_contact_unmask",
+        entity_id=str(customer_id),
+        action="unmask",
+        changes={"reason": {"before": None, "after": payload.reason}},
     )
-    db.commit()
     return UnmaskResponse(
         id=cust.id,
         name=cust.name,
@@ -160,13 +159,13 @@ def update_customer(
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_user),
 ):
-    logger.info(f"📝 User '{current_user.id}' attempting to update customer '{customer_id}'.")
+    logger.info("📝 User '%s' attempting to update customer '%s'.", current_user.id, customer_id)
     db_customer = crud.customer.get(db, id=customer_id)
     if db_customer is None:
-        logger.warning(f"❌ Customer '{customer_id}' not found for update attempt by user '{current_user.id}'.")
+        logger.warning("❌ Customer '%s' not found for update attempt by user '%s'.", customer_id, current_user.id)
         raise HTTPException(status_code=404, detail="Customer not found")
     updated_customer = crud.customer.update(db, db_obj=db_customer, obj_in=customer_in)
-    logger.info(f"✅ Customer '{updated_customer.id}' updated successfully by user '{current_user.id}'.")
+    logger.info("✅ Customer '%s' updated successfully by user '%s'.", updated_customer.id, current_user.id)
     return updated_customer
 
 @router.delete("/{customer_id}", response_model=schemas.Customer)
@@ -175,11 +174,11 @@ def delete_customer(
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_superuser), # Admin only
 ):
-    logger.info(f"🗑️ Admin '{current_user.id}' attempting to delete customer '{customer_id}'.")
+    logger.info("🗑️ Admin '%s' attempting to delete customer '%s'.", current_user.id, customer_id)
     db_customer = crud.customer.get(db, id=customer_id)
     if db_customer is None:
-        logger.warning(f"❌ Customer '{customer_id}' not found for deletion attempt by admin '{current_user.id}'.")
+        logger.warning("❌ Customer '%s' not found for deletion attempt by admin '%s'.", customer_id, current_user.id)
         raise HTTPException(status_code=404, detail="Customer not found")
     deleted_customer = crud.customer.remove(db, id=customer_id)
-    logger.info(f"✅ Customer '{deleted_customer.id}' deleted successfully by admin '{current_user.id}'.")
+    logger.info("✅ Customer '%s' deleted successfully by admin '%s'.", deleted_customer.id, current_user.id)
     return deleted_customer
\ No newline at end of file
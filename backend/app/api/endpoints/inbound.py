@@ -1,36 +1,85 @@
-from typing import List, Optional
+from typing import List, Literal, Optional
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.api import deps
 from app.crud.crud_inbound import inbound_receipts, inbound_lines
-from app.schemas.inbound import Receipt, ReceiptCreate, ReceiptUpdate, ReceiptFilter, ReceiptLine, ReceiptLineUpdate, GoodsInKpis, AutoCreatePayload, AutoCreateBatchPayload
-from app.services.inbound_service import auto_allocate_bins as svc_auto_allocate, reassign_line_bin as svc_reassign, clear_line_bin as svc_clear
+from app.schemas.inbound import Receipt, ReceiptSummary, ReceiptCreate, ReceiptUpdate, ReceiptFilter, ReceiptLine, ReceiptLineUpdate, GoodsInKpis, AutoCreatePayload, AutoCreateBatchPayload
+from app.services.inbound_service import auto_allocate_bins as svc_auto_allocate, reassign_line_bin as svc_reassign, clear_line_bin as svc_clear, create_receipts_from_pending_orders as svc_create_from_pending
 from app.models.user import User
+from app.core.auth_cache import Principal
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
 from datetime import datetime, date
 import logging
 from app.crud.crud_audit import audit as crud_audit
 from app import models
-from app.models.audit_log import AuditLog
-from app.models.rack import Rack
-from app.models.bin import Bin
+from app.services.audit_sink import audit_sink
+from app.models.inbound_receipt import InboundReceipt
+from app.services import inbound_kpi_counters as kpi_counters, warehouse_stats
 
 router = APIRouter(prefix="/inbound", tags=["Inbound"])
 logger = logging.getLogger("app.api.endpoints.inbound")
 
+async def _list_receipts_page(
+    db: AsyncSession,
+    response: Response,
+    *,
+    with_lines: bool,
+    limit: int,
+    cursor: Optional[str],
+    **filters,
+):
+    after = decode_cursor(cursor) if cursor else None
+    # Fetch one extra row to know whether another page exists
+    rows = await inbound_receipts.list_async(db, limit=limit + 1, after=after, with_lines=with_lines, **filters)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return rows
+
 @router.get("/receipts", response_model=List[Receipt])
-def list_receipts(
+async def list_receipts(
+    response: Response,
     warehouse_id: Optional[uuid.UUID] = Query(None),
     vendor_type: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
     date_from: Optional[datetime] = Query(None),
     date_to: Optional[datetime] = Query(None),
-    db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_active_user),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: Principal = Depends(deps.get_current_active_principal_async),
 ):
     logger.info("ℹ️ Listing inbound receipts warehouse=%s vendor_type=%s status=%s search=%s", warehouse_id, vendor_type, status, search)
-    return inbound_receipts.list(db, warehouse_id=warehouse_id, vendor_type=vendor_type, status=status, search=search, date_from=date_from, date_to=date_to)
+    return await _list_receipts_page(
+        db, response, with_lines=True, limit=limit, cursor=cursor,
+        warehouse_id=warehouse_id, vendor_type=vendor_type, status=status, search=search, date_from=date_from, date_to=date_to,
+    )
+
+@router.get("/receipts:headers", response_model=List[ReceiptSummary])
+async def list_receipt_headers(
+    response: Response,
+    warehouse_id: Optional[uuid.UUID] = Query(None),
+    vendor_type: Optional[str] = Query(None),
+    status: Optional[str] = Query(None),
+    search: Optional[str] = Query(None),
+    date_from: Optional[datetime] = Query(None),
+    date_to: Optional[datetime] = Query(None),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: Principal = Depends(deps.get_current_active_principal_async),
+):
+    """Same as GET /receipts with per-receipt line counts instead of lines, for list views."""
+    logger.info("ℹ️ Listing inbound receipt headers warehouse=%s vendor_type=%s status=%s search=%s", warehouse_id, vendor_type, status, search)
+    rows = await _list_receipts_page(
+        db, response, with_lines=False, limit=limit, cursor=cursor,
+        warehouse_id=warehouse_id, vendor_type=vendor_type, status=status, search=search, date_from=date_from, date_to=date_to,
+    )
+    summaries = await inbound_receipts.line_summaries_async(db, [r.id for r in rows])
+    return [ReceiptSummary.model_validate(r).model_copy(update=summaries.get(r.id, {})) for r in rows]
 
 @router.post("/receipts", response_model=Receipt)
 def create_receipt(
@@ -42,7 +91,7 @@ def create_receipt(
     obj = inbound_receipts.create(db, obj_in=payload)
     # Audit
     try:
-        db.add(AuditLog(
+        audit_sink.record(
             actor_user_id=current_user.id,
             entity_type="inbound_receipt",
             entity_id=str(obj.id),
@@ -54,8 +103,7 @@ def create_receipt(
                 "warehouse_id": {"before": None, "after": str(obj.warehouse_id)},
                 "line_count": {"before": None, "after": len(obj.lines)},
             }
-        ))
-        db.commit()
+        )
     except Exception:
         logger.exception("Failed to write audit log for inbound receipt create")
     return obj
@@ -130,14 +178,13 @@ def auto_create_receipt(
 
     # Emit audit + placeholder tasks through audit log (until task tables exist)
     try:
-        db.add(AuditLog(
+        audit_sink.record(
             actor_user_id=current_user.id,
             entity_type="inbound_receipt",
             entity_id=str(rec.id),
             action="create_unloading_task",
             changes={"queue": {"before": None, "after": "UNLOADER"}}
-        ))
-        db.commit()
+        )
     except Exception:
         logger.exception("Failed to audit unloading task creation")
     return rec
@@ -148,25 +195,10 @@ def auto_create_receipts_batch(
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_active_user),
 ):
-    # Get distinct vendor_ids from pending orders in this warehouse
-    orders = (
-        db.query(models.Order)
-        .filter(models.Order.status == "pending", models.Order.warehouse_id == payload.warehouse_id)
-        .all()
-    )
-    vendor_ids = set()
-    for o in orders:
-        for it in (o.items or []):
-            if it.product and it.product.vendor_id:
-                vendor_ids.add(str(it.product.vendor_id))
-    receipts: List[Receipt] = []
-    for vid in vendor_ids:
-        try:
-            tmp = AutoCreatePayload(vendor_id=uuid.UUID(vid), warehouse_id=payload.warehouse_id)
-            r = auto_create_receipt(tmp, db, current_user)  # reuse handler
-            receipts.append(r)
-        except HTTPException:
-            continue
+    """Create one receipt per vendor from all pending orders of the warehouse in one pass."""
+    logger.info("🧰 Auto-creating receipts for warehouse %s by user=%s", payload.warehouse_id, current_user.id)
+    receipts = svc_create_from_pending(db, payload.warehouse_id, actor_user_id=current_user.id)
+    logger.info("✅ Auto-created %d receipt(s) for warehouse %s", len(receipts), payload.warehouse_id)
     return receipts
 
 @router.put("/receipts/{receipt_id}", response_model=Receipt)
@@ -196,7 +228,7 @@ def update_receipt(
     # Audit status changes (and key fields if extended later)
     try:
         if payload.status is not None and before_status != payload.status:
-            db.add(AuditLog(
+            audit_sink.record(
                 actor_user_id=current_user.id,
                 entity_type="inbound_receipt",
                 entity_id=str(receipt_id),
@@ -204,8 +236,7 @@ def update_receipt(
                 changes={
                     "status": {"before": before_status, "after": payload.status}
                 }
-            ))
-            db.commit()
+            )
     except Exception:
         logger.exception("Failed to write audit log for inbound receipt update")
     return obj
@@ -229,36 +260,23 @@ def update_line(
 # Simple KPIs to mirror frontend expectations
 @router.get("/kpis", response_model=GoodsInKpis)
 def kpis(
+    warehouse_id: Optional[uuid.UUID] = Query(None),
+    source: Literal["counters", "live", "snapshot"] = Query("counters"),
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_principal),
+    scoped_warehouse_id: Optional[uuid.UUID] = Depends(deps.get_effective_warehouse_id),
 ):
-    from sqlalchemy import func
-    from app.models.inbound_receipt import InboundReceipt
-    today = datetime.utcnow().date()
-    total = db.query(func.count(InboundReceipt.id)).scalar() or 0
-    open_cnt = db.query(func.count(InboundReceipt.id)).filter(~InboundReceipt.status.in_(["COMPLETED","CANCELLED"])) .scalar() or 0
-    pending = db.query(func.count(InboundReceipt.id)).filter(InboundReceipt.status=="AWAITING_UNLOADING").scalar() or 0
-    completed_today = db.query(func.count(InboundReceipt.id)).filter(InboundReceipt.status=="COMPLETED", func.date(InboundReceipt.updated_at)==today).scalar() or 0
-    # planned arrival earlier than today and still not completed/cancelled
-    late = db.query(func.count(InboundReceipt.id)).filter(
-        InboundReceipt.planned_arrival.isnot(None),
-        func.date(InboundReceipt.planned_arrival) < today,
-        ~InboundReceipt.status.in_(["COMPLETED","CANCELLED"])
-    ).scalar() or 0
-    sku_cnt = db.query(func.count(InboundReceipt.id)).filter(InboundReceipt.vendor_type=="SKU").scalar() or 0
-    flat_cnt = db.query(func.count(InboundReceipt.id)).filter(InboundReceipt.vendor_type=="FLAT").scalar() or 0
-    bins_alloc = db.query(func.count(InboundReceipt.id)).filter(InboundReceipt.status=="ALLOCATED").scalar() or 0
-    logger.info("📈 Computing inbound KPIs by user=%s", current_user.id)
-    return {
-        "totalReceipts": total,
-        "openReceipts": open_cnt,
-        "pending": pending,
-        "completedToday": completed_today,
-        "lateArrivals": late,
-        "skuReceipts": sku_cnt,
-        "flatReceipts": flat_cnt,
-        "binsAllocated": bins_alloc,
-    }
+    # Non-admins always see their own warehouse; admins may pick one or get all
+    wid = scoped_warehouse_id or warehouse_id
+    logger.info("📈 Computing inbound KPIs by user=%s warehouse=%s source=%s", current_user.id, wid, source)
+    if source == "snapshot":
+        snap = warehouse_stats.snapshot_inbound_kpis(db, wid)
+        if snap is not None:
+            return snap
+        logger.warning("⚠️ No warehouse snapshots yet; computing inbound KPIs live")
+    if source == "counters":
+        return kpi_counters.read_kpis(db, wid)
+    return warehouse_stats.inbound_kpis(db, wid)
 
 @router.post("/receipts/{receipt_id}/auto-allocate", response_model=Receipt)
 def auto_allocate(
@@ -274,14 +292,13 @@ def auto_allocate(
     logger.info("✅ Auto-allocated bins for receipt %s", receipt_id)
     try:
         assigned = sum(1 for l in (obj.lines or []) if l.bin_id)
-        db.add(AuditLog(
+        audit_sink.record(
             actor_user_id=current_user.id,
             entity_type="inbound_receipt",
             entity_id=str(receipt_id),
             action="auto_allocate",
             changes={"assigned_bins": {"before": None, "after": assigned}}
-        ))
-        db.commit()
+        )
     except Exception:
         logger.exception("Failed to write audit log for auto-allocate")
     return obj
@@ -299,14 +316,13 @@ def reassign_line(
         raise HTTPException(status_code=404, detail="Line not found")
     logger.info("✅ Reassigned bin for line %s", line_id)
     try:
-        db.add(AuditLog(
+        audit_sink.record(
             actor_user_id=current_user.id,
             entity_type="inbound_line",
             entity_id=str(line_id),
             action="reassign_bin",
             changes={"bin_id": {"before": None, "after": str(obj.bin_id) if obj.bin_id else None}}
-        ))
-        db.commit()
+        )
     except Exception:
         logger.exception("Failed to write audit log for line reassign")
     return obj
@@ -324,14 +340,13 @@ def clear_line(
         raise HTTPException(status_code=404, detail="Line not found")
     logger.info("✅ Cleared bin for line %s", line_id)
     try:
-        db.add(AuditLog(
+        audit_sink.record(
             actor_user_id=current_user.id,
             entity_type="inbound_line",
             entity_id=str(line_id),
             action="clear_bin",
             changes={"bin_id": {"before": None, "after": None}}
-        ))
-        db.commit()
+        )
     except Exception:
         logger.exception("Failed to write audit log for line clear")
     return obj
@@ -340,83 +355,32 @@ def clear_line(
 @router.get("/debug/bin-stats")
 def debug_bin_stats(
     warehouse_id: Optional[uuid.UUID] = Query(None),
+    source: Literal["live", "snapshot"] = Query("live"),
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_active_user),
 ):
-    from sqlalchemy import func
     # If not provided, try to infer from user's warehouse_id (non-admin) or pick first
     wid = warehouse_id
     if wid is None:
         wid = getattr(current_user, 'warehouse_id', None)
         if wid is None:
             # fallback to first seen warehouse in receipts to keep this lightweight
-            any_rec = db.query(models.InboundReceipt).order_by(models.InboundReceipt.created_at.desc()).first()
+            any_rec = db.query(InboundReceipt).order_by(InboundReceipt.created_at.desc()).first()
             wid = getattr(any_rec, 'warehouse_id', None)
     if wid is None:
         return {
             "note": "warehouse_id not provided and could not infer; pass ?warehouse_id=...",
             "warehouse_id": None,
         }
-    # Racks
-    total_racks = db.query(func.count(Rack.id)).filter(Rack.warehouse_id == wid).scalar() or 0
-    active_racks = db.query(func.count(Rack.id)).filter(Rack.warehouse_id == wid, Rack.status == 'active').scalar() or 0
-    # Bins (all racks in warehouse)
-    total_bins = (
-        db.query(func.count(Bin.id))
-        .join(Rack, Bin.rack_id == Rack.id)
-        .filter(Rack.warehouse_id == wid)
-        .scalar() or 0
-    )
-    empty_bins_all = (
-        db.query(func.count(Bin.id))
-        .join(Rack, Bin.rack_id == Rack.id)
-        .filter(Rack.warehouse_id == wid, Bin.status == 'empty')
-        .scalar() or 0
-    )
-    # Bins on active racks only
-    empty_bins_active = (
-        db.query(func.count(Bin.id))
-        .join(Rack, Bin.rack_id == Rack.id)
-        .filter(Rack.warehouse_id == wid, Rack.status == 'active', Bin.status == 'empty')
-        .scalar() or 0
-    )
-    reserved_bins_active = (
-        db.query(func.count(Bin.id))
-        .join(Rack, Bin.rack_id == Rack.id)
-        .filter(Rack.warehouse_id == wid, Rack.status == 'active', Bin.status == 'reserved')
-        .scalar() or 0
-    )
-    occupied_bins_active = (
-        db.query(func.count(Bin.id))
-        .join(Rack, Bin.rack_id == Rack.id)
-        .filter(Rack.warehouse_id == wid, Rack.status == 'active', Bin.status == 'occupied')
-        .scalar() or 0
-    )
-    blocked_bins_active = (
-        db.query(func.count(Bin.id))
-        .join(Rack, Bin.rack_id == Rack.id)
-        .filter(Rack.warehouse_id == wid, Rack.status == 'active', Bin.status == 'blocked')
-        .scalar() or 0
-    )
-    maintenance_bins_active = (
-        db.query(func.count(Bin.id))
-        .join(Rack, Bin.rack_id == Rack.id)
-        .filter(Rack.warehouse_id == wid, Rack.status == 'active', Bin.status == 'maintenance')
-        .scalar() or 0
-    )
+    if source == "snapshot":
+        snap = warehouse_stats.snapshot_bin_stats(db, wid)
+        if snap is not None:
+            return snap
+        logger.warning("⚠️ No snapshot for warehouse %s; computing bin stats live", wid)
+    stats = warehouse_stats.bin_stats(db, wid)
     logger.info(
         "🔎 bin-stats wid=%s racks total=%d active=%d | bins total=%d empty_all=%d empty_active=%d",
-        wid, total_racks, active_racks, total_bins, empty_bins_all, empty_bins_active
+        wid, stats["racks"]["total"], stats["racks"]["active"], stats["bins_all_racks"]["total"],
+        stats["bins_all_racks"]["empty"], stats["bins_on_active_racks"]["empty"],
     )
-    return {
-        "warehouse_id": str(wid),
-        "racks": {"total": total_racks, "active": active_racks},
-        "bins_all_racks": {"total": total_bins, "empty": empty_bins_all},
-        "bins_on_active_racks": {
-            "empty": empty_bins_active,
-            "reserved": reserved_bins_active,
-            "occupied": occupied_bins_active,
-            "blocked": blocked_bins_active,
-            "maintenance": maintenance_bins_active,
-        },
-    }
+    return stats
@@ -23,13 +23,13 @@ def login_for_access_token(
     """
     OAuth2 compatible token login, get an access token for future requests.
     """
-    logger.info(f"ℹ️ Login attempt for user: {form_data.username}")
+    logger.info("ℹ️ Login attempt for user: %s", form_data.username)
     try:
         user = crud_user.user.authenticate_and_validate(
             db, email=form_data.username, password=form_data.password
         )
     except ValueError as e:
-        logger.warning(f"⚠️ Login failed for user: {form_data.username} - {str(e)}")
+        logger.warning("⚠️ Login failed for user: %s - %s", form_data.username, str(e))
         raise HTTPException(
             status_code=400,
             detail=str(e),
@@ -42,13 +42,13 @@ def login_for_access_token(
     db.commit()
     db.refresh(user)
 
-    logger.info(f"✅ Successful login for user: {user.email} (ID: {user.id})")
+    logger.info("✅ Successful login for user: %s (ID: %s)", user.email, user.id)
     # Use configurable expiry (defaults to 60 minutes)
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(subject=user.id, expires_delta=access_token_expires)
+    access_token = create_access_token(subject=user.id, expires_delta=access_token_expires, role=user.role)
 
-    logger.info(f"🔑 Token created for user: {user.email} (ID: {user.id})")
-    logger.debug(f"Token expiration: {datetime.utcnow() + access_token_expires}")
+    logger.info("🔑 Token created for user: %s (ID: %s)", user.email, user.id)
+    logger.debug("Token expiration: %s", datetime.utcnow() + access_token_expires)
 
     return {
         "access_token": access_token,
@@ -83,7 +83,7 @@ def refresh_access_token(
           raise HTTPException(status_code=403, detail="User inactive or not found")
       # Issue new token
       access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-      access_token = create_access_token(subject=sub, expires_delta=access_token_expires)
+      access_token = create_access_token(subject=sub, expires_delta=access_token_expires, role=user.role)
       return {"access_token": access_token, "token_type": "bearer"}
     except HTTPException:
       raise
@@ -17,9 +17,9 @@ def read_milestones(
     """
     Retrieve milestones.
     """
-    logger.info(f"ℹ️ Fetching milestones with skip={skip} and limit={limit}")
+    logger.info("ℹ️ Fetching milestones with skip=%s and limit=%s", skip, limit)
     milestones = crud.milestone.get_multi(db, skip=skip, limit=limit)
-    logger.info(f"✅ Retrieved {len(milestones)} milestones")
+    logger.info("✅ Retrieved %s milestones", len(milestones))
     return milestones
 
 @router.post("/", response_model=schemas.Milestone)
@@ -32,10 +32,10 @@ def create_milestone(
     """
     Create new milestone.
     """
-    logger.info(f"ℹ️ Attempting to create a new milestone: {milestone_in}")
+    logger.info("ℹ️ Attempting to create a new milestone: %s", milestone_in)
     if not crud.user.is_superuser(current_user):
-        logger.warning(f"⚠️ Permission denied for user {current_user.id} to create milestone")
+        logger.warning("⚠️ Permission denied for user %s to create milestone", current_user.id)
         raise HTTPException(status_code=403, detail="Not enough permissions")
     milestone = crud.milestone.create(db, obj_in=milestone_in)
-    logger.info(f"✅ Milestone created successfully: {milestone}")
+    logger.info("✅ Milestone created successfully: %s", milestone)
     return milestone
@@ -1,36 +1,76 @@
 # filepath: backend/app/api/endpoints/notifications.py
+import asyncio
+import json
 from typing import List
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.api import deps
 from app import crud, schemas
+from app.core.config import settings
+from app.services.notification_broker import broker
 
 router = APIRouter()
 
 @router.get("/me", response_model=List[schemas.Notification])
 def get_my_notifications(
     db: Session = Depends(deps.get_db),
-    current_user = Depends(deps.get_current_active_user),
+    current_user = Depends(deps.get_current_active_principal),
     skip: int = 0,
     limit: int = 50,
 ):
     return crud.notification.get_for_user(db, user_id=current_user.id, skip=skip, limit=limit)
 
 @router.get("/me/unread-count", response_model=int)
-def get_my_unread_count(
-    db: Session = Depends(deps.get_db),
-    current_user = Depends(deps.get_current_active_user),
+async def get_my_unread_count(
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user = Depends(deps.get_current_active_principal_async),
+):
+    return await crud.notification.get_unread_count_async(db, user_id=current_user.id)
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+@router.get("/me/stream")
+async def stream_my_notifications(
+    request: Request,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user = Depends(deps.get_current_active_principal_async),
 ):
-    return crud.notification.get_unread_count(db, user_id=current_user.id)
+    """Server-sent events: the unread count on connect, then ``notification`` and
+    ``unread`` events as they happen (replaces polling ``/me/unread-count``)."""
+    user_id = current_user.id
+
+    async def events():
+        with broker.subscribe(user_id) as queue:
+            # Subscribed before reading the count, so nothing is missed in between;
+            # the session is closed so an open stream holds no pooled connection
+            unread = await crud.notification.get_unread_count_async(db, user_id=user_id)
+            await db.close()
+            yield _sse("unread", {"user_id": str(user_id), "unread": unread})
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.NOTIFICATION_STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield _sse(event.get("event", "notification"), event)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @router.post("/me/{notification_id}/read", response_model=schemas.Notification)
 def mark_as_read(
     notification_id: str,
     db: Session = Depends(deps.get_db),
-    current_user = Depends(deps.get_current_active_user),
+    current_user = Depends(deps.get_current_active_principal),
 ):
     notif = crud.notification.get(db, id=notification_id)
     if not notif or str(notif.user_id) != str(current_user.id):
         from fastapi import HTTPException
         raise HTTPException(status_code=404, detail="Notification not found")
-    return crud.notification.update(db, db_obj=notif, obj_in=schemas.NotificationUpdate(is_read=True))
+    return crud.notification.mark_read(db, db_obj=notif)
@@ -19,7 +19,7 @@ def create_order(
     """
     Create a new order. 📦
     """
-    logger.info(f"📝 Creating new order for customer {order_in.customer_id} by user {current_user.email}")
+    logger.info("📝 Creating new order for customer %s by user %s", order_in.customer_id, current_user.email)
     order = crud.order.create_with_items(db=db, obj_in=order_in)
     return order
 
@@ -33,9 +33,9 @@ def read_orders(
     """
     Retrieve all orders (Admins only). 📄
     """
-    logger.info(f"🔎 Admin {current_user.email} fetching all orders.")
+    logger.info("🔎 Admin %s fetching all orders.", current_user.email)
     orders = crud.order.get_multi(db, skip=skip, limit=limit)
-    logger.info(f"📄 {len(orders)} orders returned.")
+    logger.info("📄 %s orders returned.", len(orders))
     return orders
 
 @router.get("/me", response_model=List[schemas.Order])
@@ -49,10 +49,10 @@ def read_my_orders(
     # Find customer profile for current user
     customer = db.query(models.Customer).filter(models.Customer.user_id == current_user.id).first()
     if not customer:
-        logger.warning(f"❌ Customer profile not found for user_id: {current_user.id}")
+        logger.warning("❌ Customer profile not found for user_id: %s", current_user.id)
         raise HTTPException(status_code=404, detail="Customer profile not found.")
     orders = db.query(models.Order).filter(models.Order.customer_id == customer.id).all()
-    logger.info(f"📦 {len(orders)} orders returned for customer {customer.id}.")
+    logger.info("📦 %s orders returned for customer %s.", len(orders), customer.id)
     return orders
 
 @router.get("/{order_id}/products", response_model=List[schemas.OrderProduct])
@@ -64,6 +64,6 @@ def get_order_products(
     """
     Retrieve all products associated with an order.
     """
-    logger.info(f"🔍 User '{current_user.email}' fetching products for order '{order_id}'.")
+    logger.info("🔍 User '%s' fetching products for order '%s'.", current_user.email, order_id)
     products = crud.order_product.get_by_order_id(db, order_id=order_id)
     return products
\ No newline at end of file
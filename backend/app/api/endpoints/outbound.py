@@ -1,9 +1,11 @@
 from fastapi import APIRouter, Depends, Request
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import func, select
 from datetime import datetime
 from app import models
 from app.api import deps
+from app.core.auth_cache import Principal
 from app.schemas.outbound import (
     PickTask, ToteLocation, PackingTote, RouteSummary, RouteBin as RouteBinSchema, DispatchRoute,
     ReassignPickPayload, SplitPickPayload, ReassignTotePayload, OverridePayload,
@@ -16,32 +18,26 @@ _now = lambda: datetime.utcnow().isoformat()
 
 # Pick
 @router.get('/outbound/pick-tasks', response_model=list[PickTask])
-def fetch_pick_tasks(
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_active_user),
+async def fetch_pick_tasks(
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: Principal = Depends(deps.get_current_active_principal_async),
 ):
-    # Build pick tasks from existing Orders and OrderProduct quantities
-    q = db.query(models.Order)
+    # Build pick tasks from existing Orders and OrderProduct quantities, summed in the same query
+    sku_count = (
+        select(func.coalesce(func.sum(models.OrderProduct.quantity), 0))
+        .where(models.OrderProduct.order_id == models.Order.id)
+        .correlate(models.Order)
+        .scalar_subquery()
+    )
+    stmt = select(models.Order.id, models.Order.status, sku_count.label('sku_count'))
     eff_wh = deps.get_effective_warehouse_id(current_user)
     if eff_wh:
-        q = q.filter(models.Order.warehouse_id == eff_wh)
-    orders = q.order_by(models.Order.created_at.desc()).limit(200).all()
+        stmt = stmt.where(models.Order.warehouse_id == eff_wh)
+    orders = (await db.execute(stmt.order_by(models.Order.created_at.desc()).limit(200))).all()
 
     results: list[PickTask] = []
     for o in orders:
-        try:
-            sku_count = 0
-            # Sum via relationship if loaded; fallback join otherwise
-            if hasattr(o, 'items') and o.items is not None:
-                sku_count = int(sum(int(getattr(it, 'quantity', 0) or 0) for it in o.items))
-            else:
-                sku_count = int(
-                    db.query(func.coalesce(func.sum(models.OrderProduct.quantity), 0))
-                    .filter(models.OrderProduct.order_id == o.id)
-                    .scalar() or 0
-                )
-        except Exception:
-            sku_count = 0
+        sku_count = int(o.sku_count or 0)
         # Map order status to pick status
         ost = str(getattr(o, 'status', 'pending') or 'pending').lower()
         if ost in {'completed', 'done', 'closed'}:
@@ -145,22 +141,38 @@ def reoptimize_routes(db: Session = Depends(deps.get_db), _=Depends(deps.ensure_
 
 # Dispatch
 @router.get('/outbound/dispatch/routes', response_model=list[DispatchRoute])
-def fetch_dispatch_routes(
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_active_user),
+async def fetch_dispatch_routes(
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: Principal = Depends(deps.get_current_active_principal_async),
 ):
     eff_wh = deps.get_effective_warehouse_id(current_user)
-    q = db.query(models.Route)
+    stmt = select(models.Route).options(
+        selectinload(models.Route.bins).selectinload(models.RouteBin.crates),
+        selectinload(models.Route.driver),
+        selectinload(models.Route.vehicle),
+    )
     if eff_wh:
-        q = q.filter(models.Route.warehouse_id == eff_wh)
-    routes = q.order_by(models.Route.created_at.desc()).limit(100).all()
+        stmt = stmt.where(models.Route.warehouse_id == eff_wh)
+    routes = (await db.scalars(stmt.order_by(models.Route.created_at.desc()).limit(100))).all()
+
+    # Loading logs for all routes in one query instead of one per route
+    logs_by_route: dict = {}
+    if routes:
+        log_rows = await db.scalars(
+            select(models.DispatchLoadingLog)
+            .options(selectinload(models.DispatchLoadingLog.crate))
+            .where(models.DispatchLoadingLog.route_id.in_([r.id for r in routes]))
+            .order_by(models.DispatchLoadingLog.ts.asc())
+        )
+        for l in log_rows:
+            logs_by_route.setdefault(l.route_id, []).append(l)
 
     result: list[DispatchRoute] = []
     for r in routes:
         totes_expected = 0
         for b in (r.bins or []):
             totes_expected += len(b.crates or [])
-        logs = db.query(models.DispatchLoadingLog).filter(models.DispatchLoadingLog.route_id == r.id).order_by(models.DispatchLoadingLog.ts.asc()).all()
+        logs = logs_by_route.get(r.id, [])
         loading_logs = [
             {
                 'ts': (l.ts.isoformat() if hasattr(l.ts, 'isoformat') else str(l.ts)),
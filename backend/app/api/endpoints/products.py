@@ -20,7 +20,7 @@ def read_products(
     limit: int = 100,
     current_user: User = Depends(deps.get_current_active_user),
 ):
-    logger.info(f"ℹ️ User '{current_user.id}' listing all products.")
+    logger.info("ℹ️ User '%s' listing all products.", current_user.id)
     return crud_product.product.get_multi(db, skip=skip, limit=limit)
 
 @router.post("/", response_model=Product)
@@ -29,9 +29,9 @@ def create_product(
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_active_user),
 ):
-    logger.info(f"ℹ️ User '{current_user.id}' attempting to create product: {product_in.name}")
+    logger.info("ℹ️ User '%s' attempting to create product: %s", current_user.id, product_in.name)
     new_product = crud_product.product.create(db, obj_in=product_in)
-    logger.info(f"✅ Product '{new_product.id}' created successfully by user '{current_user.id}'.")
+    logger.info("✅ Product '%s' created successfully by user '%s'.", new_product.id, current_user.id)
     return new_product
 
 @router.get("/{product_id}", response_model=Product)
@@ -40,10 +40,10 @@ def read_product(
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_active_user),
 ):
-    logger.info(f"ℹ️ User '{current_user.id}' requesting product '{product_id}'.")
+    logger.info("ℹ️ User '%s' requesting product '%s'.", current_user.id, product_id)
     db_product = crud_product.product.get(db, id=product_id)
     if db_product is None:
-        logger.warning(f"❌ Product '{product_id}' not found for request from user '{current_user.id}'.")
+        logger.warning("❌ Product '%s' not found for request from user '%s'.", product_id, current_user.id)
         raise HTTPException(status_code=404, detail="Product not found")
     return db_product
 
@@ -54,13 +54,13 @@ def update_product(
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_active_user),
 ):
-    logger.info(f"ℹ️ User '{current_user.id}' attempting to update product '{product_id}'.")
+    logger.info("ℹ️ User '%s' attempting to update product '%s'.", current_user.id, product_id)
     db_product = crud_product.product.get(db, id=product_id)
     if db_product is None:
-        logger.warning(f"❌ Product '{product_id}' not found for update attempt by user '{current_user.id}'.")
+        logger.warning("❌ Product '%s' not found for update attempt by user '%s'.", product_id, current_user.id)
         raise HTTPException(status_code=404, detail="Product not found")
     updated_product = crud_product.product.update(db, db_obj=db_product, obj_in=product_in)
-    logger.info(f"✅ Product '{updated_product.id}' updated successfully by user '{current_user.id}'.")
+    logger.info("✅ Product '%s' updated successfully by user '%s'.", updated_product.id, current_user.id)
     return updated_product
 
 @router.delete("/{product_id}", response_model=Product)
@@ -69,13 +69,13 @@ def delete_product(
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_active_superuser), # Admin only
 ):
-    logger.info(f"ℹ️ Admin '{current_user.id}' attempting to delete product '{product_id}'.")
+    logger.info("ℹ️ Admin '%s' attempting to delete product '%s'.", current_user.id, product_id)
     db_product = crud_product.product.get(db, id=product_id)
     if db_product is None:
-        logger.warning(f"❌ Product '{product_id}' not found for deletion attempt by admin '{current_user.id}'.")
+        logger.warning("❌ Product '%s' not found for deletion attempt by admin '%s'.", product_id, current_user.id)
         raise HTTPException(status_code=404, detail="Product not found")
     deleted_product = crud_product.product.remove(db, id=product_id)
-    logger.info(f"✅ Product '{deleted_product.id}' deleted successfully by admin '{current_user.id}'.")
+    logger.info("✅ Product '%s' deleted successfully by admin '%s'.", deleted_product.id, current_user.id)
     return deleted_product
 
 @router.get("/{product_id}/stores", response_model=List[StoreProductSchema])
@@ -87,6 +87,6 @@ def get_product_stores(
     """
     Retrieve all stores where the product is available.
     """
-    logger.info(f"🔍 User '{current_user.id}' fetching stores for product '{product_id}'.")
+    logger.info("🔍 User '%s' fetching stores for product '%s'.", current_user.id, product_id)
     stores = crud_product.product.get_stores(db, product_id=product_id)
     return stores
\ No newline at end of file
@@ -8,6 +8,8 @@ from app.crud import crud_rack
 from app.api.endpoints.bins import materialize_bins as materialize_bins_for_rack
 from app.schemas.rack import Rack, RackCreateRequest, RackUpdate, RackOut
 from app.models.user import User
+from app.services.free_bin_index import free_bins
+from app.services.rack_occupancy import occupancy
 
 router = APIRouter()
 
@@ -39,7 +41,12 @@ def update_rack(
     db_rack = crud_rack.rack.get(db, id=rack_id)
     if not db_rack:
         raise HTTPException(status_code=404, detail="Rack not found")
+    previous_warehouse_id = db_rack.warehouse_id
     updated = crud_rack.rack.update(db, db_obj=db_rack, obj_in=rack_in)
+    # Status/name changes alter which bins are free and their slotting order
+    free_bins.invalidate(previous_warehouse_id)
+    free_bins.invalidate(updated.warehouse_id)
+    occupancy.invalidate(previous_warehouse_id)
     return crud_rack.rack.with_stats(db, updated)
 
 @router.delete("/racks/{rack_id}", response_model=Rack)
@@ -51,7 +58,10 @@ def delete_rack(
     db_rack = crud_rack.rack.get(db, id=rack_id)
     if not db_rack:
         raise HTTPException(status_code=404, detail="Rack not found")
-    return crud_rack.rack.remove(db, id=rack_id)
+    removed = crud_rack.rack.remove(db, id=rack_id)
+    free_bins.invalidate(removed.warehouse_id)
+    occupancy.invalidate(removed.warehouse_id)
+    return removed
 
 @router.post("/racks/{rack_id}/materialize", response_model=dict)
 def materialize_rack_bins(
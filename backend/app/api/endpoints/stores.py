@@ -3,12 +3,12 @@ import uuid
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from math import radians, sin, cos, asin, sqrt
 
 from app.api import deps
 from app import crud, models, schemas
 from app.schemas.inventory import BatchAdjustRequest, BatchAdjustResult
-from app.models.audit_log import AuditLog
+from app.services.audit_sink import audit_sink
+from app.services.spatial_index import spatial
 
 router = APIRouter()
 logger = logging.getLogger("app.api.endpoints.stores")
@@ -20,7 +20,7 @@ def list_stores(
     limit: int = 100,
     current_user: models.User = Depends(deps.get_current_active_user),
 ):
-    logger.info(f"ℹ️ User '{current_user.id}' listing stores: skip={skip}, limit={limit}")
+    logger.info("ℹ️ User '%s' listing stores: skip=%s, limit=%s", current_user.id, skip, limit)
     return crud.store.get_multi(db, skip=skip, limit=limit)
 
 @router.get("/by-vendor/{vendor_id}", response_model=List[schemas.Store])
@@ -29,7 +29,7 @@ def get_stores_by_vendor(
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_user),
 ):
-    logger.info(f"ℹ️ User '{current_user.id}' listing stores by vendor '{vendor_id}'")
+    logger.info("ℹ️ User '%s' listing stores by vendor '%s'", current_user.id, vendor_id)
     return crud.store.get_multi_by_vendor(db, vendor_id=vendor_id)
 
 @router.post("/", response_model=schemas.Store)
@@ -38,11 +38,11 @@ def create_store(
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_user),
 ):
-    logger.info(f"ℹ️ User '{current_user.id}' creating store '{store_in.store_name}' for vendor '{store_in.vendor_id}'")
+    logger.info("ℹ️ User '%s' creating store '%s' for vendor '%s'", current_user.id, store_in.store_name, store_in.vendor_id)
     # Ensure vendor exists
     vendor = crud.vendor.get(db, id=str(store_in.vendor_id))
     if not vendor:
-        logger.warning(f"❌ Vendor '{store_in.vendor_id}' not found while creating store")
+        logger.warning("❌ Vendor '%s' not found while creating store", store_in.vendor_id)
         raise HTTPException(status_code=404, detail="Vendor not found")
     return crud.store.create(db, obj_in=store_in)
 
@@ -154,57 +154,28 @@ def batch_adjust_store_products(
         sp = crud.store_product.update(db, db_obj=sp, obj_in={"available_qty": it.available_qty})
         updated_count += 1
         # audit log
-        db.add(
-            AuditLog(
-                actor_user_id=current_user.id,
-                entity_type="store_product",
-                entity_id=str(sp.id),
-                action="adjust",
-                changes={
-                    "available_qty": {"before": before_qty, "after": it.available_qty},
-                    "reason": {"before": None, "after": it.reason},
-                },
-            )
+        audit_sink.record(
+            actor_user_id=current_user.id,
+            entity_type="store_product",
+            entity_id=str(sp.id),
+            action="adjust",
+            changes={
+                "available_qty": {"before": before_qty, "after": it.available_qty},
+                "reason": {"before": None, "after": it.reason},
+            },
         )
-        db.commit()
     return BatchAdjustResult(updated=updated_count)
 
 @router.get("/nearby", response_model=List[schemas.Store])
 def list_nearby_stores(
-    lat: float = Query(..., description="Customer latitude"),
-    lon: float = Query(..., description="Customer longitude"),
-    radius_km: float = Query(10.0, description="Search radius in kilometers"),
+    lat: float = Query(..., ge=-90, le=90, description="Customer latitude"),
+    lon: float = Query(..., ge=-180, le=180, description="Customer longitude"),
+    radius_km: float = Query(10.0, ge=0, description="Search radius in kilometers"),
     vendor_id: Optional[uuid.UUID] = Query(None, description="Optional vendor filter"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Return at most this many stores"),
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_user),
 ):
-    """Return stores within radius_km of (lat, lon)."""
-    def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-        # convert decimal degrees to radians
-        lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-        dlon = lon2 - lon1
-        dlat = lat2 - lat1
-        a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
-        c = 2 * asin(sqrt(a))
-        R = 6371.0  # Radius of earth in kilometers
-        return R * c
-
-    q = db.query(models.Store).filter(models.Store.latitude.isnot(None), models.Store.longitude.isnot(None))
-    if vendor_id is not None:
-        q = q.filter(models.Store.vendor_id == vendor_id)
-    stores = q.all()
-
-    results = []
-    for s in stores:
-        try:
-            s_lat = float(s.latitude)
-            s_lon = float(s.longitude)
-        except Exception:
-            # Skip stores with non-castable coords
-            continue
-        dist = haversine_km(lat, lon, s_lat, s_lon)
-        if dist <= radius_km:
-            results.append((dist, s))
-
-    results.sort(key=lambda t: t[0])
-    return [s for _, s in results]
+    """Return stores within radius_km of (lat, lon), nearest first."""
+    hits = spatial.nearby(db, "store", lat, lon, radius_km, limit=limit, vendor_id=vendor_id)
+    return spatial.rows(db, "store", hits)
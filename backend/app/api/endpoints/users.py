@@ -29,14 +29,14 @@ def read_users(
     """
     role = str(getattr(current_user, "role", "")).upper()
     if role == "ADMIN":
-        logger.info(f"ℹ️ Admin '{current_user.id}' listing all users.")
+        logger.info("ℹ️ Admin '%s' listing all users.", current_user.id)
         return crud_user.user.get_multi(db, skip=skip, limit=limit)
     if role == "MANAGER":
-        logger.info(f"ℹ️ Manager '{current_user.id}' listing users for warehouse '{current_user.warehouse_id}'.")
+        logger.info("ℹ️ Manager '%s' listing users for warehouse '%s'.", current_user.id, current_user.warehouse_id)
         # Fetch all and filter by warehouse_id match
         all_users = crud_user.user.get_multi(db, skip=skip, limit=limit)
         return [u for u in all_users if getattr(u, "warehouse_id", None) == getattr(current_user, "warehouse_id", None)]
-    logger.info(f"ℹ️ Non-admin '{current_user.id}' fetching self only.")
+    logger.info("ℹ️ Non-admin '%s' fetching self only.", current_user.id)
     me = crud_user.user.get(db, id=current_user.id)
     return [me] if me else []
 
@@ -51,10 +51,10 @@ def create_user(
     """
     Create new user. (Public)
     """
-    logger.info(f"ℹ️ Attempting to create user with email: {user_in.email}")
+    logger.info("ℹ️ Attempting to create user with email: %s", user_in.email)
     user = crud_user.user.get_by_email(db, email=user_in.email)
     if user:
-        logger.warning(f"⚠️ User creation failed: email {user_in.email} already exists.")
+        logger.warning("⚠️ User creation failed: email %s already exists.", user_in.email)
         raise HTTPException(
             status_code=400,
             detail="The user with this email already exists in the system.",
@@ -77,7 +77,7 @@ def create_user(
             user_in = UserCreate(**data)
 
     new_user = crud_user.user.create(db, obj_in=user_in)
-    logger.info(f"✅ Successfully created user with ID: {new_user.id}")
+    logger.info("✅ Successfully created user with ID: %s", new_user.id)
     return new_user
 
 @router.get("/me", response_model=User)
@@ -85,7 +85,7 @@ def read_user_me(current_user: UserModel = Depends(deps.get_current_active_user)
     """
     Get current user's profile.
     """
-    logger.info(f"ℹ️ User '{current_user.id}' requesting their own profile.")
+    logger.info("ℹ️ User '%s' requesting their own profile.", current_user.id)
     return current_user
 
 @router.get("/with-warehouses", response_model=List[User])
@@ -101,7 +101,7 @@ def read_users_with_warehouses(
     """
     role = str(getattr(current_user, "role", "")).upper()
     if role == "ADMIN":
-        logger.info(f"ℹ️ Admin '{current_user.id}' listing all users with warehouses.")
+        logger.info("ℹ️ Admin '%s' listing all users with warehouses.", current_user.id)
         users_with_warehouses = crud_user.user.get_all_with_warehouses(db)
         return [
             {
@@ -111,14 +111,14 @@ def read_users_with_warehouses(
             for user, warehouse in users_with_warehouses
         ]
     if role == "MANAGER":
-        logger.info(f"ℹ️ Manager '{current_user.id}' listing users for warehouse '{current_user.warehouse_id}' with warehouses.")
+        logger.info("ℹ️ Manager '%s' listing users for warehouse '%s' with warehouses.", current_user.id, current_user.warehouse_id)
         users_with_warehouses = crud_user.user.get_all_with_warehouses(db)
         filtered = []
         for user, warehouse in users_with_warehouses:
             if getattr(user, "warehouse_id", None) == getattr(current_user, "warehouse_id", None):
                 filtered.append({ **user.__dict__, "warehouse": warehouse.name if warehouse else None })
         return filtered
-    logger.info(f"ℹ️ Non-admin '{current_user.id}' fetching self with warehouse.")
+    logger.info("ℹ️ Non-admin '%s' fetching self with warehouse.", current_user.id)
     result = crud_user.user.get_with_warehouse(db, user_id=current_user.id)
     return [result] if result else []
 
@@ -131,17 +131,17 @@ def read_user_by_id(
     """
     Get a specific user by ID.
     """
-    logger.info(f"ℹ️ User '{current_user.id}' requesting profile for user '{user_id}'.")
+    logger.info("ℹ️ User '%s' requesting profile for user '%s'.", current_user.id, user_id)
     user = crud_user.user.get(db, id=user_id)
     if not user:
-        logger.warning(f"❌ User '{user_id}' not found for request from user '{current_user.id}'.")
+        logger.warning("❌ User '%s' not found for request from user '%s'.", user_id, current_user.id)
         raise HTTPException(status_code=404, detail="User not found")
     role = str(getattr(current_user, "role", "")).upper()
     if user.id != current_user.id and role != "ADMIN":
         # Allow MANAGER to read users within the same warehouse
         if role == "MANAGER" and getattr(user, "warehouse_id", None) == getattr(current_user, "warehouse_id", None):
             return user
-        logger.warning(f"🚫 Permission denied: User '{current_user.id}' attempted to read profile of user '{user.id}'.")
+        logger.warning("🚫 Permission denied: User '%s' attempted to read profile of user '%s'.", current_user.id, user.id)
         raise HTTPException(status_code=403, detail="Not enough permissions")
     return user
 
@@ -157,10 +157,10 @@ def update_user(
     """
     Update a user.
     """
-    logger.info(f"ℹ️ User '{current_user.id}' attempting to update user '{user_id}'.")
+    logger.info("ℹ️ User '%s' attempting to update user '%s'.", current_user.id, user_id)
     user = crud_user.user.get(db, id=user_id)
     if not user:
-        logger.warning(f"❌ User '{user_id}' not found for update attempt by user '{current_user.id}'.")
+        logger.warning("❌ User '%s' not found for update attempt by user '%s'.", user_id, current_user.id)
         raise HTTPException(status_code=404, detail="User not found")
     role = str(getattr(current_user, "role", "")).upper()
     if user.id != current_user.id and role != "ADMIN":
@@ -178,10 +178,10 @@ def update_user(
             except AttributeError:
                 pass
         else:
-            logger.warning(f"🚫 Permission denied: User '{current_user.id}' attempted to update user '{user.id}'.")
+            logger.warning("🚫 Permission denied: User '%s' attempted to update user '%s'.", current_user.id, user.id)
             raise HTTPException(status_code=403, detail="Not enough permissions")
     updated_user = crud_user.user.update(db, db_obj=user, obj_in=user_in)
-    logger.info(f"✅ User '{user.id}' updated successfully by user '{current_user.id}'.")
+    logger.info("✅ User '%s' updated successfully by user '%s'.", user.id, current_user.id)
     return updated_user
 
 @router.delete("/{user_id}", response_model=User)
@@ -198,14 +198,14 @@ def delete_user(
     - MANAGER: users within their own warehouse (cannot delete ADMIN)
     """
     role = str(getattr(current_user, "role", "")).upper()
-    logger.info(f"ℹ️ User '{current_user.id}' attempting to delete user '{user_id}'.")
+    logger.info("ℹ️ User '%s' attempting to delete user '%s'.", current_user.id, user_id)
     user = crud_user.user.get(db, id=user_id)
     if not user:
-        logger.warning(f"❌ User '{user_id}' not found for deletion attempt by user '{current_user.id}'.")
+        logger.warning("❌ User '%s' not found for deletion attempt by user '%s'.", user_id, current_user.id)
         raise HTTPException(status_code=404, detail="User not found")
     if role == "ADMIN":
         deleted_user = crud_user.user.remove(db, id=user_id)
-        logger.info(f"✅ User '{user.id}' deleted successfully by admin '{current_user.id}'.")
+        logger.info("✅ User '%s' deleted successfully by admin '%s'.", user.id, current_user.id)
         return deleted_user
     if role == "MANAGER":
         # Scope to manager's warehouse and disallow deleting admins
@@ -214,6 +214,6 @@ def delete_user(
         if str(getattr(user, "role", "")).upper() == "ADMIN":
             raise HTTPException(status_code=403, detail="Cannot delete ADMIN users")
         deleted_user = crud_user.user.remove(db, id=user_id)
-        logger.info(f"✅ User '{user.id}' deleted successfully by manager '{current_user.id}'.")
+        logger.info("✅ User '%s' deleted successfully by manager '%s'.", user.id, current_user.id)
         return deleted_user
     raise HTTPException(status_code=403, detail="Not enough permissions")
\ No newline at end of file
@@ -1,13 +1,13 @@
 import logging
 from typing import List, Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 import uuid
 
 from app import crud, models, schemas
 from app.core.privacy import mask_contact_dict
 from app.schemas.privacy import UnmaskRequest, UnmaskResponse
-from app.models.audit_log import AuditLog
+from app.services.audit_sink import audit_sink
 from datetime import datetime
 from app.api import deps
 
@@ -23,47 +23,36 @@ def read_own_vendor_profile(
     """
     Get the vendor profile for the authenticated user.
     """
-    logger.info(f"🔎 Fetching own vendor profile for user {current_user.email} (id: {current_user.id})")
+    logger.info("🔎 Fetching own vendor profile for user %s (id: %s)", current_user.email, current_user.id)
     vendor = crud.vendor.get_by_user(db, user_id=current_user.id)
     if not vendor:
-        logger.warning(f"❌ Vendor profile not found for user {current_user.email} (id: {current_user.id})")
+        logger.warning("❌ Vendor profile not found for user %s (id: %s)", current_user.email, current_user.id)
         raise HTTPException(status_code=404, detail="Vendor profile not found for this user.")
-    logger.info(f"✅ Vendor profile found for user {current_user.email} (id: {current_user.id})")
+    logger.info("✅ Vendor profile found for user %s (id: %s)", current_user.email, current_user.id)
     d = schemas.Vendor.model_validate(vendor).model_dump()
     return mask_contact_dict(d, phone_key="phone_number", email_key="email")
 
 @router.get("/summary", response_model=List[schemas.VendorSummary])
 def list_vendor_summaries(
     db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_active_user)
+    current_user: models.User = Depends(deps.get_current_active_user),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
 ) -> Any:
-    """Return vendors with store_count and product_count (across their stores)."""
-    vendors = crud.vendor.get_multi(db)
-    result: list[schemas.VendorSummary] = []
-    for v in vendors:
-        store_count = db.query(models.Store).filter(models.Store.vendor_id == v.id).count()
-        # Count distinct products across all stores for this vendor
-        from app.models.store_products import StoreProduct
-        product_count = (
-            db.query(StoreProduct.product_id)
-            .join(models.Store, StoreProduct.store_id == models.Store.id)
-            .filter(models.Store.vendor_id == v.id)
-            .distinct()
-            .count()
+    """Return vendors with store_count and product_count (across their stores), ordered by name."""
+    return [
+        schemas.VendorSummary(
+            id=row.id,
+            business_name=row.business_name,
+            email=mask_contact_dict({"email": row.email}).get("email"),
+            phone_number=mask_contact_dict({"phone_number": row.phone_number}).get("phone_number"),
+            vendor_type=row.vendor_type,
+            vendor_status=row.vendor_status,
+            store_count=row.store_count,
+            product_count=row.product_count,
         )
-        result.append(
-            schemas.VendorSummary(
-                id=v.id,
-                business_name=v.business_name,
-                email=mask_contact_dict({"email": v.email}).get("email"),
-                phone_number=mask_contact_dict({"phone_number": v.phone_number}).get("phone_number"),
-                vendor_type=v.vendor_type,
-                vendor_status=v.vendor_status,
-                store_count=store_count,
-                product_count=product_count,
-            )
-        )
-    return result
+        for row in crud.vendor.get_summaries(db, skip=skip, limit=limit)
+    ]
 
 @router.get("/{vendor_id}", response_model=schemas.Vendor)
 def read_vendor_by_id(
@@ -74,12 +63,12 @@ def read_vendor_by_id(
     """
     Retrieve a vendor profile by its ID.
     """
-    logger.info(f"🔎 Admin {current_user.email} (id: {current_user.id}) fetching vendor profile by id: {vendor_id}")
+    logger.info("🔎 Admin %s (id: %s) fetching vendor profile by id: %s", current_user.email, current_user.id, vendor_id)
     vendor = crud.vendor.get(db, id=vendor_id)
     if not vendor:
-        logger.warning(f"❌ Vendor profile not found for id: {vendor_id}")
+        logger.warning("❌ Vendor profile not found for id: %s", vendor_id)
         raise HTTPException(status_code=404, detail="Vendor not found.")
-    logger.info(f"✅ Vendor profile found for id: {vendor_id}")
+    logger.info("✅ Vendor profile found for id: %s", vendor_id)
     d = schemas.Vendor.model_validate(vendor).model_dump()
     return mask_contact_dict(d, phone_key="phone_number", email_key="email")
 
@@ -92,9 +81,9 @@ def create_vendor_profile(
     """
     Create a new vendor profile for the authenticated user.
     """
-    logger.info(f"📝 Admin {current_user.email} (id: {current_user.id}) attempting to create vendor profile.")
+    logger.info("📝 Admin %s (id: %s) attempting to create vendor profile.", current_user.email, current_user.id)
     vendor = crud.vendor.create(db, obj_in=vendor_in)
-    logger.info(f"✅ Vendor profile created successfully, vendor_id: {vendor.id}")
+    logger.info("✅ Vendor profile created successfully, vendor_id: %s", vendor.id)
     return vendor
 
 @router.get("/", response_model=List[schemas.Vendor])
@@ -106,9 +95,9 @@ def read_vendors(
     """
     🏪 Retrieve all vendors.
     """
-    logger.info(f"🏪 Fetching all vendors. skip={skip}, limit={limit}")
+    logger.info("🏪 Fetching all vendors. skip=%s, limit=%s", skip, limit)
     vendors = crud.vendor.get_multi(db, skip=skip, limit=limit)
-    logger.info(f"✅ {len(vendors)} vendors returned.")
+    logger.info("✅ %s vendors returned.", len(vendors))
     masked = []
     for v in vendors:
         d = schemas.Vendor.model_validate(v).model_dump()
@@ -126,13 +115,13 @@ def update_vendor(
     """
     Update a vendor profile.
     """
-    logger.info(f"✏️ Attempting to update vendor profile {id}.")
+    logger.info("✏️ Attempting to update vendor profile %s.", id)
     db_vendor = crud.vendor.get(db, id=id)
     if not db_vendor:
-        logger.warning(f"❌ Vendor profile not found for id: {id}")
+        logger.warning("❌ Vendor profile not found for id: %s", id)
         raise HTTPException(status_code=404, detail="Vendor not found.")
     updated_vendor = crud.vendor.update(db, db_obj=db_vendor, obj_in=vendor_in)
-    logger.info(f"✅ Vendor profile {id} updated successfully.")
+    logger.info("✅ Vendor profile %s updated successfully.", id)
     return updated_vendor
 
 @router.delete("/{vendor_id}", response_model=schemas.Vendor)
@@ -145,13 +134,13 @@ def delete_vendor(
     """
     Delete a vendor profile. (Admins only)
     """
-    logger.info(f"🗑️ Admin {current_user.email} (id: {current_user.id}) attempting to delete vendor profile {vendor_id}.")
+    logger.info("🗑️ Admin %s (id: %s) attempting to delete vendor profile %s.", current_user.email, current_user.id, vendor_id)
     db_vendor = crud.vendor.get(db, id=vendor_id)
     if not db_vendor:
-        logger.warning(f"❌ Vendor profile not found for id: {vendor_id}")
+        logger.warning("❌ Vendor profile not found for id: %s", vendor_id)
         raise HTTPException(status_code=404, detail="Vendor not found.")
     deleted_vendor = crud.vendor.remove(db, id=vendor_id)
-    logger.info(f"✅ Vendor profile {vendor_id} deleted successfully by admin {current_user.email}.")
+    logger.info("✅ Vendor profile %s deleted successfully by admin %s.", vendor_id, current_user.email)
     return deleted_vendor
 
 
@@ -165,16 +154,15 @@ def unmask_vendor_contact(
     v = crud.vendor.get(db, id=vendor_id)
     if not v:
         raise HTTPException(status_code=404, detail="Vendor not found")
-    db.add(
-        AuditLog(
-            actor_user_id=current_user.id,
-            entity_type="vendor_contact_unmask",
-            entity_id=str(vendor_id),
-            action="unmask",
-            changes={"reason": {"before": None, "after": payload.reason}},
-        )
+    # Written and committed before the contact details are returned
+    audit_sink.write(
+        db,
+        actor_user_id=current_user.id,
+        entity_type="vendor_contact_unmask",
+        entity_id=str(vendor_id),
+        action="unmask",
+        changes={"reason": {"before": None, "after": payload.reason}},
     )
-    db.commit()
     return UnmaskResponse(
         id=v.id,
         name=v.business_name,
@@ -194,7 +182,7 @@ def get_vendor_stores(
     """
     Retrieve all stores associated with a vendor.
     """
-    logger.info(f"🔍 User '{current_user.email}' fetching stores for vendor '{vendor_id}'.")
+    logger.info("🔍 User '%s' fetching stores for vendor '%s'.", current_user.email, vendor_id)
     stores = crud.store.get_multi_by_vendor(db, vendor_id=vendor_id)
-    logger.info(f"✅ {len(stores)} stores found for vendor '{vendor_id}'.")
+    logger.info("✅ %s stores found for vendor '%s'.", len(stores), vendor_id)
     return stores
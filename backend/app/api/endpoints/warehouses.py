@@ -2,14 +2,17 @@ from typing import List
 import uuid
 import logging
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.api import deps
+from app.core.auth_cache import Principal
 from app.crud import crud_warehouse
 from app.models.user import User
 from app.schemas.warehouse import Warehouse, WarehouseCreate, WarehouseUpdate
 from app.schemas.inventory import WarehouseInventoryRow  # schema for enriched inventory rows
 from fastapi import Query
 from app.schemas.crate import Crate  # Import the Crate schema
+from app.services.spatial_index import spatial
 
 router = APIRouter()
 logger = logging.getLogger("app.api.endpoints.warehouses")
@@ -21,7 +24,7 @@ def read_warehouses(
     limit: int = 100,
     current_user: User = Depends(deps.get_current_active_user),
 ):
-    logger.info(f"ℹ️ User '{current_user.id}' listing warehouses.")
+    logger.info("ℹ️ User '%s' listing warehouses.", current_user.id)
     # Admins see all warehouses; non-admins see only their own assigned warehouse
     role = str(getattr(current_user, "role", "")).upper()
     if role == "ADMIN":
@@ -37,21 +40,39 @@ def create_warehouse(
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_active_user),
 ):
-    logger.info(f"ℹ️ User '{current_user.id}' attempting to create warehouse: {warehouse_in.name}")
+    logger.info("ℹ️ User '%s' attempting to create warehouse: %s", current_user.id, warehouse_in.name)
     new_warehouse = crud_warehouse.warehouse.create(db, obj_in=warehouse_in)
-    logger.info(f"✅ Warehouse '{new_warehouse.id}' created successfully by user '{current_user.id}'.")
+    logger.info("✅ Warehouse '%s' created successfully by user '%s'.", new_warehouse.id, current_user.id)
     return new_warehouse
 
+@router.get("/nearest", response_model=List[Warehouse])
+def read_nearest_warehouses(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    limit: int = Query(1, ge=1, le=50),
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    """Warehouses closest to (lat, lon), nearest first (non-admins: only their own)."""
+    role = str(getattr(current_user, "role", "")).upper()
+    only = None
+    if role != "ADMIN":
+        only = getattr(current_user, "warehouse_id", None)
+        if not only:
+            return []
+    hits = spatial.nearest(db, "warehouse", lat, lon, k=limit, id=only)
+    return spatial.rows(db, "warehouse", hits)
+
 @router.get("/{warehouse_id}", response_model=Warehouse)
 def read_warehouse(
     warehouse_id: uuid.UUID,
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_active_user),
 ):
-    logger.info(f"ℹ️ User '{current_user.id}' requesting warehouse '{warehouse_id}'.")
+    logger.info("ℹ️ User '%s' requesting warehouse '%s'.", current_user.id, warehouse_id)
     db_warehouse = crud_warehouse.warehouse.get(db, id=warehouse_id)
     if db_warehouse is None:
-        logger.warning(f"❌ Warehouse '{warehouse_id}' not found for request from user '{current_user.id}'.")
+        logger.warning("❌ Warehouse '%s' not found for request from user '%s'.", warehouse_id, current_user.id)
         raise HTTPException(status_code=404, detail="Warehouse not found")
     return db_warehouse
 
@@ -62,13 +83,13 @@ def update_warehouse(
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_active_user),
 ):
-    logger.info(f"ℹ️ User '{current_user.id}' attempting to update warehouse '{warehouse_id}'.")
+    logger.info("ℹ️ User '%s' attempting to update warehouse '%s'.", current_user.id, warehouse_id)
     db_warehouse = crud_warehouse.warehouse.get(db, id=warehouse_id)
     if db_warehouse is None:
-        logger.warning(f"❌ Warehouse '{warehouse_id}' not found for update attempt by user '{current_user.id}'.")
+        logger.warning("❌ Warehouse '%s' not found for update attempt by user '%s'.", warehouse_id, current_user.id)
         raise HTTPException(status_code=404, detail="Warehouse not found")
     updated_warehouse = crud_warehouse.warehouse.update(db, db_obj=db_warehouse, obj_in=warehouse_in)
-    logger.info(f"✅ Warehouse '{updated_warehouse.id}' updated successfully by user '{current_user.id}'.")
+    logger.info("✅ Warehouse '%s' updated successfully by user '%s'.", updated_warehouse.id, current_user.id)
     return updated_warehouse
 
 @router.delete("/{warehouse_id}", response_model=Warehouse)
@@ -77,20 +98,20 @@ def delete_warehouse(
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_active_superuser), # Admin only
 ):
-    logger.info(f"ℹ️ Admin '{current_user.id}' attempting to delete warehouse '{warehouse_id}'.")
+    logger.info("ℹ️ Admin '%s' attempting to delete warehouse '%s'.", current_user.id, warehouse_id)
     db_warehouse = crud_warehouse.warehouse.get(db, id=warehouse_id)
     if db_warehouse is None:
-        logger.warning(f"❌ Warehouse '{warehouse_id}' not found for deletion attempt by admin '{current_user.id}'.")
+        logger.warning("❌ Warehouse '%s' not found for deletion attempt by admin '%s'.", warehouse_id, current_user.id)
         raise HTTPException(status_code=404, detail="Warehouse not found")
     deleted_warehouse = crud_warehouse.warehouse.remove(db, id=warehouse_id)
-    logger.info(f"✅ Warehouse '{deleted_warehouse.id}' deleted successfully by admin '{current_user.id}'.")
+    logger.info("✅ Warehouse '%s' deleted successfully by admin '%s'.", deleted_warehouse.id, current_user.id)
     return deleted_warehouse
 
 @router.get("/{warehouse_id}/products")
-def get_warehouse_products(
+async def get_warehouse_products(
     warehouse_id: uuid.UUID,
-    db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_active_user),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: Principal = Depends(deps.get_current_active_principal_async),
     skip: int = Query(0, ge=0),
     limit: int = Query(25, ge=1, le=500),
     sort_by: str = Query("product_name"),
@@ -100,9 +121,9 @@ def get_warehouse_products(
     """
     Retrieve all products stored in a warehouse.
     """
-    logger.info(f"🔍 User '{current_user.id}' fetching products for warehouse '{warehouse_id}'.")
+    logger.info("🔍 User '%s' fetching products for warehouse '%s'.", current_user.id, warehouse_id)
     # Assuming a method exists to fetch products by warehouse
-    data = crud_warehouse.warehouse.get_products(
+    data = await crud_warehouse.warehouse.get_products_async(
         db,
         warehouse_id=warehouse_id,
         skip=skip,
@@ -124,14 +145,14 @@ def get_warehouse_crates(
     """
     Retrieve all crates stored in a warehouse.
     """
-    logger.info(f"🔍 User '{current_user.id}' fetching crates for warehouse '{warehouse_id}'.")
+    logger.info("🔍 User '%s' fetching crates for warehouse '%s'.", current_user.id, warehouse_id)
     try:
         warehouse = crud_warehouse.warehouse.get_with_crates(db, id=warehouse_id)
         if not warehouse:
-            logger.warning(f"❌ Warehouse '{warehouse_id}' not found for crates request from user '{current_user.id}'.")
+            logger.warning("❌ Warehouse '%s' not found for crates request from user '%s'.", warehouse_id, current_user.id)
             raise HTTPException(status_code=404, detail="Warehouse not found")
-        logger.info(f"✅ Crates for warehouse '{warehouse_id}' fetched successfully by user '{current_user.id}'.")
+        logger.info("✅ Crates for warehouse '%s' fetched successfully by user '%s'.", warehouse_id, current_user.id)
         return warehouse.crates
     except Exception as e:
-        logger.error(f"❌ Error fetching crates for warehouse '{warehouse_id}': {str(e)}", exc_info=True)
+        logger.error("❌ Error fetching crates for warehouse '%s': %s", warehouse_id, str(e), exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
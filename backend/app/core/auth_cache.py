@@ -0,0 +1,106 @@
+"""
+Process-local TTL/LRU cache of authenticated principals.
+
+A principal is the small, immutable slice of a User that authorization needs (id,
+email, name, role, status, warehouse_id). ``deps.get_current_principal`` serves it
+from here, so endpoints that only need role and warehouse scope skip the per-request
+user lookup. Entries expire after ``AUTH_CACHE_TTL_SECONDS`` and are dropped when
+``CRUDUser.update``/``remove`` touch the user.
+
+With ``AUTH_CACHE_INVALIDATION_CHANNEL`` set, invalidations are also published via
+Postgres NOTIFY and applied by every worker's ``pg_listener``, so a role change or
+deactivation takes effect everywhere, not only in the worker that made it.
+"""
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.pg_listener import notify, pg_listener
+
+
+@dataclass(frozen=True)
+class Principal:
+    id: uuid.UUID
+    email: str
+    name: Optional[str]
+    role: str
+    status: str
+    warehouse_id: Optional[uuid.UUID]
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        role = getattr(user, "role", "") or ""
+        return cls(
+            id=user.id,
+            email=user.email,
+            name=getattr(user, "name", None),
+            role=str(getattr(role, "value", role)).upper(),
+            status=str(getattr(user, "status", "") or "").upper(),
+            warehouse_id=getattr(user, "warehouse_id", None),
+        )
+
+    @property
+    def is_active(self) -> bool:
+        return self.status == "ACTIVE"
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role == "ADMIN"
+
+
+class PrincipalCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple[float, Principal]]" = OrderedDict()
+
+    def get(self, user_id) -> Optional[Principal]:
+        if not settings.AUTH_CACHE_ENABLED:
+            return None
+        key = str(user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > settings.AUTH_CACHE_TTL_SECONDS:
+                self._entries.pop(key, None)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, principal: Principal) -> None:
+        if not settings.AUTH_CACHE_ENABLED:
+            return
+        key = str(principal.id)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), principal)
+            self._entries.move_to_end(key)
+            while len(self._entries) > settings.AUTH_CACHE_MAX_ENTRIES:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id) -> None:
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def publish_invalidation(self, db: Session, user_id) -> None:
+        """Drop ``user_id`` here and, if configured, in every other worker once ``db`` commits."""
+        self.invalidate(user_id)
+        if settings.AUTH_CACHE_INVALIDATION_CHANNEL:
+            notify(db, settings.AUTH_CACHE_INVALIDATION_CHANNEL, str(user_id))
+
+
+principals = PrincipalCache()
+
+if settings.AUTH_CACHE_INVALIDATION_CHANNEL:
+    pg_listener.subscribe(settings.AUTH_CACHE_INVALIDATION_CHANNEL, principals.invalidate)
@@ -0,0 +1,106 @@
+"""
+Decode-once authentication context.
+
+``AuthContextMiddleware`` is a pure ASGI middleware that verifies the bearer token
+once per request and stores an ``AuthContext`` on ``request.state.auth``. The auth
+dependencies in ``app.api.deps`` read the decoded payload from there instead of
+decoding the JWT again, and the VIEWER read-only rule is enforced here without a
+database lookup.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+from jose import jwt
+from jose.exceptions import ExpiredSignatureError
+from pydantic import ValidationError
+
+from app.core import security
+from app.core.auth_cache import principals
+from app.core.config import settings
+from app.schemas.token import TokenPayload
+
+_WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+_AUTH_PATH_SUFFIXES = ("/login/access-token", "/login/refresh-token")
+
+
+def decode_access_token(token: str) -> TokenPayload:
+    """Verify ``token`` and return its payload; raises the HTTPException the API returns."""
+    if not token or token.count('.') != 2:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid token format")
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[security.ALGORITHM])
+        return TokenPayload(**payload)
+    except ExpiredSignatureError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token expired",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    except (jwt.JWTError, ValidationError):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Could not validate credentials")
+
+
+@dataclass
+class AuthContext:
+    token: str
+    payload: Optional[TokenPayload] = None
+    error: Optional[HTTPException] = None
+
+    @classmethod
+    def from_token(cls, token: str) -> "AuthContext":
+        try:
+            return cls(token=token, payload=decode_access_token(token))
+        except HTTPException as e:
+            return cls(token=token, error=e)
+
+    @property
+    def role(self) -> str:
+        """Role of the caller: the cached principal's if known (fresher), else the token claim."""
+        if self.payload is None:
+            return ""
+        cached = principals.get(self.payload.sub) if self.payload.sub else None
+        if cached is not None:
+            return cached.role
+        return str(self.payload.role or "").upper()
+
+
+def _bearer_token(scope) -> Optional[str]:
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            auth = value.decode("latin-1")
+            if auth.lower().startswith("bearer "):
+                return auth.split(" ", 1)[1].strip()
+            return None
+    return None
+
+
+class AuthContextMiddleware:
+    """Pure ASGI: no per-request task or body streaming wrapper like BaseHTTPMiddleware."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _bearer_token(scope)
+        ctx = AuthContext.from_token(token) if token else None
+        scope.setdefault("state", {})["auth"] = ctx
+        path = scope.get("path", "")
+        if (
+            ctx is not None
+            and scope.get("method", "").upper() in _WRITE_METHODS
+            and path.startswith(settings.API_V1_STR)
+            and not path.endswith(_AUTH_PATH_SUFFIXES)
+            # Invalid tokens are rejected by the auth dependencies
+            and ctx.role == "VIEWER"
+        ):
+            response = JSONResponse(status_code=403, content={"detail": "VIEWER cannot modify data"})
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
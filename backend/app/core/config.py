@@ -36,6 +36,8 @@ class Settings(BaseSettings):
     # These fields will be populated by the root_validator below
     DATABASE_URL: str = ""
     TEST_DATABASE_URL: str = ""
+    # Same database through asyncpg, for the async read path (app/db/async_session.py)
+    ASYNC_DATABASE_URL: str = ""
 
     # --- SUPERUSER bootstrap (optional) ---
     SUPERUSER_EMAIL: str | None = None
@@ -47,6 +49,101 @@ class Settings(BaseSettings):
     SUPERUSER_ADDRESS: str | None = None
     SUPERUSER_WAREHOUSE_ID: str | None = None
 
+    # --- Database connection pools (sync engine; the async engine uses the same sizes) ---
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # Seconds a request waits for a free connection before failing
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    # Replace connections older than this many seconds (-1 = never)
+    DB_POOL_RECYCLE_SECONDS: int = -1
+    # Ping on every checkout (one extra round trip); with it off, rely on recycle
+    # and on SQLAlchemy invalidating the pool after a disconnect error
+    DB_POOL_PRE_PING: bool = True
+    # Collect checkout latency / wait / in-use metrics (GET /system/db-pool)
+    DB_POOL_METRICS_ENABLED: bool = True
+
+    # --- Free-bin index (in-memory slotting heaps per warehouse) ---
+    FREE_BIN_INDEX_ENABLED: bool = True
+    # Reload a warehouse's index from the database after this many seconds
+    FREE_BIN_INDEX_TTL_SECONDS: int = 300
+
+    # --- Rack occupancy rollup (in-memory per-warehouse rack counts) ---
+    RACK_OCCUPANCY_ROLLUP_ENABLED: bool = False
+    # Recount a warehouse's racks after this many seconds (writes from other processes)
+    RACK_OCCUPANCY_ROLLUP_TTL_SECONDS: int = 60
+
+    # --- Code sequences (crate / rack / receipt numbers) ---
+    # Numbers reserved per database round trip and kept by the process; capped at
+    # 1% of a sequence's range. Use 1 for strictly gap-free, ordered codes.
+    SEQUENCE_LEASE_SIZE: int = 100
+    # Leases commit on their own small pool, never on (or waiting for) a request's connection
+    SEQUENCE_LEASE_POOL_SIZE: int = 2
+    # A lease waiting this long for the counter row fails instead of hanging
+    SEQUENCE_LEASE_LOCK_TIMEOUT_MS: int = 5000
+    # Postgres NOTIFY channel telling every worker to drop its leases when a counter is raised
+    # (unset = only the worker that changed the config drops them)
+    SEQUENCE_INVALIDATION_CHANNEL: str | None = "sequence_invalidation"
+
+    # --- Authenticated principal cache ---
+    AUTH_CACHE_ENABLED: bool = True
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    # Postgres NOTIFY channel used to invalidate the cache across workers (unset = local only)
+    AUTH_CACHE_INVALIDATION_CHANNEL: str | None = "auth_cache_invalidation"
+
+    # --- Milestone notification recipients (active admins + warehouse manager) ---
+    # Cached per scope; dropped on user role/status or warehouse manager changes (0 = no cache)
+    MILESTONE_RECIPIENT_CACHE_TTL_SECONDS: int = 300
+    # Postgres NOTIFY channel dropping cached recipients in every worker (unset = local only)
+    MILESTONE_RECIPIENTS_INVALIDATION_CHANNEL: str | None = "milestone_recipients_invalidation"
+
+    # --- Transactional outbox (milestone checks off the request path) ---
+    # Run a dispatcher thread in this process; several workers can each run one
+    OUTBOX_DISPATCHER_ENABLED: bool = True
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_INTERVAL_MS: int = 500
+    # Events that failed this many times are left in the table for inspection
+    OUTBOX_MAX_ATTEMPTS: int = 10
+
+    # --- Notification stream (GET /notifications/me/stream) ---
+    # Postgres NOTIFY channel carrying new notifications / unread counts to every worker
+    # (unset = the stream only sends the initial count and keepalives)
+    NOTIFICATION_STREAM_CHANNEL: str | None = "notification_events"
+    NOTIFICATION_STREAM_KEEPALIVE_SECONDS: int = 25
+    # Events buffered per open stream; a slow client loses the oldest ones
+    NOTIFICATION_STREAM_QUEUE_SIZE: int = 100
+
+    # --- Spatial index (nearby stores / nearest warehouses / communities) ---
+    # In-memory NumPy grid per kind; off = bounding-box prefilter in SQL on each call
+    SPATIAL_INDEX_ENABLED: bool = True
+    # Reload after this many seconds (writes from other processes)
+    SPATIAL_INDEX_TTL_SECONDS: int = 300
+    SPATIAL_INDEX_CELL_DEGREES: float = 0.25
+
+    # --- Audit log writer ---
+    # Queue audit entries and write them in batches from a background thread
+    AUDIT_ASYNC_ENABLED: bool = True
+    AUDIT_BATCH_SIZE: int = 200
+    AUDIT_FLUSH_INTERVAL_MS: int = 500
+    # When this many entries are pending, new ones are written inline instead
+    AUDIT_QUEUE_MAX_SIZE: int = 20000
+    # Monthly audit_logs partitions kept ahead of time / retained (None = keep all);
+    # applied by app.scripts.manage_audit_partitions
+    AUDIT_PARTITION_MONTHS_AHEAD: int = 2
+    AUDIT_RETENTION_MONTHS: int | None = None
+
+    # --- Logging ---
+    LOG_LEVEL: str = "INFO"
+    # "text" (human-readable lines) or "json" (one object per line)
+    LOG_FORMAT: str = "text"
+    # Emit through a queue drained by a background thread so slow stdout never blocks requests
+    LOG_QUEUE_ENABLED: bool = True
+    # Records beyond this many pending are dropped (and counted) instead of blocking
+    LOG_QUEUE_MAX_SIZE: int = 10000
+    # Fraction of DEBUG/INFO records kept per logger prefix, e.g. {"uvicorn.access": 0.1};
+    # WARNING and above are never sampled
+    LOG_SAMPLE_RATES: Dict[str, float] = {}
+
     @root_validator(pre=False, skip_on_failure=True)
     def assemble_db_urls(cls, v: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -62,6 +159,7 @@ class Settings(BaseSettings):
         # Build main database URL
         db_name = v.get("DB_DATABASE")
         v["DATABASE_URL"] = f"postgresql://{user}:{password}@{host}:{port}/{db_name}"
+        v["ASYNC_DATABASE_URL"] = f"postgresql+asyncpg://{user}:{password}@{host}:{port}/{db_name}"
         
         # Build test database URL
         test_db_name = v.get("DB_TEST_DATABASE")
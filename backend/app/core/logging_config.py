@@ -1,5 +1,14 @@
+import atexit
+import copy
+import json
 import logging
+import queue
+import random
+from datetime import datetime, timezone
 from logging.config import dictConfig
+from logging.handlers import QueueHandler, QueueListener
+
+from app.core.config import settings
 
 LOGGING_CONFIG = {
     "version": 1,
@@ -8,6 +17,9 @@ LOGGING_CONFIG = {
         "default": {
             "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         },
+        "json": {
+            "()": "app.core.logging_config.JsonFormatter",
+        },
     },
     "handlers": {
         "console": {
@@ -39,6 +51,124 @@ LOGGING_CONFIG = {
     },
 }
 
+# LogRecord attributes that are not user-supplied ``extra=`` fields
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; ``extra=`` fields are included as top-level keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        out = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                out[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            out["exc"] = record.exc_text
+        return json.dumps(out, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of DEBUG/INFO records per logger-name prefix (longest prefix wins)."""
+
+    def __init__(self, rates: dict):
+        super().__init__()
+        self.rates = {k: max(0.0, min(1.0, float(v))) for k, v in (rates or {}).items()}
+        self._by_logger: dict = {}
+
+    def _rate(self, name: str) -> float:
+        rate = self._by_logger.get(name)
+        if rate is None:
+            rate = 1.0
+            best = -1
+            for prefix, r in self.rates.items():
+                if (name == prefix or name.startswith(prefix + ".")) and len(prefix) > best:
+                    rate, best = r, len(prefix)
+            self._by_logger[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = self._rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that drops (and counts) records when the queue is full."""
+
+    dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            NonBlockingQueueHandler.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args now (they may be mutated after the call returns) but leave
+        # formatting, including the traceback, to the listener's formatter.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_listener: QueueListener | None = None
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 def setup_logging():
-    """Applies the logging configuration."""
-    dictConfig(LOGGING_CONFIG)
\ No newline at end of file
+    """Applies the logging configuration.
+
+    With ``LOG_QUEUE_ENABLED`` the configured loggers get a single non-blocking
+    queue handler and a ``QueueListener`` thread writes to the real handlers, so
+    stdout I/O happens off the request thread. Sampling is applied before records
+    are queued.
+    """
+    global _listener
+    _stop_listener()
+    config = copy.deepcopy(LOGGING_CONFIG)
+    config["handlers"]["console"]["formatter"] = "json" if settings.LOG_FORMAT.lower() == "json" else "default"
+    config["loggers"]["app"]["level"] = settings.LOG_LEVEL.upper()
+    dictConfig(config)
+
+    sampler = SamplingFilter(settings.LOG_SAMPLE_RATES)
+    loggers = [logging.getLogger(name) for name in config["loggers"]] + [logging.getLogger()]
+    if not settings.LOG_QUEUE_ENABLED:
+        if sampler.rates:
+            for lg in loggers:
+                for h in lg.handlers:
+                    h.addFilter(sampler)
+        return
+
+    targets = []
+    for lg in loggers:
+        for h in lg.handlers:
+            if h not in targets:
+                targets.append(h)
+    queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=max(0, settings.LOG_QUEUE_MAX_SIZE)))
+    queue_handler.addFilter(sampler)
+    for lg in loggers:
+        lg.handlers = [queue_handler]
+    _listener = QueueListener(queue_handler.queue, *targets, respect_handler_level=True)
+    _listener.start()
+
+
+atexit.register(_stop_listener)
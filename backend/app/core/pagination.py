@@ -0,0 +1,31 @@
+"""
+Opaque keyset (cursor) pagination helpers for ``(created_at, id)`` ordered feeds.
+
+A cursor is the position of the last row of a page, encoded as URL-safe base64 so
+clients treat it as an opaque token. Endpoints return it in ``X-Next-Cursor``.
+"""
+from __future__ import annotations
+
+import base64
+import uuid
+from datetime import datetime
+from typing import Tuple
+
+from fastapi import HTTPException
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Decode a cursor from ``encode_cursor``; raises 400 on malformed input."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        ts, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(ts), uuid.UUID(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
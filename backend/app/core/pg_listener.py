@@ -0,0 +1,112 @@
+"""
+Background Postgres LISTEN/NOTIFY listener shared by the process.
+
+Modules register ``subscribe(channel, callback)``; the app starts the listener on
+startup. One dedicated autocommit psycopg2 connection listens on every subscribed
+channel and calls ``callback(payload)`` from the listener thread, so callbacks must
+be quick and thread-safe. The connection is re-established with backoff if it
+drops; notifications sent while disconnected are lost, so subscribers should also
+have a TTL or reload path.
+
+Publishers use ``notify(db, channel, payload)`` inside their own transaction, so the
+notification is delivered only if (and when) that transaction commits.
+
+``bind`` overrides the database the listener connects to (tests point it at their
+engine); by default it is ``DATABASE_URL``.
+"""
+from __future__ import annotations
+
+import logging
+import select
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import psycopg2
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+log = logging.getLogger(__name__)
+
+Callback = Callable[[str], None]
+
+
+class PgListener:
+    def __init__(self, bind=None):
+        self.bind = bind
+        self._subscribers: Dict[str, List[Callback]] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def subscribe(self, channel: str, callback: Callback) -> None:
+        with self._lock:
+            self._subscribers.setdefault(channel, []).append(callback)
+
+    def start(self) -> None:
+        if self._thread is not None or not self._subscribers:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="pg-listener", daemon=True)
+        self._thread.start()
+        log.info("pg_listener: listening on %s", ", ".join(sorted(self._subscribers)))
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _dsn(self) -> str:
+        if self.bind is None:
+            return str(settings.DATABASE_URL)
+        # libpq wants a plain postgresql:// URL, without the SQLAlchemy driver suffix
+        return self.bind.url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+    def _dispatch(self, channel: str, payload: str) -> None:
+        with self._lock:
+            callbacks = list(self._subscribers.get(channel, ()))
+        for cb in callbacks:
+            try:
+                cb(payload)
+            except Exception:
+                log.exception("pg_listener: callback failed for channel=%s", channel)
+
+    def _run(self) -> None:
+        backoff = 1.0
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(self._dsn())
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cur:
+                    for channel in list(self._subscribers):
+                        cur.execute(f'LISTEN "{channel}"')
+                backoff = 1.0
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], 1.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        n = conn.notifies.pop(0)
+                        self._dispatch(n.channel, n.payload)
+            except Exception:
+                log.warning("pg_listener: connection lost; retrying in %.0fs", backoff, exc_info=True)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+
+def notify(db: Session, channel: str, payload: str) -> None:
+    """Queue a NOTIFY in ``db``'s transaction; delivered on commit."""
+    db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": channel, "payload": payload})
+
+
+pg_listener = PgListener()
@@ -1,6 +1,42 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import or_, and_, tuple_
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from app.models.audit_log import AuditLog as AuditLogModel
+from app.models.customer import Customer
+from app.models.inbound_receipt import InboundReceipt
+from app.models.inbound_receipt_line import InboundReceiptLine
+from app.models.user import User
+from app.models.vendor import Vendor
+
+# Entity types every MANAGER may see (plus warehouse_config of their own warehouse)
+MANAGER_ENTITY_TYPES = (
+    "vendor", "vendors",
+    "store", "stores",
+    "product", "products",
+    "store_product",
+    "system_config",
+    # Include contact reveal events
+    "vendor_contact_unmask",
+    "customer_contact_unmask",
+)
+
+# entity_type -> (model, display-name column) used to label audit rows
+ENTITY_NAME_SOURCES = {
+    "vendor_contact_unmask": (Vendor, Vendor.business_name),
+    "customer_contact_unmask": (Customer, Customer.name),
+}
+
+
+def _uuids(values: Iterable) -> List[uuid.UUID]:
+    out = set()
+    for v in values:
+        try:
+            out.add(v if isinstance(v, uuid.UUID) else uuid.UUID(str(v)))
+        except (TypeError, ValueError):
+            continue
+    return list(out)
 
 class CRUDAudit:
     def list_recent(self, db: Session, limit: int = 100) -> List[AuditLogModel]:
@@ -13,8 +49,9 @@ class CRUDAudit:
         limit: int = 100,
         role: str,
         warehouse_id: Optional[str] = None,
+        after: Optional[Tuple[datetime, uuid.UUID]] = None,
     ) -> List[AuditLogModel]:
-        """Return audit logs scoped by role.
+        """Return audit logs scoped by role, newest first, keyset-paginated on ``(created_at, id)``.
 
         - ADMIN: same as list_recent
         - MANAGER: include system level, common entities (vendor/store/product family), and warehouse_config for their warehouse
@@ -22,30 +59,110 @@ class CRUDAudit:
         """
         role_u = (role or "").upper()
         q = db.query(AuditLogModel)
+        if after is not None:
+            q = q.filter(tuple_(AuditLogModel.created_at, AuditLogModel.id) < tuple_(*after))
+        newest_first = (AuditLogModel.created_at.desc(), AuditLogModel.id.desc())
         if role_u == "ADMIN":
-            q = q.order_by(AuditLogModel.created_at.desc()).limit(limit)
+            q = q.order_by(*newest_first).limit(limit)
             return q.all()
 
         if role_u == "MANAGER":
-            common_types = [
-                "vendor", "vendors",
-                "store", "stores",
-                "product", "products",
-                "store_product",
-                "system_config",
-                # Include contact reveal events
-                "vendor_contact_unmask",
-                "customer_contact_unmask",
-            ]
             # Build filter: (entity_type in common_types) OR (warehouse_config for their warehouse)
-            from sqlalchemy import or_, and_
-            cond_common = AuditLogModel.entity_type.in_(common_types)
+            cond_common = AuditLogModel.entity_type.in_(MANAGER_ENTITY_TYPES)
             cond_wh = and_(AuditLogModel.entity_type == "warehouse_config", AuditLogModel.entity_id == str(warehouse_id or ""))
-            q = q.filter(or_(cond_common, cond_wh)).order_by(AuditLogModel.created_at.desc()).limit(limit)
+            q = q.filter(or_(cond_common, cond_wh)).order_by(*newest_first).limit(limit)
             return q.all()
 
         # default: none
         return []
 
+    def list_for_entity(
+        self,
+        db: Session,
+        *,
+        entity_type: str,
+        entity_id: str,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, uuid.UUID]] = None,
+    ) -> List[AuditLogModel]:
+        """History of one entity, newest first; served by ``ix_audit_logs_entity_created``."""
+        q = db.query(AuditLogModel).filter(
+            AuditLogModel.entity_type == entity_type,
+            AuditLogModel.entity_id == str(entity_id),
+        )
+        if after is not None:
+            q = q.filter(tuple_(AuditLogModel.created_at, AuditLogModel.id) < tuple_(*after))
+        return q.order_by(AuditLogModel.created_at.desc(), AuditLogModel.id.desc()).limit(limit).all()
+
+    def manager_can_view(self, db: Session, *, entity_type: str, entity_id: str, warehouse_id: Optional[str]) -> bool:
+        """Whether a MANAGER of ``warehouse_id`` may read the history of this entity."""
+        if entity_type in MANAGER_ENTITY_TYPES:
+            return True
+        if not warehouse_id:
+            return False
+        if entity_type == "warehouse_config":
+            return str(entity_id) == str(warehouse_id)
+        ids = _uuids([entity_id])
+        if not ids:
+            return False
+        if entity_type == "inbound_receipt":
+            owner = db.query(InboundReceipt.warehouse_id).filter(InboundReceipt.id == ids[0]).scalar()
+        elif entity_type == "inbound_line":
+            owner = (
+                db.query(InboundReceipt.warehouse_id)
+                .join(InboundReceiptLine, InboundReceiptLine.receipt_id == InboundReceipt.id)
+                .filter(InboundReceiptLine.id == ids[0])
+                .scalar()
+            )
+        else:
+            return False
+        return owner is not None and str(owner) == str(warehouse_id)
+
+    def resolve_names(self, db: Session, records: List[AuditLogModel]) -> Tuple[Dict[uuid.UUID, Any], Dict[Tuple[str, str], str]]:
+        """Actor ``(id, name, role)`` rows by id and ``(entity_type, entity_id) -> display name`` for ``records``.
+
+        One ``IN (...)`` query for the actors and one per entity kind in
+        ``ENTITY_NAME_SOURCES``, however many records there are.
+        """
+        actor_ids = _uuids(r.actor_user_id for r in records)
+        actors = {}
+        if actor_ids:
+            actors = {u.id: u for u in db.query(User.id, User.name, User.role).filter(User.id.in_(actor_ids)).all()}
+        names: Dict[Tuple[str, str], str] = {}
+        for entity_type, (model, name_col) in ENTITY_NAME_SOURCES.items():
+            ids = _uuids(r.entity_id for r in records if r.entity_type == entity_type and r.entity_id)
+            if not ids:
+                continue
+            for row_id, name in db.query(model.id, name_col).filter(model.id.in_(ids)).all():
+                names[(entity_type, str(row_id))] = name
+        return actors, names
+
+    def with_names(self, db: Session, records: List[AuditLogModel]) -> List[Dict[str, Any]]:
+        """``records`` as AuditLog schema dicts, with actor and entity names resolved in bulk."""
+        actors, entity_names = self.resolve_names(db, records)
+        result = []
+        for rec in records:
+            # Convert UUID fields to str for Pydantic
+            data = {
+                'id': str(rec.id),
+                'actor_user_id': str(rec.actor_user_id),
+                'entity_type': rec.entity_type,
+                'entity_id': rec.entity_id,
+                'action': rec.action,
+                'changes': rec.changes,
+                'created_at': rec.created_at,
+            }
+            # Include actor name/role for UI without extra lookups
+            actor = actors.get(rec.actor_user_id)
+            if actor:
+                data['actor_name'] = getattr(actor, 'name', None)
+                data['actor_role'] = getattr(actor, 'role', None)
+            # Include entity_name for contact reveal events for better UX
+            name = entity_names.get((rec.entity_type, str(rec.entity_id)))
+            if name is not None:
+                data['entity_name'] = name
+            result.append(data)
+        return result
+
 
 audit = CRUDAudit()
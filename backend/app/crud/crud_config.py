@@ -1,10 +1,11 @@
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy import and_
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 from app.models.system_config import SystemConfig
 from app.models.warehouse_config import WarehouseConfig
-from app.models.audit_log import AuditLog
+from app.services.audit_sink import audit_sink
+from app.services.sequences import sequences
 from fastapi import HTTPException
 
 class CRUDConfig:
@@ -32,26 +33,34 @@ class CRUDConfig:
     def upsert_system(self, db: Session, data: dict, actor_user_id: Optional[str] = None) -> dict:
         try:
             row = db.query(SystemConfig).order_by(SystemConfig.created_at.desc()).first()
+            audit = None
             if row:
                 changes = self._diff(row.data, data)
                 row.data = data
                 if actor_user_id and changes:
-                    db.add(AuditLog(actor_user_id=actor_user_id, entity_type='system_config', entity_id=None, action='update', changes=changes))
+                    audit = dict(entity_type='system_config', entity_id=None, action='update', changes=changes)
             else:
                 row = SystemConfig(data=data)
                 db.add(row)
                 if actor_user_id:
-                    db.add(AuditLog(actor_user_id=actor_user_id, entity_type='system_config', entity_id=None, action='create', changes={k: {'before': None, 'after': self._mask(k, v)} for k, v in (data or {}).items()}))
+                    audit = dict(entity_type='system_config', entity_id=None, action='create', changes={k: {'before': None, 'after': self._mask(k, v)} for k, v in (data or {}).items()})
             db.commit()
+            if audit:
+                audit_sink.record(actor_user_id=actor_user_id, **audit)
             db.refresh(row)
             return row.data
         except SQLAlchemyError as e:
             db.rollback()
             raise e
 
-    def get_warehouse(self, db: Session, warehouse_id) -> Optional[dict]:
+    def get_warehouse(self, db: Session, warehouse_id, *, with_sequences: bool = False) -> Optional[dict]:
         row = db.query(WarehouseConfig).filter(WarehouseConfig.warehouse_id == warehouse_id).first()
-        return row.data if row else None
+        if not row:
+            return None
+        if with_sequences:
+            # Live counters from warehouse_sequences override the JSON next*Seq keys
+            return { **row.data, **sequences.current(db, warehouse_id) }
+        return row.data
 
     def upsert_warehouse(self, db: Session, warehouse_id, data: dict, actor_user_id: Optional[str] = None) -> dict:
         try:
@@ -76,7 +85,7 @@ class CRUDConfig:
 
             # Load current row (if any) to enforce increment-only rules
             row = db.query(WarehouseConfig).filter(WarehouseConfig.warehouse_id == warehouse_id).first()
-            current = row.data if row else {}
+            current = { **row.data, **sequences.current(db, warehouse_id) } if row else {}
 
             def clamp_seq(val: Optional[int], max_val: int) -> int:
                 try:
@@ -101,104 +110,56 @@ class CRUDConfig:
             # Apply normalized values back into data
             data = { **data, 'nextCrateSeq': incoming_crate, 'nextRackSeq': incoming_rack }
 
+            audit = None
             if row:
                 changes = self._diff(row.data, data)
                 row.data = data
                 if actor_user_id and changes:
-                    db.add(AuditLog(actor_user_id=actor_user_id, entity_type='warehouse_config', entity_id=str(warehouse_id), action='update', changes=changes))
+                    audit = dict(entity_type='warehouse_config', entity_id=str(warehouse_id), action='update', changes=changes)
             else:
                 row = WarehouseConfig(warehouse_id=warehouse_id, data=data)
                 db.add(row)
                 if actor_user_id:
-                    db.add(AuditLog(actor_user_id=actor_user_id, entity_type='warehouse_config', entity_id=str(warehouse_id), action='create', changes={k: {'before': None, 'after': self._mask(k, v)} for k, v in (data or {}).items()}))
+                    audit = dict(entity_type='warehouse_config', entity_id=str(warehouse_id), action='create', changes={k: {'before': None, 'after': self._mask(k, v)} for k, v in (data or {}).items()})
+            db.flush()
+            sequences.sync_from_config(db, warehouse_id, data)
             db.commit()
+            if audit:
+                audit_sink.record(actor_user_id=actor_user_id, **audit)
             db.refresh(row)
             return row.data
         except SQLAlchemyError as e:
             db.rollback()
             raise e
 
-    # Concurrency-safe consumers
-    def _lock_wh_config(self, db: Session, warehouse_id) -> WarehouseConfig:
-        row = (
-            db.query(WarehouseConfig)
-            .filter(WarehouseConfig.warehouse_id == warehouse_id)
-            .with_for_update()
-            .first()
-        )
-        if not row:
+    # Concurrency-safe consumers: numbers come from app.services.sequences, so the
+    # config row itself is only read, never locked or rewritten per code.
+    def _require_wh_config(self, db: Session, warehouse_id, *, need_short_code: bool) -> dict:
+        data = self.get_warehouse(db, warehouse_id)
+        if data is None:
             raise HTTPException(status_code=400, detail="Warehouse configuration missing. Please set it up in System Configuration.")
-        return row
+        if need_short_code and not (data.get('shortCode') or '').strip():
+            raise HTTPException(status_code=400, detail="Warehouse short code missing. Please complete System Configuration for this warehouse.")
+        return data
+
+    def consume_crate_seq_block(self, db: Session, warehouse_id, count: int) -> Tuple[dict, List[int]]:
+        data = self._require_wh_config(db, warehouse_id, need_short_code=True)
+        return data, sequences.take(db, warehouse_id, 'crate', count)
 
     def consume_next_crate_seq(self, db: Session, warehouse_id) -> Tuple[dict, int]:
-        try:
-            row = self._lock_wh_config(db, warehouse_id)
-            data = row.data or {}
-            short = (data.get('shortCode') or '').strip()
-            if not short:
-                raise HTTPException(status_code=400, detail="Warehouse short code missing. Please complete System Configuration for this warehouse.")
-            # current sequence to use
-            try:
-                seq = int(data.get('nextCrateSeq') or 1)
-            except Exception:
-                seq = 1
-            if seq < 1 or seq > 9999:
-                seq = 1
-            # compute next (wrap at 9999)
-            next_seq = seq + 1
-            if next_seq > 9999:
-                next_seq = 1
-            row.data = { **data, 'nextCrateSeq': next_seq }
-            db.commit()
-            db.refresh(row)
-            return row.data, seq
-        except SQLAlchemyError:
-            db.rollback()
-            raise
+        data, seqs = self.consume_crate_seq_block(db, warehouse_id, 1)
+        return data, seqs[0]
 
     def consume_next_rack_seq(self, db: Session, warehouse_id) -> Tuple[dict, int]:
-        try:
-            row = self._lock_wh_config(db, warehouse_id)
-            data = row.data or {}
-            short = (data.get('shortCode') or '').strip()
-            if not short:
-                raise HTTPException(status_code=400, detail="Warehouse short code missing. Please complete System Configuration for this warehouse.")
-            try:
-                seq = int(data.get('nextRackSeq') or 1)
-            except Exception:
-                seq = 1
-            if seq < 1 or seq > 999:
-                seq = 1
-            next_seq = seq + 1
-            if next_seq > 999:
-                next_seq = 1
-            row.data = { **data, 'nextRackSeq': next_seq }
-            db.commit()
-            db.refresh(row)
-            return row.data, seq
-        except SQLAlchemyError:
-            db.rollback()
-            raise
+        data = self._require_wh_config(db, warehouse_id, need_short_code=True)
+        return data, sequences.take(db, warehouse_id, 'rack', 1)[0]
+
+    def consume_receipt_seq_block(self, db: Session, warehouse_id, count: int) -> Tuple[dict, List[int]]:
+        data = self._require_wh_config(db, warehouse_id, need_short_code=False)
+        return data, sequences.take(db, warehouse_id, 'receipt', count)
 
     def consume_next_receipt_seq(self, db: Session, warehouse_id) -> Tuple[dict, int]:
-        try:
-            row = self._lock_wh_config(db, warehouse_id)
-            data = row.data or {}
-            try:
-                seq = int(data.get('nextReceiptSeq') or 1)
-            except Exception:
-                seq = 1
-            if seq < 1 or seq > 999999:
-                seq = 1
-            next_seq = seq + 1
-            if next_seq > 999999:
-                next_seq = 1
-            row.data = { **data, 'nextReceiptSeq': next_seq }
-            db.commit()
-            db.refresh(row)
-            return row.data, seq
-        except SQLAlchemyError:
-            db.rollback()
-            raise
+        data, seqs = self.consume_receipt_seq_block(db, warehouse_id, 1)
+        return data, seqs[0]
 
 config = CRUDConfig()
@@ -1,3 +1,5 @@
+from typing import Iterable, List, Set
+from sqlalchemy import insert, or_, select
 from sqlalchemy.orm import Session
 from app.crud.base import CRUDBase
 from app.models.crate import Crate
@@ -23,5 +25,23 @@ class CRUDCrate(CRUDBase[Crate, CrateCreate, CrateUpdate]):
         db.refresh(db_obj)
         return db_obj
 
+    def existing_codes(self, db: Session, codes: Iterable[str]) -> Set[str]:
+        """The subset of ``codes`` already used as a crate name or QR code."""
+        codes = list(codes)
+        if not codes:
+            return set()
+        rows = db.execute(
+            select(Crate.name, Crate.qr_code).where(or_(Crate.name.in_(codes), Crate.qr_code.in_(codes)))
+        ).all()
+        wanted = set(codes)
+        return {code for row in rows for code in row if code in wanted}
+
+    def insert_many(self, db: Session, rows: List[dict]) -> None:
+        """Insert prepared crate rows with one multi-row INSERT and commit."""
+        if not rows:
+            return
+        db.execute(insert(Crate).values(rows))
+        db.commit()
+
 
 crate = CRUDCrate(Crate)
@@ -4,7 +4,8 @@ from sqlalchemy.exc import SQLAlchemyError
 from app.models.customer import Customer
 from app.schemas.customer import CustomerCreate, CustomerUpdate
 from .base import CRUDBase
-from app.services.milestone_service import check_and_create_milestone, MilestoneEventType, MilestoneEntityType
+from app.services import entity_counters
+from app.services.outbox import outbox
 
 class CRUDCustomer(CRUDBase[Customer, CustomerCreate, CustomerUpdate]):
 
@@ -12,20 +13,12 @@ class CRUDCustomer(CRUDBase[Customer, CustomerCreate, CustomerUpdate]):
         try:
             db_obj = self.model(**obj_in.dict())
             db.add(db_obj)
+            db.flush()
+            total_customers = entity_counters.increment(db, "customer")
+            outbox.publish(db, "customer.created", {"customer_id": db_obj.id, "total_customers": total_customers})
             db.commit()
             db.refresh(db_obj)
 
-            # Check for customer count milestones
-            total_customers = self.get_multi(db)
-            check_and_create_milestone(
-                db,
-                event_type=MilestoneEventType.CUSTOMER_COUNT,
-                entity_type=MilestoneEntityType.SYSTEM,
-                entity_id=None,
-                current_count=len(total_customers),
-                description=f"🎉 The {len(total_customers)}th customer has joined the platform!",
-            )
-
             return db_obj
         except SQLAlchemyError as e:
             db.rollback()
@@ -1,23 +1,29 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 from uuid import UUID
 from datetime import datetime, date
-from sqlalchemy import func, or_, and_
+from sqlalchemy import func, or_, and_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.crud.base import CRUDBase
 from app.models.inbound_receipt import InboundReceipt
 from app.models.inbound_receipt_line import InboundReceiptLine
 from app.schemas.inbound import ReceiptCreate, ReceiptUpdate, Receipt, ReceiptLineUpdate
 from app.crud.crud_config import config as cfg
+from app.services import inbound_kpi_counters as kpi_counters
+
+def format_receipt_code(wh_cfg: dict, seq: int) -> str:
+    prefix = (wh_cfg.get('receiptPrefix') or 'RCPT').strip() or 'RCPT'
+    short = (wh_cfg.get('shortCode') or '').strip().upper()
+    # Include short warehouse code if available: PREFIX-SHORT-000001
+    return f"{prefix}-{short}-{seq:06d}" if short else f"{prefix}-{seq:06d}"
 
 class CRUDInboundReceipt(CRUDBase[InboundReceipt, ReceiptCreate, ReceiptUpdate]):
     def create(self, db: Session, *, obj_in: ReceiptCreate) -> InboundReceipt:
         # Generate receipt code using per-warehouse prefix and sequence
         data, seq = cfg.consume_next_receipt_seq(db, str(obj_in.warehouse_id))
-        prefix = (data.get('receiptPrefix') or 'RCPT').strip() or 'RCPT'
-        short = (data.get('shortCode') or '').strip().upper()
-        # Include short warehouse code if available: PREFIX-SHORT-000001
-        code = f"{prefix}-{short}-{seq:06d}" if short else f"{prefix}-{seq:06d}"
+        code = format_receipt_code(data, seq)
 
         rec = InboundReceipt(
             code=code,
@@ -40,37 +46,96 @@ class CRUDInboundReceipt(CRUDBase[InboundReceipt, ReceiptCreate, ReceiptUpdate])
             )
             rec.lines.append(line)
         db.add(rec)
+        kpi_counters.record_created(db, rec)
         db.commit()
         db.refresh(rec)
         return rec
-    def list(self, db: Session, *, warehouse_id: Optional[UUID] = None, vendor_type: Optional[str] = None, status: Optional[str] = None, search: Optional[str] = None, date_from: Optional[datetime] = None, date_to: Optional[datetime] = None) -> List[InboundReceipt]:
-        q = db.query(InboundReceipt)
+    def _list_stmt(
+        self,
+        *,
+        warehouse_id: Optional[UUID] = None,
+        vendor_type: Optional[str] = None,
+        status: Optional[str] = None,
+        search: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        with_lines: bool = True,
+    ):
+        stmt = select(InboundReceipt)
+        if with_lines:
+            stmt = stmt.options(selectinload(InboundReceipt.lines))
         if warehouse_id:
-            q = q.filter(InboundReceipt.warehouse_id == warehouse_id)
+            stmt = stmt.where(InboundReceipt.warehouse_id == warehouse_id)
         if vendor_type:
-            q = q.filter(InboundReceipt.vendor_type == vendor_type)
+            stmt = stmt.where(InboundReceipt.vendor_type == vendor_type)
         if status:
-            q = q.filter(InboundReceipt.status == status)
+            stmt = stmt.where(InboundReceipt.status == status)
         if search:
             s = f"%{search.lower()}%"
-            q = q.filter(or_(func.lower(InboundReceipt.code).like(s), func.lower(InboundReceipt.reference).like(s)))
+            stmt = stmt.where(or_(func.lower(InboundReceipt.code).like(s), func.lower(InboundReceipt.reference).like(s)))
         if date_from:
-            q = q.filter(InboundReceipt.created_at >= date_from)
+            stmt = stmt.where(InboundReceipt.created_at >= date_from)
         if date_to:
-            q = q.filter(InboundReceipt.created_at <= date_to)
-        return q.order_by(InboundReceipt.created_at.desc()).all()
+            stmt = stmt.where(InboundReceipt.created_at <= date_to)
+        if after is not None:
+            stmt = stmt.where(tuple_(InboundReceipt.created_at, InboundReceipt.id) < tuple_(*after))
+        stmt = stmt.order_by(InboundReceipt.created_at.desc(), InboundReceipt.id.desc())
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return stmt
+
+    def list(self, db: Session, **filters) -> List[InboundReceipt]:
+        """Receipts newest first, keyset-paginated on ``(created_at, id)``.
+
+        Filters: ``warehouse_id``, ``vendor_type``, ``status``, ``search``,
+        ``date_from``, ``date_to``. ``after`` is the ``(created_at, id)`` of the last
+        row of the previous page. With ``with_lines`` the lines (and their bins) are
+        loaded in one extra query instead of one per receipt.
+        """
+        return db.scalars(self._list_stmt(**filters)).all()
+
+    async def list_async(self, db: AsyncSession, **filters) -> List[InboundReceipt]:
+        """``list`` on an AsyncSession."""
+        return (await db.scalars(self._list_stmt(**filters))).all()
+
+    def _line_summary_stmt(self, receipt_ids: List[UUID]):
+        L = InboundReceiptLine
+        return (
+            select(
+                L.receipt_id,
+                func.count().label("line_count"),
+                func.count().filter(L.bin_id.is_(None)).label("unassigned_lines"),
+                func.count().filter(or_(L.damaged > 0, L.missing > 0)).label("exception_lines"),
+                func.count().filter(or_(func.coalesce(L.received_qty, L.quantity) != L.quantity, L.damaged > 0)).label("qc_diff_lines"),
+            )
+            .where(L.receipt_id.in_(receipt_ids))
+            .group_by(L.receipt_id)
+        )
+
+    async def line_summaries_async(self, db: AsyncSession, receipt_ids: List[UUID]) -> Dict[UUID, Dict[str, int]]:
+        """Line counts per receipt (total, without bin, damaged/missing, QC differences) in one query."""
+        if not receipt_ids:
+            return {}
+        rows = (await db.execute(self._line_summary_stmt(receipt_ids))).mappings().all()
+        return {r["receipt_id"]: {k: v for k, v in r.items() if k != "receipt_id"} for r in rows}
 
     def update_status(self, db: Session, *, id: UUID, status: str) -> Optional[InboundReceipt]:
         obj = db.query(InboundReceipt).get(id)
         if not obj:
             return None
-        obj.status = status
-        obj.updated_at = datetime.utcnow()
-        db.add(obj)
+        kpi_counters.change_status(db, obj, status)
         db.commit()
         db.refresh(obj)
         return obj
 
+    def update(self, db: Session, *, db_obj: InboundReceipt, obj_in: Union[ReceiptUpdate, Dict[str, Any]]) -> InboundReceipt:
+        update_data = obj_in if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
+        if update_data.get('status') is not None:
+            kpi_counters.change_status(db, db_obj, update_data['status'])
+        return super().update(db, db_obj=db_obj, obj_in=obj_in)
+
 inbound_receipts = CRUDInboundReceipt(InboundReceipt)
 
 class CRUDInboundLine(CRUDBase[InboundReceiptLine, ReceiptLineUpdate, ReceiptLineUpdate]):
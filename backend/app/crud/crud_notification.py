@@ -1,13 +1,91 @@
 # filepath: backend/app/crud/crud_notification.py
-from typing import List
+from typing import Dict, Iterable, List
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.crud.base import CRUDBase
 from app.models.notification import Notification
+from app.models.notification_unread_count import NotificationUnreadCount
 from app.schemas.notification import NotificationCreate, NotificationUpdate
+from app.services.notification_broker import broker
+
+# NOTIFY payloads are limited to 8000 bytes; streams get a preview of the message
+_STREAM_MESSAGE_CHARS = 500
+
 
 class CRUDNotification(CRUDBase[Notification, NotificationCreate, NotificationUpdate]):
+    @staticmethod
+    def _bump_unread(db: Session, deltas: Dict) -> Dict:
+        """Apply per-user unread deltas in ``db``'s transaction; returns the new counts."""
+        rows = [{"user_id": user_id, "value": delta} for user_id, delta in deltas.items() if delta]
+        if not rows:
+            return {}
+        stmt = pg_insert(NotificationUnreadCount).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[NotificationUnreadCount.user_id],
+            set_={"value": NotificationUnreadCount.value + stmt.excluded.value},
+        ).returning(NotificationUnreadCount.user_id, NotificationUnreadCount.value)
+        return {user_id: int(value) for user_id, value in db.execute(stmt).all()}
+
+    def create_for_users(
+        self, db: Session, *, user_ids: Iterable, title: str, message: str | None = None, milestone_id=None
+    ) -> int:
+        """Insert one notification per user with a single INSERT (the caller commits).
+
+        Unread counters are bumped and the open streams notified in the same transaction.
+        """
+        rows = [
+            {"user_id": user_id, "title": title, "message": message, "milestone_id": milestone_id}
+            for user_id in dict.fromkeys(user_ids)
+        ]
+        if not rows:
+            return 0
+        created = db.execute(
+            insert(Notification).returning(Notification.id, Notification.user_id, Notification.created_at),
+            rows,
+        ).all()
+        unread = self._bump_unread(db, {row.user_id: 1 for row in created})
+        preview = (message or "")[:_STREAM_MESSAGE_CHARS] or None
+        for row in created:
+            broker.emit(db, {
+                "event": "notification",
+                "user_id": str(row.user_id),
+                "unread": unread.get(row.user_id),
+                "notification": {
+                    "id": str(row.id),
+                    "title": title,
+                    "message": preview,
+                    "milestone_id": str(milestone_id) if milestone_id else None,
+                    "is_read": False,
+                    "created_at": row.created_at.isoformat() if row.created_at else None,
+                },
+            })
+        return len(created)
+
+    def mark_read(self, db: Session, *, db_obj: Notification) -> Notification:
+        """Mark ``db_obj`` read; only the request that flips the flag decrements the counter."""
+        user_id = db.execute(
+            update(Notification)
+            .where(Notification.id == db_obj.id, ~Notification.is_read)
+            .values(is_read=True)
+            .returning(Notification.user_id)
+            .execution_options(synchronize_session=False)
+        ).scalar()
+        if user_id is not None:
+            unread = self._bump_unread(db, {user_id: -1})
+            broker.emit(db, {"event": "unread", "user_id": str(user_id), "unread": unread.get(user_id)})
+        db.commit()
+        db.refresh(db_obj)
+        return db_obj
+
     def get_unread_count(self, db: Session, *, user_id) -> int:
-        return db.query(Notification).filter(Notification.user_id == user_id, Notification.is_read == False).count()
+        value = db.scalar(select(NotificationUnreadCount.value).where(NotificationUnreadCount.user_id == user_id))
+        return int(value or 0)
+
+    async def get_unread_count_async(self, db: AsyncSession, *, user_id) -> int:
+        value = await db.scalar(select(NotificationUnreadCount.value).where(NotificationUnreadCount.user_id == user_id))
+        return int(value or 0)
 
     def get_for_user(self, db: Session, *, user_id, skip: int = 0, limit: int = 50) -> List[Notification]:
         return (
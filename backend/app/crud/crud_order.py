@@ -4,9 +4,9 @@ from sqlalchemy.exc import SQLAlchemyError
 from app.crud.base import CRUDBase
 from app.models.order import Order
 from app.models.order_product import OrderProduct  # <-- Corrected model import
-from app.models.warehouse import Warehouse
 from app.schemas.order import OrderCreate, OrderUpdate
-from app.services.milestone_service import check_and_create_milestone, MilestoneEventType, MilestoneEntityType
+from app.services import entity_counters
+from app.services.outbox import outbox
 
 class CRUDOrder(CRUDBase[Order, OrderCreate, OrderUpdate]):
     def create_with_items(self, db: Session, *, obj_in: OrderCreate) -> Order:
@@ -17,51 +17,8 @@ class CRUDOrder(CRUDBase[Order, OrderCreate, OrderUpdate]):
         order_data["total_amount"] = total_amount
         db_obj = self.model(**order_data)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-
-        # System-wide order count milestone (fix: use count/int)
-        total_orders = db.query(Order).count()
-        check_and_create_milestone(
-            db,
-            event_type=MilestoneEventType.ORDER_COUNT,
-            entity_type=MilestoneEntityType.ORDER,
-            entity_id=str(db_obj.id),
-            current_count=total_orders,
-            description="🎉 A new order milestone has been reached!",
-            title="Order milestone",
-            milestone_type="order_count"
-        )
+        db.flush()
 
-        # Warehouse-specific order count milestone (notifies warehouse manager)
-        if db_obj.warehouse_id:
-            wh_orders_count = db.query(Order).filter(Order.warehouse_id == db_obj.warehouse_id).count()
-            wh = db.query(Warehouse).get(db_obj.warehouse_id)
-            wh_name = wh.name if wh else "Warehouse"
-            check_and_create_milestone(
-                db,
-                event_type=MilestoneEventType.ORDER_COUNT,
-                entity_type=MilestoneEntityType.WAREHOUSE,
-                entity_id=str(db_obj.warehouse_id),
-                current_count=wh_orders_count,
-                description=f"🎉 {wh_name} reached {wh_orders_count} orders!",
-                title=f"{wh_name} Order Milestone",
-                milestone_type="warehouse_order_count",
-                warehouse_id=str(db_obj.warehouse_id),
-            )
-
-        # Check for customer order count milestones
-        customer_orders = order.get_multi_by_owner(db, user_id=db_obj.customer_id)
-        check_and_create_milestone(
-            db,
-            event_type=MilestoneEventType.CUSTOMER_ORDER_COUNT,
-            entity_type=MilestoneEntityType.CUSTOMER,
-            entity_id=db_obj.customer_id,
-            current_count=len(customer_orders),
-            user_id=db_obj.customer_id,
-            description=f"🎉 Customer {db_obj.customer_id} placed their {len(customer_orders)}th order!",
-        )
-    
         # Associate items with the order
         for item in obj_in.items:
             order_product_obj = OrderProduct(
@@ -71,6 +28,19 @@ class CRUDOrder(CRUDBase[Order, OrderCreate, OrderUpdate]):
                 price=item.price
             )
             db.add(order_product_obj)
+
+        # Counters and the milestone event commit with the order
+        total_orders = entity_counters.increment(db, "order")
+        wh_orders_count = entity_counters.increment(db, "order", entity_counters.WAREHOUSE, db_obj.warehouse_id)
+        customer_orders_count = entity_counters.increment(db, "order", entity_counters.CUSTOMER, db_obj.customer_id)
+        outbox.publish(db, "order.created", {
+            "order_id": db_obj.id,
+            "warehouse_id": db_obj.warehouse_id,
+            "customer_id": db_obj.customer_id,
+            "total_orders": total_orders,
+            "warehouse_orders": wh_orders_count,
+            "customer_orders": customer_orders_count,
+        })
         db.commit()
         db.refresh(db_obj)
         return db_obj
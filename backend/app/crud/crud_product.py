@@ -4,8 +4,8 @@ from .base import CRUDBase
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 from app.models.store_products import StoreProduct
-from app.services.milestone_service import check_and_create_milestone, MilestoneEventType, MilestoneEntityType
-from app.models.vendor import Vendor
+from app.services import entity_counters
+from app.services.outbox import outbox
 import uuid
 
 class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
@@ -13,38 +13,17 @@ class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
         try:
             db_obj = self.model(**obj_in.dict())
             db.add(db_obj)
+            db.flush()
+            total_products = entity_counters.increment(db, "product")
+            vendor_products = entity_counters.increment(db, "product", entity_counters.VENDOR, db_obj.vendor_id) if db_obj.vendor_id else 0
+            outbox.publish(db, "product.created", {
+                "product_id": db_obj.id,
+                "vendor_id": db_obj.vendor_id,
+                "total_products": total_products,
+                "vendor_products": vendor_products,
+            })
             db.commit()
             db.refresh(db_obj)
-
-            # System-level product count milestone (reuse VENDOR_COUNT event type to avoid enum change)
-            total_products = db.query(Product).count()
-            check_and_create_milestone(
-                db,
-                event_type=MilestoneEventType.VENDOR_COUNT,
-                entity_type=MilestoneEntityType.SYSTEM,
-                entity_id=str(db_obj.id),
-                current_count=total_products,
-                description=f"📦 Platform now has {total_products} products!",
-                title="Product Milestone",
-                milestone_type="product_count",
-            )
-
-            # Vendor-level product count milestone
-            if db_obj.vendor_id:
-                vendor_products = db.query(Product).filter(Product.vendor_id == db_obj.vendor_id).count()
-                vendor = db.query(Vendor).get(db_obj.vendor_id)
-                vendor_name = vendor.business_name if vendor else "Vendor"
-                check_and_create_milestone(
-                    db,
-                    event_type=MilestoneEventType.VENDOR_COUNT,
-                    entity_type=MilestoneEntityType.VENDOR,
-                    entity_id=str(db_obj.vendor_id),
-                    current_count=vendor_products,
-                    description=f"📦 {vendor_name} now lists {vendor_products} products!",
-                    title=f"{vendor_name} Product Milestone",
-                    milestone_type="vendor_product_count",
-                )
-
             return db_obj
         except SQLAlchemyError as e:
             db.rollback()
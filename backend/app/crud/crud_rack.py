@@ -1,16 +1,13 @@
 # filepath: backend/app/crud/crud_rack.py
 from typing import List
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
 from fastapi import HTTPException
 from app.crud.base import CRUDBase
 from app.models.rack import Rack as RackModel
-from app.models.bin import Bin as BinModel
 from app.schemas.rack import RackCreateRequest, RackUpdate
 from app.crud.crud_config import config as cfg
-from app.schemas.bin import BinCreate
-from app.crud import crud_bin
-from app.services.bin_code import build_bin_code
+from app.services.rack_grid import materialize_rack_grid
+from app.services.rack_occupancy import occupancy, rack_bin_counts
 
 class CRUDRack(CRUDBase[RackModel, RackCreateRequest, RackUpdate]):
     def get_by_warehouse(self, db: Session, warehouse_id) -> List[RackModel]:
@@ -33,38 +30,14 @@ class CRUDRack(CRUDBase[RackModel, RackCreateRequest, RackUpdate]):
             status=obj_in.status or default_rack_status
         )
         db.add(db_obj)
+        db.flush()
+        # Auto-materialize full bin grid for this rack in the same transaction
+        materialize_rack_grid(db, db_obj, commit=False)
         db.commit()
         db.refresh(db_obj)
-        # Auto-materialize full bin grid for this rack
-        stacks = int(db_obj.stacks or 0)
-        bps = int(db_obj.bins_per_stack or 0)
-        if stacks > 0 and bps > 0:
-            for s in range(stacks):
-                for b in range(bps):
-                    code = build_bin_code(db, db_obj.id, s, b)
-                    payload = BinCreate(
-                        rack_id=db_obj.id,
-                        stack_index=s,
-                        bin_index=b,
-                        code=code,
-                        status="empty",
-                        crate_id=None,
-                        product_id=None,
-                        store_product_id=None,
-                        quantity=0,
-                    )
-                    crud_bin.bin.create(db, obj_in=payload)
         return db_obj
 
-    def with_stats(self, db: Session, rack: RackModel) -> dict:
-        total_bins = int((rack.stacks or 0) * (rack.bins_per_stack or 0))
-        occupied = db.query(func.count(BinModel.id)).filter(
-            BinModel.rack_id == rack.id,
-            or_(
-                BinModel.status.in_(['occupied', 'reserved', 'blocked', 'maintenance']),
-                BinModel.crate_id.isnot(None)
-            )
-        ).scalar() or 0
+    def _stats_row(self, rack: RackModel, counts: dict) -> dict:
         return {
             'id': str(rack.id),
             'name': rack.name,
@@ -73,12 +46,22 @@ class CRUDRack(CRUDBase[RackModel, RackCreateRequest, RackUpdate]):
             'bins_per_stack': rack.bins_per_stack,
             'description': rack.description,
             'status': rack.status,
-            'total_bins': total_bins,
-            'occupied_bins': int(occupied),
+            'total_bins': int((rack.stacks or 0) * (rack.bins_per_stack or 0)),
+            'occupied_bins': counts['occupied'],
+            'reserved_bins': counts['reserved'],
+            'blocked_bins': counts['blocked'],
+            'maintenance_bins': counts['maintenance'],
+            'empty_bins': counts['empty'],
         }
 
+    def with_stats(self, db: Session, rack: RackModel) -> dict:
+        counts = rack_bin_counts(db, [rack.id])[rack.id]
+        return self._stats_row(rack, counts)
+
     def list_with_stats_by_warehouse(self, db: Session, warehouse_id) -> List[dict]:
+        # One query for racks plus one grouped count (or none when served from the rollup)
         racks = self.get_by_warehouse(db, warehouse_id)
-        return [self.with_stats(db, r) for r in racks]
+        counts = occupancy.counts_for(db, warehouse_id, [r.id for r in racks])
+        return [self._stats_row(r, counts[r.id]) for r in racks]
 
 rack = CRUDRack(RackModel)
@@ -4,8 +4,8 @@ from app.crud.base import CRUDBase
 from app.models.store import Store
 from app.models.store_products import StoreProduct
 from app.schemas.store import Store as StoreSchema, StoreCreate, StoreUpdate
-from app.services.milestone_service import check_and_create_milestone, MilestoneEventType, MilestoneEntityType
-from app.models.vendor import Vendor
+from app.services import entity_counters
+from app.services.outbox import outbox
 import uuid
 
 class CRUDStore(CRUDBase[Store, StoreCreate, StoreUpdate]):
@@ -18,6 +18,15 @@ class CRUDStore(CRUDBase[Store, StoreCreate, StoreUpdate]):
     def create(self, db: Session, *, obj_in: StoreCreate) -> Store:
         db_obj = Store(**obj_in.dict(exclude={"products"}))
         db.add(db_obj)
+        db.flush()
+        total_stores = entity_counters.increment(db, "store")
+        vendor_store_count = entity_counters.increment(db, "store", entity_counters.VENDOR, db_obj.vendor_id) if db_obj.vendor_id else 0
+        outbox.publish(db, "store.created", {
+            "store_id": db_obj.id,
+            "vendor_id": db_obj.vendor_id,
+            "total_stores": total_stores,
+            "vendor_stores": vendor_store_count,
+        })
         db.commit()
         db.refresh(db_obj)
 
@@ -34,35 +43,6 @@ class CRUDStore(CRUDBase[Store, StoreCreate, StoreUpdate]):
                 db.add(store_product)
             db.commit()
 
-        # Milestone creation logic (system-level store count) - reuse VENDOR_COUNT event type
-        total_stores = db.query(Store).count()
-        check_and_create_milestone(
-            db,
-            event_type=MilestoneEventType.VENDOR_COUNT,
-            entity_type=MilestoneEntityType.SYSTEM,
-            entity_id=str(db_obj.id),
-            current_count=total_stores,
-            description=f"🎉 Hurray! {total_stores} stores strong and still growing!",
-            title="Store Milestone",
-            milestone_type="store_count"
-        )
-
-        # Vendor-scoped store count milestone
-        if db_obj.vendor_id:
-            vendor_store_count = db.query(Store).filter(Store.vendor_id == db_obj.vendor_id).count()
-            vendor = db.query(Vendor).get(db_obj.vendor_id)
-            vendor_name = vendor.business_name if vendor else "Vendor"
-            check_and_create_milestone(
-                db,
-                event_type=MilestoneEventType.VENDOR_COUNT,
-                entity_type=MilestoneEntityType.VENDOR,
-                entity_id=str(db_obj.vendor_id),
-                current_count=vendor_store_count,
-                description=f"🏪 {vendor_name} now has {vendor_store_count} stores!",
-                title=f"{vendor_name} Store Milestone",
-                milestone_type="vendor_store_count",
-            )
-
         return db_obj
 
     def update(
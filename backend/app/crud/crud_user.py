@@ -5,12 +5,15 @@ from sqlalchemy.exc import SQLAlchemyError
 import uuid
 import logging
 
+from app.core.auth_cache import principals
 from app.core.security import get_password_hash, verify_password
 from app.crud.base import CRUDBase
 from app.models.user import User
 from app.models.warehouse import Warehouse  # Import Warehouse model
 from app.schemas.user import UserCreate, UserUpdate
-from app.services.milestone_service import check_and_create_milestone, MilestoneEventType, MilestoneEntityType
+from app.services import entity_counters
+from app.services.milestone_recipients import recipients as milestone_recipients
+from app.services.outbox import outbox
 
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
     def get_by_email(self, db: Session, *, email: str) -> Optional[User]:
@@ -51,40 +54,27 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             # Create the user
             db_obj = User(**kwargs)
             db.add(db_obj)
-
-            # Check for system-level user count milestones
-            total_users = len(self.get_multi(db))
-            check_and_create_milestone(
-                db,
-                event_type=MilestoneEventType.CUSTOMER_COUNT,
-                entity_type=MilestoneEntityType.CUSTOMER,
-                entity_id=str(db_obj.id),
-                current_count=total_users,
-                description="🎉 A new system-wide user milestone has been reached!",
-                title="System User Registration Milestone",
-                milestone_type="customer_count"
+            db.flush()
+            total_users = entity_counters.increment(db, "user")
+            warehouse_user_count = (
+                entity_counters.increment(db, "user", entity_counters.WAREHOUSE, db_obj.warehouse_id)
+                if db_obj.warehouse_id else 0
             )
-
-            # Check for warehouse-level user count milestones (if warehouse_id is provided)
-            if db_obj.warehouse_id:
-                warehouse_user_count = db.query(User).filter(User.warehouse_id == db_obj.warehouse_id).count()
-                wh = db.query(Warehouse).get(db_obj.warehouse_id)
-                wh_name = wh.name if wh else "Warehouse"
-                check_and_create_milestone(
-                    db,
-                    event_type=MilestoneEventType.CUSTOMER_COUNT,
-                    entity_type=MilestoneEntityType.CUSTOMER,
-                    entity_id=str(db_obj.warehouse_id),
-                    current_count=warehouse_user_count,
-                    description=f"🎉 {wh_name} reached {warehouse_user_count} users!",
-                    title=f"{wh_name} User Milestone",
-                    milestone_type="warehouse_user_count",
-                    warehouse_id=str(db_obj.warehouse_id)
-                )
-
-            # Commit the transaction only after all operations are successful
+            outbox.publish(db, "user.created", {
+                "user_id": db_obj.id,
+                "warehouse_id": db_obj.warehouse_id,
+                "total_users": total_users,
+                "warehouse_users": warehouse_user_count,
+            })
+            # A new active admin/manager changes who milestones notify, here and in other workers
+            recipient = db_obj.status == "ACTIVE" and db_obj.role in ("ADMIN", "MANAGER")
+            if recipient:
+                milestone_recipients.publish_invalidation(db)
             db.commit()
+            if recipient:
+                milestone_recipients.clear()
             db.refresh(db_obj)
+
             # Return the ORM instance; Pydantic model has from_attributes=True
             # so it will serialize UUIDs and nullable fields correctly.
             return db_obj
@@ -124,9 +114,26 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         if "warehouse_id" in update_data:
             db_obj.warehouse_id = update_data["warehouse_id"]
 
+        # Queue the cross-worker invalidation in this transaction, then drop our own
+        # entry again after commit so a concurrent request cannot re-cache stale data
+        principals.publish_invalidation(db, db_obj.id)
+        recipients_changed = "role" in update_data or "status" in update_data
+        if recipients_changed:
+            milestone_recipients.publish_invalidation(db)
         updated_obj = super().update(db, db_obj=db_obj, obj_in=update_data)
+        principals.invalidate(updated_obj.id)
+        if recipients_changed:
+            milestone_recipients.clear()
         return updated_obj
 
+    def remove(self, db: Session, *, id: uuid.UUID) -> Optional[User]:
+        principals.publish_invalidation(db, id)
+        milestone_recipients.publish_invalidation(db)
+        obj = super().remove(db, id=id)
+        principals.invalidate(id)
+        milestone_recipients.clear()
+        return obj
+
     def authenticate_and_validate(self, db: Session, *, email: str, password: str) -> User:
         """Authenticate the user and validate their status."""
         user = self.get_by_email(db, email=email)
@@ -2,9 +2,12 @@
 from .base import CRUDBase
 from app.models.vendor import Vendor
 from app.schemas.vendor import VendorCreate, VendorUpdate
-from app.services.milestone_service import check_and_create_milestone, MilestoneEventType, MilestoneEntityType
+from app.services import entity_counters
+from app.services.outbox import outbox
 from app.models.store import Store  # Import the Store model
+from app.models.store_products import StoreProduct
 
+from sqlalchemy import distinct, func, select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from fastapi import HTTPException
@@ -28,35 +31,12 @@ class CRUDVendor(CRUDBase[Vendor, VendorCreate, VendorUpdate]):
                 updated_at=datetime.utcnow(),
             )
             db.add(db_obj)
+            db.flush()
+            total_vendors = entity_counters.increment(db, "vendor")
+            outbox.publish(db, "vendor.created", {"vendor_id": db_obj.id, "total_vendors": total_vendors})
             db.commit()
             db.refresh(db_obj)
 
-            # Check for vendor count milestones
-            total_vendors = len(self.get_multi(db))
-            check_and_create_milestone(
-                db,
-                event_type=MilestoneEventType.VENDOR_COUNT,
-                entity_type=MilestoneEntityType.VENDOR,
-                entity_id=str(db_obj.id),
-                current_count=total_vendors,
-                description=f"🎉 We have just welcomed our {total_vendors}th vendor to the platform!",
-                title="Vendor Milestone",
-                milestone_type="vendor_count",
-            )
-
-            # Per-vendor stores count milestone (reuse VENDOR_COUNT event type with a specific milestone_type)
-            vendor_store_count = db.query(Store).filter(Store.vendor_id == db_obj.id).count()
-            check_and_create_milestone(
-                db,
-                event_type=MilestoneEventType.VENDOR_COUNT,
-                entity_type=MilestoneEntityType.VENDOR,
-                entity_id=str(db_obj.id),
-                current_count=vendor_store_count,
-                description=f"🏪 Vendor {db_obj.business_name} now has {vendor_store_count} stores!",
-                title=f"{db_obj.business_name} Store Milestone",
-                milestone_type="vendor_store_count",
-            )
-
             return db_obj
         except IntegrityError as e:
             db.rollback()
@@ -126,6 +106,47 @@ class CRUDVendor(CRUDBase[Vendor, VendorCreate, VendorUpdate]):
             db.rollback()
             raise e
 
+    def get_summaries(self, db: Session, *, skip: int = 0, limit: int = 100):
+        """One page of vendors with their store count and distinct product count.
+
+        The page of vendors is chosen first; store and product counts are then
+        grouped only over those vendors' stores, so the cost follows the page size.
+        """
+        page = (
+            select(Vendor.id)
+            .order_by(Vendor.business_name, Vendor.id)
+            .offset(skip)
+            .limit(limit)
+            .cte("vendor_page")
+        )
+        store_counts = (
+            select(
+                Store.vendor_id.label("vendor_id"),
+                func.count(distinct(Store.id)).label("store_count"),
+                func.count(distinct(StoreProduct.product_id)).label("product_count"),
+            )
+            .outerjoin(StoreProduct, StoreProduct.store_id == Store.id)
+            .where(Store.vendor_id.in_(select(page.c.id)))
+            .group_by(Store.vendor_id)
+            .subquery()
+        )
+        stmt = (
+            select(
+                Vendor.id,
+                Vendor.business_name,
+                Vendor.email,
+                Vendor.phone_number,
+                Vendor.vendor_type,
+                Vendor.vendor_status,
+                func.coalesce(store_counts.c.store_count, 0).label("store_count"),
+                func.coalesce(store_counts.c.product_count, 0).label("product_count"),
+            )
+            .join(page, page.c.id == Vendor.id)
+            .outerjoin(store_counts, store_counts.c.vendor_id == Vendor.id)
+            .order_by(Vendor.business_name, Vendor.id)
+        )
+        return db.execute(stmt).all()
+
     def get_stores(self, db: Session, *, vendor_id: uuid.UUID) -> list[Store]:
         return db.query(Store).filter(Store.vendor_id == vendor_id).all()
 
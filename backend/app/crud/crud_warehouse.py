@@ -2,8 +2,11 @@ from app.models.warehouse import Warehouse
 from app.models.store_products import StoreProduct
 from app.models.product import Product
 from app.models.store import Store, store_warehouse_association
-from sqlalchemy import func, asc, desc
+from sqlalchemy import func, asc, desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.warehouse import WarehouseCreate, WarehouseUpdate
+from app.services.milestone_recipients import recipients as milestone_recipients
+from app.services.outbox import outbox
 from app.services.milestone_service import check_and_create_milestone, MilestoneEventType, MilestoneEntityType
 from .base import CRUDBase
 from sqlalchemy.orm import Session
@@ -19,17 +22,9 @@ class CRUDWarehouse(CRUDBase[Warehouse, WarehouseCreate, WarehouseUpdate]):
             db_obj = self.model(**obj_in.dict())
             db.add(db_obj)
 
-            # Create a milestone for every warehouse addition
-            check_and_create_milestone(
-                db,
-                event_type=MilestoneEventType.WAREHOUSE_CREATED,
-                entity_type=MilestoneEntityType.SYSTEM,
-                entity_id=str(db_obj.id),
-                current_count=1,  # Default value for current_count
-                description="🏗️ A new warehouse has been added to the eco-system! 🏢",
-                title="Warehouse creation milestone",  # Added title
-                milestone_type="warehouse_creation"  # Ensure milestone_type is passed
-            )
+            db.flush()
+            # Milestone for every warehouse addition, handled off the request path
+            outbox.publish(db, "warehouse.created", {"warehouse_id": db_obj.id})
 
             db.commit()  # Commit only after all operations are successful
             db.refresh(db_obj)
@@ -72,16 +67,19 @@ class CRUDWarehouse(CRUDBase[Warehouse, WarehouseCreate, WarehouseUpdate]):
         update_data = obj_in.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_obj, field, value)
+        if "manager_id" in update_data:
+            milestone_recipients.publish_invalidation(db, db_obj.id)
         db.commit()
+        if "manager_id" in update_data:
+            milestone_recipients.invalidate(db_obj.id)
         db.refresh(db_obj)
         return db_obj
 
     def get_with_crates(self, db: Session, *, id: uuid.UUID) -> Warehouse:
         return db.query(Warehouse).filter(Warehouse.id == id).options(joinedload(Warehouse.crates)).first()
 
-    def get_products(
+    def _products_stmts(
         self,
-        db: Session,
         *,
         warehouse_id: uuid.UUID,
         skip: int = 0,
@@ -90,32 +88,24 @@ class CRUDWarehouse(CRUDBase[Warehouse, WarehouseCreate, WarehouseUpdate]):
         sort_dir: str = "asc",
         q: str | None = None,
     ):
-        """Return paginated inventory rows for a warehouse with optional search and sorting."""
-        base_query = (
-            db.query(
-                StoreProduct.id.label("id"),
-                StoreProduct.store_id.label("store_id"),
-                StoreProduct.product_id.label("product_id"),
-                StoreProduct.available_qty.label("available_qty"),
-                StoreProduct.price.label("price"),
-                StoreProduct.bin_code.label("bin_code"),
-                Product.name.label("product_name"),
-                Store.store_name.label("store_name"),
-            )
-            .join(Store, StoreProduct.store_id == Store.id)
-            .join(store_warehouse_association, Store.id == store_warehouse_association.c.store_id)
-            .join(Product, StoreProduct.product_id == Product.id)
-            .filter(store_warehouse_association.c.warehouse_id == warehouse_id)
-        )
-
+        """(page statement, total count statement) for a warehouse's inventory rows."""
+        filters = [store_warehouse_association.c.warehouse_id == warehouse_id]
         if q:
             like = f"%{q.lower()}%"
-            base_query = base_query.filter(
+            filters.append(
                 func.lower(Product.name).like(like)
                 | func.lower(Store.store_name).like(like)
                 | func.lower(func.coalesce(StoreProduct.bin_code, "")).like(like)
             )
 
+        def _joined(stmt):
+            return (
+                stmt.join(Store, StoreProduct.store_id == Store.id)
+                .join(store_warehouse_association, Store.id == store_warehouse_association.c.store_id)
+                .join(Product, StoreProduct.product_id == Product.id)
+                .where(*filters)
+            )
+
         sort_map = {
             "product_name": Product.name,
             "store_name": Store.store_name,
@@ -125,26 +115,28 @@ class CRUDWarehouse(CRUDBase[Warehouse, WarehouseCreate, WarehouseUpdate]):
         }
         col = sort_map.get(sort_by, Product.name)
         orderer = asc if sort_dir.lower() == "asc" else desc
-        base_query = base_query.order_by(orderer(col))
-
-        # Total before pagination
-        count_q = (
-            db.query(func.count(StoreProduct.id))
-            .join(Store, StoreProduct.store_id == Store.id)
-            .join(store_warehouse_association, Store.id == store_warehouse_association.c.store_id)
-            .join(Product, StoreProduct.product_id == Product.id)
-            .filter(store_warehouse_association.c.warehouse_id == warehouse_id)
-        )
-        if q:
-            like = f"%{q.lower()}%"
-            count_q = count_q.filter(
-                func.lower(Product.name).like(like)
-                | func.lower(Store.store_name).like(like)
-                | func.lower(func.coalesce(StoreProduct.bin_code, "")).like(like)
+        rows_stmt = (
+            _joined(
+                select(
+                    StoreProduct.id.label("id"),
+                    StoreProduct.store_id.label("store_id"),
+                    StoreProduct.product_id.label("product_id"),
+                    StoreProduct.available_qty.label("available_qty"),
+                    StoreProduct.price.label("price"),
+                    StoreProduct.bin_code.label("bin_code"),
+                    Product.name.label("product_name"),
+                    Store.store_name.label("store_name"),
+                ).select_from(StoreProduct)
             )
-        total = count_q.scalar() or 0
+            .order_by(orderer(col))
+            .offset(skip)
+            .limit(limit)
+        )
+        count_stmt = _joined(select(func.count(StoreProduct.id)).select_from(StoreProduct))
+        return rows_stmt, count_stmt
 
-        rows = base_query.offset(skip).limit(limit).all()
+    @staticmethod
+    def _products_page(rows, total) -> dict:
         items = [
             {
                 "id": r.id,
@@ -158,6 +150,21 @@ class CRUDWarehouse(CRUDBase[Warehouse, WarehouseCreate, WarehouseUpdate]):
             }
             for r in rows
         ]
-        return {"items": items, "total": int(total)}
+        return {"items": items, "total": int(total or 0)}
+
+    def get_products(self, db: Session, *, warehouse_id: uuid.UUID, **params):
+        """Return paginated inventory rows for a warehouse with optional search and sorting.
+
+        ``params``: ``skip``, ``limit``, ``sort_by``, ``sort_dir``, ``q``.
+        """
+        rows_stmt, count_stmt = self._products_stmts(warehouse_id=warehouse_id, **params)
+        return self._products_page(db.execute(rows_stmt).all(), db.scalar(count_stmt))
+
+    async def get_products_async(self, db: AsyncSession, *, warehouse_id: uuid.UUID, **params):
+        """``get_products`` on an AsyncSession."""
+        rows_stmt, count_stmt = self._products_stmts(warehouse_id=warehouse_id, **params)
+        total = await db.scalar(count_stmt)
+        rows = (await db.execute(rows_stmt)).all()
+        return self._products_page(rows, total)
 
 warehouse = CRUDWarehouse(Warehouse)
\ No newline at end of file
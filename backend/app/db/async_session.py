@@ -0,0 +1,24 @@
+# filepath: backend/app/db/async_session.py
+"""
+Async (asyncpg) engine and session factory for read-heavy endpoints.
+
+Lives next to the sync engine in ``app.db.session``; both point at the same
+database. Async endpoints take ``deps.get_async_db`` and must eager-load every
+relationship they touch (lazy loads are not available on ``AsyncSession``).
+"""
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+
+# Registers all models with the metadata, as in app.db.session
+from app.db import base  # noqa
+
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
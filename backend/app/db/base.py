@@ -19,6 +19,8 @@ from app.models.milestone import Milestone
 from app.models.crate import Crate
 from app.models.system_config import SystemConfig
 from app.models.warehouse_config import WarehouseConfig
+from app.models.warehouse_snapshot import WarehouseSnapshot
+from app.models.warehouse_sequence import WarehouseSequence
 # Added missing model imports so Alembic sees full metadata
 from app.models.rack import Rack
 from app.models.bin import Bin
@@ -27,6 +29,10 @@ from app.models.store_products import StoreProduct
 from app.models.audit_log import AuditLog
 from app.models.inbound_receipt import InboundReceipt
 from app.models.inbound_receipt_line import InboundReceiptLine
+from app.models.inbound_kpi_counter import InboundKpiCounter
+from app.models.entity_counter import EntityCounter
+from app.models.outbox_event import OutboxEvent
+from app.models.notification_unread_count import NotificationUnreadCount
 from app.models.vehicle import Vehicle
 from app.models.driver import Driver
 from app.models.route import Route, RouteBin, DispatchLoadingLog
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""
+Connection pool metrics for the sync engine.
+
+``InstrumentedQueuePool`` times every checkout (including time spent waiting for a
+free connection) and counts waits and timeouts; the ``checkout``/``checkin``/
+``connect`` pool events track connections in use and how long they are held.
+``pool_metrics.snapshot(engine.pool)`` is served by ``GET /system/db-pool`` and
+``POST /system/db-pool/reset`` starts a new measurement window.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+_SAMPLE_SIZE = 2048
+
+
+def _percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100.0 * (len(values) - 1))))]
+
+
+class PoolMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_use = 0
+        self.reset()
+
+    def reset(self) -> None:
+        """Zero the counters and latency samples; ``in_use`` is a live gauge and is kept."""
+        with self._lock:
+            self.checkouts = 0
+            self.waits = 0
+            self.timeouts = 0
+            self.connects = 0
+            self.invalidations = 0
+            self.max_in_use = self.in_use
+            self.max_checkout_ms = 0.0
+            self._checkout_ms: Deque[float] = deque(maxlen=_SAMPLE_SIZE)
+            self._hold_ms: Deque[float] = deque(maxlen=_SAMPLE_SIZE)
+
+    def record_checkout_wait(self, elapsed_ms: float, waited: bool, timed_out: bool = False) -> None:
+        with self._lock:
+            if waited:
+                self.waits += 1
+            if timed_out:
+                self.timeouts += 1
+                return
+            self._checkout_ms.append(elapsed_ms)
+            self.max_checkout_ms = max(self.max_checkout_ms, elapsed_ms)
+
+    def on_connect(self, dbapi_conn, record) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def on_checkout(self, dbapi_conn, record, proxy) -> None:
+        record.info["checked_out_at"] = time.perf_counter()
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+
+    def on_checkin(self, dbapi_conn, record) -> None:
+        started = record.info.pop("checked_out_at", None)
+        if started is None:
+            return
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+            self._hold_ms.append((time.perf_counter() - started) * 1000.0)
+
+    def on_invalidate(self, dbapi_conn, record, exception) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def attach(self, engine: Engine) -> None:
+        event.listen(engine, "connect", self.on_connect)
+        event.listen(engine, "checkout", self.on_checkout)
+        event.listen(engine, "checkin", self.on_checkin)
+        event.listen(engine, "invalidate", self.on_invalidate)
+
+    def snapshot(self, pool=None) -> Dict[str, Any]:
+        with self._lock:
+            checkout_ms = list(self._checkout_ms)
+            hold_ms = list(self._hold_ms)
+            out: Dict[str, Any] = {
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "in_use": self.in_use,
+                "max_in_use": self.max_in_use,
+                "checkout_ms": {
+                    "p50": round(_percentile(checkout_ms, 50), 3),
+                    "p95": round(_percentile(checkout_ms, 95), 3),
+                    "p99": round(_percentile(checkout_ms, 99), 3),
+                    "max": round(self.max_checkout_ms, 3),
+                },
+                "hold_ms": {
+                    "p50": round(_percentile(hold_ms, 50), 3),
+                    "p95": round(_percentile(hold_ms, 95), 3),
+                    "max": round(max(hold_ms, default=0.0), 3),
+                },
+            }
+        if isinstance(pool, QueuePool):
+            out["pool"] = {
+                "size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "timeout_seconds": pool.timeout(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            }
+        return out
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that reports checkout latency, waits and timeouts to ``pool_metrics``."""
+
+    def _do_get(self):
+        # All connections (incl. overflow) exist and none is idle: this checkout will block
+        waited = self._max_overflow > -1 and self._overflow >= self._max_overflow and self._pool.empty()
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.record_checkout_wait((time.perf_counter() - started) * 1000.0, waited, timed_out=True)
+            raise
+        pool_metrics.record_checkout_wait((time.perf_counter() - started) * 1000.0, waited)
+        return conn
@@ -1,12 +1,24 @@
 # filepath: backend/app/db/session.py
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from app.core.config import settings
+from app.db.pool_metrics import InstrumentedQueuePool, pool_metrics
 
 # This import is crucial. It ensures that all models that inherit from Base
 # are registered with SQLAlchemy's metadata before the session is used.
 from app.db import base  # noqa
 
-engine = create_engine(str(settings.DATABASE_URL), pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
\ No newline at end of file
+engine = create_engine(
+    str(settings.DATABASE_URL),
+    poolclass=InstrumentedQueuePool if settings.DB_POOL_METRICS_ENABLED else QueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+)
+if settings.DB_POOL_METRICS_ENABLED:
+    pool_metrics.attach(engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -1,17 +1,26 @@
-from sqlalchemy import Column, DateTime, ForeignKey, String, JSON
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, DateTime, ForeignKey, Index, String
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from datetime import datetime
 import uuid
 
 from app.db.base_class import Base
 
 class AuditLog(Base):
+    """Range-partitioned by month on ``created_at`` (``audit_logs_yYYYYmMM``);
+    partitions are created and retired by ``app.scripts.manage_audit_partitions``."""
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        Index("ix_audit_logs_entity_created", "entity_type", "entity_id", "created_at"),
+        Index("ix_audit_logs_actor_created", "actor_user_id", "created_at"),
+        Index("ix_audit_logs_created_at", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
+    # The partition key has to be part of the primary key
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow, nullable=False)
     actor_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     entity_type = Column(String, nullable=False)  # e.g., 'system_config' | 'warehouse_config'
     entity_id = Column(String, nullable=True)     # warehouse_id for warehouse_config
     action = Column(String, nullable=False)       # 'update'
-    changes = Column(JSON, nullable=False, default=dict)  # { field: { before, after } }
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    changes = Column(JSONB, nullable=False, default=dict)  # { field: { before, after } }
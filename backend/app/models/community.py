@@ -1,6 +1,6 @@
 # filepath: backend/app/models/community.py
 import uuid
-from sqlalchemy import Column, String, Text, Numeric, Enum, ForeignKey, Boolean, DateTime
+from sqlalchemy import Column, String, Text, Numeric, Enum, ForeignKey, Boolean, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -8,6 +8,9 @@ from app.db.base_class import Base
 
 class Community(Base):
     __tablename__ = "communities"
+    __table_args__ = (
+        Index('ix_communities_lat_lon', 'latitude', 'longitude'),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
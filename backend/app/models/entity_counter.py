@@ -0,0 +1,16 @@
+from sqlalchemy import BigInteger, Column, String
+from app.db.base_class import Base
+
+class EntityCounter(Base):
+    """Running count of created entities per scope, used for milestone detection.
+
+    ``scope`` is ``system``, ``warehouse``, ``vendor`` or ``customer``; ``scope_id`` is
+    the owning row's id (empty for ``system``) and ``kind`` the counted entity
+    (``order``, ``product``, ``store``, ``vendor``, ``user``, ``customer``).
+    """
+    __tablename__ = "entity_counters"
+
+    scope = Column(String(16), primary_key=True)
+    scope_id = Column(String(64), primary_key=True, default="")
+    kind = Column(String(32), primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
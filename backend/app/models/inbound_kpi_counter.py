@@ -0,0 +1,16 @@
+from sqlalchemy import BigInteger, Column, Date, ForeignKey, String
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.base_class import Base
+
+class InboundKpiCounter(Base):
+    """Incrementally maintained goods-in KPI counters per warehouse and day.
+
+    Running totals (open receipts, receipts by vendor type, ...) are stored on the
+    sentinel day ``app.services.inbound_kpi_counters.TOTALS_DAY``.
+    """
+    __tablename__ = "inbound_kpi_counters"
+
+    warehouse_id = Column(UUID(as_uuid=True), ForeignKey("warehouses.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    metric = Column(String(32), primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
@@ -1,6 +1,6 @@
 # filepath: backend/app/models/notification.py
 import uuid
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -18,3 +18,7 @@ class Notification(Base):
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
 
     user = relationship('User', lazy='joined')
+
+    __table_args__ = (
+        Index("ix_notifications_user_unread", "user_id", postgresql_where=text("NOT is_read")),
+    )
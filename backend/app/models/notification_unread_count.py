@@ -0,0 +1,10 @@
+from sqlalchemy import BigInteger, Column, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.base_class import Base
+
+class NotificationUnreadCount(Base):
+    """Unread notifications per user, kept current by ``CRUDNotification`` writers."""
+    __tablename__ = "notification_unread_counts"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
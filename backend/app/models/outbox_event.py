@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, Identity, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from app.db.base_class import Base
+
+class OutboxEvent(Base):
+    """Domain event written in the producer's transaction and handled by ``app.services.outbox``.
+
+    Rows are deleted once handled; failed events stay with ``attempts``/``last_error``
+    and become claimable again at ``available_at``.
+    """
+    __tablename__ = "outbox_events"
+
+    id = Column(BigInteger, Identity(), primary_key=True)
+    event_type = Column(String(64), nullable=False)
+    payload = Column(JSONB, nullable=False, default=dict)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+
+    __table_args__ = (
+        Index("ix_outbox_events_available_at_id", "available_at", "id"),
+    )
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, ForeignKey, DateTime, Table, Numeric, Integer, UniqueConstraint
+from sqlalchemy import Column, String, ForeignKey, DateTime, Table, Numeric, Integer, UniqueConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
@@ -17,6 +17,7 @@ class Store(Base):
     __tablename__ = 'stores'
     __table_args__ = (
         UniqueConstraint('store_name', name='uq_store_name'),
+        Index('ix_stores_lat_lon', 'latitude', 'longitude'),
         {'extend_existing': True},
     )
 
@@ -35,7 +36,7 @@ class Store(Base):
     product_ids = Column(ARRAY(UUID(as_uuid=True)), nullable=True)
 
     # Relationships
-    vendor_id = Column(UUID(as_uuid=True), ForeignKey('vendors.id'), nullable=False)
+    vendor_id = Column(UUID(as_uuid=True), ForeignKey('vendors.id'), nullable=False, index=True)
     vendor = relationship('Vendor', back_populates='stores')
 
     warehouses = relationship(
@@ -10,7 +10,7 @@ class StoreProduct(Base):
     __tablename__ = 'store_products'
 
     id = Column(UUID(as_uuid=True), primary_key=True, index=True, default=uuid.uuid4)
-    store_id = Column(UUID(as_uuid=True), ForeignKey('stores.id'), nullable=False)
+    store_id = Column(UUID(as_uuid=True), ForeignKey('stores.id'), nullable=False, index=True)
     product_id = Column(UUID(as_uuid=True), ForeignKey('products.id'), nullable=False)
     available_qty = Column(Integer, nullable=False)
     price = Column(Numeric(10, 2), nullable=False)
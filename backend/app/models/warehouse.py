@@ -1,6 +1,6 @@
 # filepath: backend/app/models/warehouse.py
 import uuid
-from sqlalchemy import Column, String, Text, ForeignKey, Numeric, Date, Integer, Enum, UniqueConstraint, DateTime
+from sqlalchemy import Column, String, Text, ForeignKey, Numeric, Date, Integer, Enum, UniqueConstraint, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
@@ -10,6 +10,7 @@ class Warehouse(Base):
     __tablename__ = "warehouses"
     __table_args__ = (
         UniqueConstraint('name', 'address', name='uq_warehouse_name_address'),
+        Index('ix_warehouses_lat_lon', 'latitude', 'longitude'),
     )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(255), nullable=False, index=True)
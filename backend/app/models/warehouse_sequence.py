@@ -0,0 +1,14 @@
+from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.base_class import Base
+
+class WarehouseSequence(Base):
+    """Per-warehouse code counters (crate / rack / receipt), handed out in leases
+    by ``app.services.sequences``. Replaces the next*Seq keys of WarehouseConfig.data
+    as the source of truth."""
+    __tablename__ = "warehouse_sequences"
+
+    warehouse_id = Column(UUID(as_uuid=True), ForeignKey("warehouses.id", ondelete="CASCADE"), primary_key=True)
+    kind = Column(String(16), primary_key=True)     # 'crate' | 'rack' | 'receipt'
+    next_value = Column(Integer, nullable=False)    # first value not yet leased
+    max_value = Column(Integer, nullable=False)     # values wrap back to 1 after this
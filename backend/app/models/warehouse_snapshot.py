@@ -0,0 +1,14 @@
+from sqlalchemy import Column, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from datetime import datetime
+from app.db.base_class import Base
+
+class WarehouseSnapshot(Base):
+    """Pre-aggregated dashboard numbers per warehouse, refreshed by
+    ``app.scripts.refresh_warehouse_snapshots``."""
+    __tablename__ = "warehouse_snapshots"
+
+    warehouse_id = Column(UUID(as_uuid=True), ForeignKey("warehouses.id", ondelete="CASCADE"), primary_key=True)
+    bin_stats = Column(JSONB, nullable=False, default=dict)     # shape of /inbound/debug/bin-stats
+    inbound_kpis = Column(JSONB, nullable=False, default=dict)  # shape of /inbound/kpis, this warehouse only
+    refreshed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
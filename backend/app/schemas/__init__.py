@@ -8,7 +8,7 @@ from .vendor import Vendor, VendorCreate, VendorUpdate, VendorSummary
 from .product import Product, ProductCreate, ProductUpdate
 from .warehouse import Warehouse, WarehouseCreate, WarehouseUpdate
 from .order import Order, OrderCreate, OrderUpdate
-from .crate import Crate, CrateCreate, CrateUpdate, CrateCreateRequest
+from .crate import Crate, CrateCreate, CrateUpdate, CrateCreateRequest, CrateBulkCreateRequest
 from .order_products import OrderProduct, OrderProductCreate, OrderProductUpdate
 from .milestone import Milestone, MilestoneCreate, MilestoneUpdate
 from .store import Store, StoreCreate, StoreUpdate
@@ -1,6 +1,6 @@
 from typing import Optional
 from uuid import UUID
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from app.models.crate import CrateStatus, CrateType
 
 
@@ -19,6 +19,15 @@ class CrateCreateRequest(BaseModel):
     status: Optional[str] = None
 
 
+# Bulk creation request: ``count`` crates with the same type/status
+class CrateBulkCreateRequest(BaseModel):
+    warehouse_id: UUID
+    # Crate numbers run 1..9999 per warehouse, so one batch can never need more
+    count: int = Field(..., ge=1, le=9999)
+    type: Optional[CrateType] = CrateType.STANDARD
+    status: Optional[str] = None
+
+
 # Internal properties to create DB record (server-generated name)
 class CrateCreate(CrateBase):
     name: str
@@ -62,7 +62,8 @@ class ReceiptUpdate(BaseModel):
     actual_arrival: Optional[datetime] = None
     overs_policy: Optional[dict] = None
 
-class Receipt(ReceiptBase):
+# Header-only projection for list views (no lines)
+class ReceiptHeader(ReceiptBase):
     id: uuid.UUID
     code: str
     status: ReceiptStatus
@@ -70,10 +71,19 @@ class Receipt(ReceiptBase):
     overs_policy: Optional[dict] = None
     created_at: datetime
     updated_at: datetime
-    lines: List[ReceiptLine] = []
     class Config:
         from_attributes = True
 
+class Receipt(ReceiptHeader):
+    lines: List[ReceiptLine] = []
+
+# Header plus per-receipt line counts, so list views never need the lines themselves
+class ReceiptSummary(ReceiptHeader):
+    line_count: int = 0
+    unassigned_lines: int = 0
+    exception_lines: int = 0
+    qc_diff_lines: int = 0
+
 # Query filters & KPI
 class ReceiptFilter(BaseModel):
     warehouse_id: Optional[uuid.UUID] = None
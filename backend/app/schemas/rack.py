@@ -42,3 +42,7 @@ class Rack(RackBase):
 class RackOut(Rack):
     total_bins: int
     occupied_bins: int
+    reserved_bins: int = 0
+    blocked_bins: int = 0
+    maintenance_bins: int = 0
+    empty_bins: int = 0
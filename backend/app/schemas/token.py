@@ -6,4 +6,6 @@ class Token(BaseModel):
     token_type: str
 
 class TokenPayload(BaseModel):
-    sub: str | None = None
\ No newline at end of file
+    sub: str | None = None
+    # Role at issue time; the auth middleware uses it for the VIEWER check
+    role: str | None = None
\ No newline at end of file
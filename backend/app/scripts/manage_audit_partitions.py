@@ -0,0 +1,40 @@
+# backend/app/scripts/manage_audit_partitions.py
+"""
+Maintain the monthly partitions of ``audit_logs``.
+
+Run daily (cron / k8s CronJob):
+  python -m app.scripts.manage_audit_partitions [--months-ahead 2] [--retention-months 24] [--drop]
+
+Creates the partitions for the coming months and, with a retention, detaches
+months older than it. Detached tables (``audit_logs_yYYYYmMM``) stay in the
+database for archiving until dropped; ``--drop`` removes them right away.
+"""
+import argparse
+from typing import Optional
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.audit_partitions import detach_older_than, ensure_partitions
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    p = argparse.ArgumentParser(description="Create upcoming and retire old audit_logs partitions")
+    p.add_argument("--months-ahead", type=int, default=settings.AUDIT_PARTITION_MONTHS_AHEAD)
+    p.add_argument("--retention-months", type=int, default=settings.AUDIT_RETENTION_MONTHS,
+                   help="Detach months older than this (default: keep everything)")
+    p.add_argument("--drop", action="store_true", help="Drop retired partitions instead of only detaching them")
+    args = p.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        created = ensure_partitions(db, months_ahead=args.months_ahead)
+        print(f"Created {len(created)} partition(s).")
+        if args.retention_months:
+            retired = detach_older_than(db, args.retention_months, drop=args.drop)
+            print(f"{'Dropped' if args.drop else 'Detached'} {len(retired)} partition(s).")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
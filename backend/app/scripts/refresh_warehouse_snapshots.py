@@ -0,0 +1,32 @@
+# backend/app/scripts/refresh_warehouse_snapshots.py
+"""
+Refresh pre-aggregated dashboard numbers in ``warehouse_snapshots``.
+
+Run on a schedule (cron / k8s CronJob), e.g. every 5 minutes:
+  python -m app.scripts.refresh_warehouse_snapshots [--warehouse-id <UUID>]
+
+Dashboards then read them with ``?source=snapshot`` on /inbound/kpis and
+/inbound/debug/bin-stats.
+"""
+import argparse
+from typing import Optional
+
+from app.db.session import SessionLocal
+from app.services.warehouse_stats import refresh_snapshots
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    p = argparse.ArgumentParser(description="Refresh warehouse dashboard snapshots")
+    p.add_argument("--warehouse-id", default=None, help="Only refresh this warehouse")
+    args = p.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        count = refresh_snapshots(db, warehouse_id=args.warehouse_id)
+        print(f"Refreshed {count} warehouse snapshot(s).")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -14,10 +14,8 @@ from typing import Optional
 from sqlalchemy.orm import Session
 
 from app.db.session import SessionLocal
-from app.crud import crud_rack, crud_bin
+from app.crud import crud_rack
 from app.schemas.rack import RackCreateRequest
-from app.schemas.bin import BinCreate
-from app.services.bin_code import build_bin_code
 from app import models
 
 
@@ -47,23 +45,7 @@ def seed_bins(
             ),
         )
         created_racks.append(r)
-
-        # Create physical bin records grid
-        for s in range(int(stacks)):
-            for b in range(int(bins_per_stack)):
-                code = build_bin_code(db, r.id, s, b)
-                payload = BinCreate(
-                    rack_id=r.id,
-                    stack_index=s,
-                    bin_index=b,
-                    code=code,
-                    status="empty",
-                    crate_id=None,
-                    product_id=None,
-                    store_product_id=None,
-                    quantity=0,
-                )
-                crud_bin.bin.create(db, obj_in=payload)
+        # crud_rack.create materializes the full empty bin grid for the rack
 
     print(
         f"Seeded {len(created_racks)} rack(s) with {stacks}x{bins_per_stack} empty bins each "
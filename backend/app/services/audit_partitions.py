@@ -0,0 +1,123 @@
+"""
+Monthly partitions of ``audit_logs``.
+
+``audit_logs`` is range-partitioned on ``created_at``, one partition per calendar
+month named ``audit_logs_yYYYYmMM``, plus ``audit_logs_default`` for rows outside
+every range. ``ensure_partitions`` creates upcoming months ahead of time;
+``detach_older_than`` detaches (and optionally drops) whole months past the
+retention window, which is a catalog change rather than a bulk DELETE.
+
+If the job fell behind and rows for a missing month already landed in the default
+partition, Postgres refuses to create that month. ``ensure_partitions`` then
+detaches the default, creates the month, moves its rows over and re-attaches the
+default, all in one transaction (inserts wait on the table lock meanwhile).
+"""
+from __future__ import annotations
+
+import logging
+import re
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+log = logging.getLogger(__name__)
+
+_NAME_RE = re.compile(r"^audit_logs_y(\d{4})m(\d{2})$")
+DEFAULT_PARTITION = "audit_logs_default"
+
+
+def _add_months(d: date, n: int) -> date:
+    m = d.month - 1 + n
+    return date(d.year + m // 12, m % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"audit_logs_y{month.year:04d}m{month.month:02d}"
+
+
+def _attached(db: Session) -> List[str]:
+    return list(db.execute(
+        text(
+            """
+            SELECT c.relname FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'audit_logs'::regclass
+            """
+        )
+    ).scalars())
+
+
+def list_partitions(db: Session, names: Optional[List[str]] = None) -> List[date]:
+    """First day of the month of every monthly partition currently attached, oldest first."""
+    months = []
+    for name in _attached(db) if names is None else names:
+        m = _NAME_RE.match(name)
+        if m:
+            months.append(date(int(m.group(1)), int(m.group(2)), 1))
+    return sorted(months)
+
+
+def ensure_partitions(db: Session, months_ahead: int = 2, today: Optional[date] = None) -> List[str]:
+    """Create partitions for the current month and ``months_ahead`` following ones."""
+    start = (today or date.today()).replace(day=1)
+    names = _attached(db)
+    existing = set(list_partitions(db, names))
+    has_default = DEFAULT_PARTITION in names
+    created = []
+    for i in range(months_ahead + 1):
+        month = _add_months(start, i)
+        if month in existing:
+            continue
+        name = partition_name(month)
+        bounds = {"lo": month, "hi": _add_months(month, 1)}
+        stranded = has_default and db.execute(
+            text(
+                f'SELECT EXISTS (SELECT 1 FROM "{DEFAULT_PARTITION}" '
+                "WHERE created_at >= :lo AND created_at < :hi)"
+            ),
+            bounds,
+        ).scalar()
+        if stranded:
+            db.execute(text(f'ALTER TABLE audit_logs DETACH PARTITION "{DEFAULT_PARTITION}"'))
+        db.execute(
+            text(
+                f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF audit_logs '
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+            )
+        )
+        if stranded:
+            moved = db.execute(
+                text(
+                    f'WITH moved AS (DELETE FROM "{DEFAULT_PARTITION}" '
+                    "WHERE created_at >= :lo AND created_at < :hi RETURNING *) "
+                    f'INSERT INTO "{name}" SELECT * FROM moved'
+                ),
+                bounds,
+            ).rowcount
+            db.execute(text(f'ALTER TABLE audit_logs ATTACH PARTITION "{DEFAULT_PARTITION}" DEFAULT'))
+            log.info("audit_partitions: moved %d rows from %s to %s", moved, DEFAULT_PARTITION, name)
+        created.append(name)
+    db.commit()
+    if created:
+        log.info("audit_partitions: created %s", ", ".join(created))
+    return created
+
+
+def detach_older_than(db: Session, retention_months: int, *, drop: bool = False, today: Optional[date] = None) -> List[str]:
+    """Detach monthly partitions that end before ``retention_months`` ago; drop them if ``drop``."""
+    cutoff = _add_months((today or date.today()).replace(day=1), -retention_months)
+    retired = []
+    for month in list_partitions(db):
+        if _add_months(month, 1) > cutoff:
+            continue
+        name = partition_name(month)
+        db.execute(text(f'ALTER TABLE audit_logs DETACH PARTITION "{name}"'))
+        if drop:
+            db.execute(text(f'DROP TABLE "{name}"'))
+        retired.append(name)
+    db.commit()
+    if retired:
+        log.info("audit_partitions: %s %s", "dropped" if drop else "detached", ", ".join(retired))
+    return retired
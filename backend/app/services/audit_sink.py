@@ -0,0 +1,140 @@
+"""
+Batched audit-log writer.
+
+Request handlers call ``audit_sink.record(...)``, which only appends the entry to an
+in-memory queue; the id and ``created_at`` are assigned at that moment so the log
+reflects when the event happened. A background thread writes queued entries with
+one multi-row INSERT once ``AUDIT_BATCH_SIZE`` entries are pending or
+``AUDIT_FLUSH_INTERVAL_MS`` has passed, so the request path no longer pays an extra
+commit per audit row.
+
+Compliance-critical events (contact unmask) use ``audit_sink.write(db, ...)``
+instead: the row is committed in the caller's transaction before the response is
+returned. Queued entries are flushed on shutdown; entries still queued if the
+process is killed are lost, which is the trade-off for the async path.
+
+``bind`` overrides the engine the background path writes with (tests point it at
+theirs and turn ``AUDIT_ASYNC_ENABLED`` off).
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import queue
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.audit_log import AuditLog
+
+log = logging.getLogger(__name__)
+
+
+def _entry(actor_user_id, entity_type: str, entity_id: Optional[Any], action: str, changes: Optional[dict]) -> Dict[str, Any]:
+    return {
+        "id": uuid.uuid4(),
+        "actor_user_id": actor_user_id,
+        "entity_type": entity_type,
+        "entity_id": str(entity_id) if entity_id is not None else None,
+        "action": action,
+        "changes": changes or {},
+        "created_at": datetime.utcnow(),
+    }
+
+
+class AuditSink:
+    def __init__(self, bind=None):
+        self.bind = bind
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max(0, settings.AUDIT_QUEUE_MAX_SIZE))
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.written = 0
+        self.failed = 0
+
+    def record(self, *, actor_user_id, entity_type: str, entity_id=None, action: str, changes: Optional[dict] = None) -> None:
+        """Queue an audit entry for the background writer (written inline if async is off or the queue is full)."""
+        entry = _entry(actor_user_id, entity_type, entity_id, action, changes)
+        if not settings.AUDIT_ASYNC_ENABLED:
+            self._insert([entry])
+            return
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            # Back-pressure rather than dropping audit history
+            log.warning("audit_sink: queue full; writing entry inline")
+            self._insert([entry])
+
+    def write(self, db: Session, *, actor_user_id, entity_type: str, entity_id=None, action: str, changes: Optional[dict] = None) -> None:
+        """Write an audit entry synchronously in ``db``'s transaction and commit it."""
+        db.execute(insert(AuditLog), [_entry(actor_user_id, entity_type, entity_id, action, changes)])
+        db.commit()
+
+    def _insert(self, rows: List[Dict[str, Any]]) -> None:
+        bind = self.bind
+        if bind is None:
+            from app.db.session import engine as bind
+
+        try:
+            with bind.begin() as conn:
+                conn.execute(insert(AuditLog), rows)
+            self.written += len(rows)
+        except Exception:
+            self.failed += len(rows)
+            log.exception("audit_sink: failed to write %d audit entr%s", len(rows), "y" if len(rows) == 1 else "ies")
+
+    def _drain(self, first: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        batch = [first] if first is not None else []
+        while len(batch) < settings.AUDIT_BATCH_SIZE:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        interval = max(0.01, settings.AUDIT_FLUSH_INTERVAL_MS / 1000.0)
+        while not self._stop.is_set():
+            try:
+                first = self._queue.get(timeout=interval)
+            except queue.Empty:
+                continue
+            # Give a burst a moment to accumulate into one INSERT
+            if self._queue.qsize() < settings.AUDIT_BATCH_SIZE - 1:
+                self._stop.wait(interval)
+            self._insert(self._drain(first))
+        self.flush()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="audit-sink", daemon=True)
+                self._thread.start()
+
+    def flush(self) -> None:
+        """Write everything queued so far (used on shutdown and in tests)."""
+        while True:
+            batch = self._drain()
+            if not batch:
+                return
+            self._insert(batch)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        self.flush()
+
+
+audit_sink = AuditSink()
+atexit.register(audit_sink.stop)
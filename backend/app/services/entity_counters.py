@@ -0,0 +1,53 @@
+"""
+Maintained entity counters (``entity_counters``) for milestone detection.
+
+Rows are keyed by ``(scope, scope_id, kind)``, e.g. ``('system', '', 'order')`` or
+``('warehouse', <warehouse id>, 'order')``. Create paths call ``increment`` after
+flushing the new row and before committing, so the counter moves in the same
+transaction as the insert and the returned value is exact under concurrency: the
+upsert takes the counter row's lock until commit, so two concurrent creates see
+consecutive values instead of both reading the same ``COUNT(*)``.
+
+Counters count entities created, not rows currently present; deletes do not
+decrement them, so a milestone is never reached twice.
+"""
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.entity_counter import EntityCounter
+
+SYSTEM = "system"
+WAREHOUSE = "warehouse"
+VENDOR = "vendor"
+CUSTOMER = "customer"
+
+
+def _scope_id(scope_id: Optional[Any]) -> str:
+    return str(scope_id) if scope_id is not None else ""
+
+
+def increment(db: Session, kind: str, scope: str = SYSTEM, scope_id: Optional[Any] = None, by: int = 1) -> int:
+    """Add ``by`` to the counter in ``db``'s transaction and return its new value."""
+    stmt = pg_insert(EntityCounter).values(scope=scope, scope_id=_scope_id(scope_id), kind=kind, value=by)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[EntityCounter.scope, EntityCounter.scope_id, EntityCounter.kind],
+        set_={"value": EntityCounter.value + stmt.excluded.value},
+    ).returning(EntityCounter.value)
+    return int(db.execute(stmt).scalar_one())
+
+
+def get(db: Session, kind: str, scope: str = SYSTEM, scope_id: Optional[Any] = None) -> int:
+    """Current value of a counter (0 if it was never incremented)."""
+    value = db.execute(
+        select(EntityCounter.value).where(
+            EntityCounter.scope == scope,
+            EntityCounter.scope_id == _scope_id(scope_id),
+            EntityCounter.kind == kind,
+        )
+    ).scalar_one_or_none()
+    return int(value or 0)
@@ -0,0 +1,246 @@
+"""
+Per-warehouse in-memory index of free (empty) bins in slotting order.
+
+Slotting order is ``(rack.name, stack_index, bin_index)`` on active racks, the same
+order the allocator has always used. Racks are ranked by the database's own
+``ORDER BY name`` when a warehouse is loaded and the heaps key on that rank, so
+rack names compare under the DB collation exactly as in the SQL fallback
+(``inbound_service._slotting_order``). Two heaps are kept per warehouse:
+
+  - ``clean``: bins on racks with no product-bound bin (eligible for FLAT receipts)
+  - ``mixed``: bins on racks that already hold SKU product
+
+so "next empty bin" is an O(log n) heap pop instead of a sorted join scan.
+
+The index is process-local and advisory: callers still lock the candidate rows in
+the database (see ``inbound_service.claim_empty_bins``), so a stale entry costs a
+miss, never a double allocation. Each warehouse is reloaded from the database when
+its snapshot is older than ``FREE_BIN_INDEX_TTL_SECONDS`` and whenever a caller
+calls ``invalidate`` (rack create/update/delete, grid materialization). Loads run
+outside the registry lock, so a cold warehouse never stalls allocations in others.
+"""
+from __future__ import annotations
+
+import heapq
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.bin import Bin
+from app.models.rack import Rack
+
+log = logging.getLogger(__name__)
+
+# (rack rank in DB name order, stack_index, bin_index)
+SlotKey = Tuple[int, int, int]
+
+
+@dataclass
+class _WarehouseBins:
+    loaded_at: float
+    # rack_id -> (rank of the rack's name in DB collation order, is active)
+    racks: Dict[uuid.UUID, Tuple[int, bool]] = field(default_factory=dict)
+    # bin_id -> (slot key, rack_id) for every bin currently free
+    free: Dict[uuid.UUID, Tuple[SlotKey, uuid.UUID]] = field(default_factory=dict)
+    # rack_id -> ids of bins that carry a product_id (makes the rack non-FLAT)
+    product_bins: Dict[uuid.UUID, Set[uuid.UUID]] = field(default_factory=dict)
+    rack_free: Dict[uuid.UUID, Set[uuid.UUID]] = field(default_factory=dict)
+    clean: List[Tuple[SlotKey, uuid.UUID]] = field(default_factory=list)
+    mixed: List[Tuple[SlotKey, uuid.UUID]] = field(default_factory=list)
+
+    def is_clean(self, rack_id: uuid.UUID) -> bool:
+        return not self.product_bins.get(rack_id)
+
+    def push(self, bin_id: uuid.UUID, key: SlotKey, rack_id: uuid.UUID) -> None:
+        self.free[bin_id] = (key, rack_id)
+        self.rack_free.setdefault(rack_id, set()).add(bin_id)
+        heapq.heappush(self.clean if self.is_clean(rack_id) else self.mixed, (key, bin_id))
+
+    def discard(self, bin_id: uuid.UUID) -> None:
+        # Heap entries are removed lazily on pop
+        entry = self.free.pop(bin_id, None)
+        if entry:
+            self.rack_free.get(entry[1], set()).discard(bin_id)
+
+    def set_product(self, rack_id: uuid.UUID, bin_id: uuid.UUID, has_product: bool) -> None:
+        bins = self.product_bins.setdefault(rack_id, set())
+        was_clean = not bins
+        if has_product:
+            bins.add(bin_id)
+        else:
+            bins.discard(bin_id)
+        if not was_clean and not bins:
+            # Rack became FLAT-eligible again: surface its free bins in the clean heap
+            for bid in self.rack_free.get(rack_id, ()):
+                heapq.heappush(self.clean, (self.free[bid][0], bid))
+
+    def _peek(self, heap: List[Tuple[SlotKey, uuid.UUID]], clean_only: bool) -> Optional[Tuple[SlotKey, uuid.UUID]]:
+        while heap:
+            key, bin_id = heap[0]
+            entry = self.free.get(bin_id)
+            if entry is None or entry[0] != key:
+                heapq.heappop(heap)
+                continue
+            if clean_only and not self.is_clean(entry[1]):
+                # Rack picked up product since this bin was pushed; move it over
+                heapq.heappop(heap)
+                heapq.heappush(self.mixed, (key, bin_id))
+                continue
+            return heap[0]
+        return None
+
+    def pop(self, *, flat: bool) -> Optional[uuid.UUID]:
+        if flat:
+            top = self._peek(self.clean, clean_only=True)
+            heap = self.clean
+        else:
+            a = self._peek(self.clean, clean_only=False)
+            b = self._peek(self.mixed, clean_only=False)
+            if a is None and b is None:
+                return None
+            if b is None or (a is not None and a <= b):
+                top, heap = a, self.clean
+            else:
+                top, heap = b, self.mixed
+        if top is None:
+            return None
+        heapq.heappop(heap)
+        self.discard(top[1])
+        return top[1]
+
+
+class FreeBinIndex:
+    """Process-wide registry of per-warehouse free-bin heaps."""
+
+    def __init__(self, ttl_seconds: Optional[float] = None):
+        self._ttl = ttl_seconds
+        self._lock = threading.RLock()
+        self._warehouses: Dict[Any, _WarehouseBins] = {}
+        # Bumped by invalidate (all / one warehouse) so a load that started earlier is not installed
+        self._epoch = 0
+        self._generations: Dict[str, int] = {}
+
+    @property
+    def ttl(self) -> float:
+        return float(self._ttl if self._ttl is not None else settings.FREE_BIN_INDEX_TTL_SECONDS)
+
+    def _key(self, warehouse_id) -> str:
+        return str(warehouse_id)
+
+    def _load(self, db: Session, warehouse_id) -> _WarehouseBins:
+        state = _WarehouseBins(loaded_at=time.monotonic())
+        racks = (
+            db.query(Rack.id, Rack.status)
+            .filter(Rack.warehouse_id == warehouse_id)
+            .order_by(Rack.name.asc())
+        )
+        for rank, (rack_id, status) in enumerate(racks):
+            state.racks[rack_id] = (rank, status == 'active')
+        rows = (
+            db.query(Bin.id, Bin.rack_id, Bin.stack_index, Bin.bin_index, Bin.status, Bin.product_id)
+            .join(Rack, Bin.rack_id == Rack.id)
+            .filter(Rack.warehouse_id == warehouse_id)
+            .filter((Bin.status == 'empty') | Bin.product_id.isnot(None))
+            .all()
+        )
+        for bin_id, rack_id, stack_index, bin_index, status, product_id in rows:
+            if product_id is not None:
+                state.product_bins.setdefault(rack_id, set()).add(bin_id)
+        for bin_id, rack_id, stack_index, bin_index, status, product_id in rows:
+            rank, active = state.racks.get(rack_id, (0, False))
+            if status == 'empty' and active:
+                state.push(bin_id, (rank, int(stack_index), int(bin_index)), rack_id)
+        log.debug("free_bin_index: loaded warehouse=%s free=%d", warehouse_id, len(state.free))
+        return state
+
+    def _fresh(self, key: str) -> Optional[_WarehouseBins]:
+        state = self._warehouses.get(key)
+        if state is None or time.monotonic() - state.loaded_at > self.ttl:
+            return None
+        return state
+
+    def _ensure_loaded(self, db: Session, warehouse_id) -> None:
+        """Load the warehouse if needed; the DB round trip happens without the lock held."""
+        key = self._key(warehouse_id)
+        with self._lock:
+            if self._fresh(key) is not None:
+                return
+            generation = (self._epoch, self._generations.get(key, 0))
+        state = self._load(db, warehouse_id)
+        with self._lock:
+            # Keep a snapshot another thread installed meanwhile; drop ours if invalidated
+            if self._fresh(key) is None and (self._epoch, self._generations.get(key, 0)) == generation:
+                self._warehouses[key] = state
+
+    def pop_candidates(self, db: Session, warehouse_id, count: int, *, flat: bool = False) -> List[uuid.UUID]:
+        """Remove and return up to ``count`` free bin ids in slotting order.
+
+        For FLAT receipts only FLAT-eligible racks are used, unless none has a
+        free bin, in which case any free bin is returned (same rule as the SQL path).
+        """
+        if not settings.FREE_BIN_INDEX_ENABLED or count <= 0:
+            return []
+        self._ensure_loaded(db, warehouse_id)
+        with self._lock:
+            state = self._warehouses.get(self._key(warehouse_id))
+            if state is None:
+                # Invalidated while loading; let the SQL path serve this call
+                return []
+            out: List[uuid.UUID] = []
+            if flat:
+                while len(out) < count:
+                    bin_id = state.pop(flat=True)
+                    if bin_id is None:
+                        break
+                    out.append(bin_id)
+                if out:
+                    return out
+            while len(out) < count:
+                bin_id = state.pop(flat=False)
+                if bin_id is None:
+                    break
+                out.append(bin_id)
+            return out
+
+    def observe(self, warehouse_id, rows: Iterable[Any]) -> None:
+        """Apply committed bin states to the index.
+
+        ``rows`` are Bin instances or rows exposing ``id, rack_id, stack_index,
+        bin_index, status, product_id``. Empty bins on known active racks become
+        free; anything else is removed.
+        """
+        with self._lock:
+            state = self._warehouses.get(self._key(warehouse_id))
+            if state is None:
+                return
+            for row in rows:
+                rack = state.racks.get(row.rack_id)
+                if rack is None:
+                    # Unknown rack (created elsewhere); rebuild on next access
+                    self._warehouses.pop(self._key(warehouse_id), None)
+                    return
+                state.discard(row.id)
+                state.set_product(row.rack_id, row.id, row.product_id is not None)
+                rank, active = rack
+                if row.status == 'empty' and active:
+                    state.push(row.id, (rank, int(row.stack_index), int(row.bin_index)), row.rack_id)
+
+    def invalidate(self, warehouse_id=None) -> None:
+        """Drop the snapshot for one warehouse (or all) so the next access reloads it."""
+        with self._lock:
+            if warehouse_id is None:
+                self._warehouses.clear()
+                self._epoch += 1
+            else:
+                key = self._key(warehouse_id)
+                self._warehouses.pop(key, None)
+                self._generations[key] = self._generations.get(key, 0) + 1
+
+
+free_bins = FreeBinIndex()
@@ -0,0 +1,166 @@
+"""
+Incremental goods-in KPI counters (``inbound_kpi_counters``).
+
+Rows are keyed by ``(warehouse_id, day, metric)``:
+
+  - running totals live on the sentinel day ``TOTALS_DAY``:
+    ``total``, ``sku``, ``flat`` (receipts created) and ``open``, ``pending``,
+    ``allocated`` (receipts currently in that state)
+  - ``completed`` is counted on the day a receipt moved to COMPLETED (its
+    ``updated_at`` day) and taken back off that day if it is reopened
+  - ``open_planned`` counts open receipts on their planned arrival day, so late
+    arrivals are the sum over days before today
+
+Writers call ``record_created`` / ``change_status`` inside their own transaction,
+so counters commit or roll back together with the receipt. ``change_status``
+writes the new status itself and takes the previous one from the locked row, so
+concurrent status changes each move the counters from the state they replaced. Reading
+the KPIs is one grouped query over a handful of rows per warehouse, however many
+receipts exist.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.inbound_kpi_counter import InboundKpiCounter
+from app.models.inbound_receipt import InboundReceipt
+
+TOTALS_DAY = date(1970, 1, 1)
+
+_CLOSED = ("COMPLETED", "CANCELLED")
+
+Deltas = Counter  # (day, metric) -> delta
+
+
+def _state(status: Optional[str], planned_arrival: Optional[datetime], sign: int) -> Deltas:
+    """Counter contributions of a receipt that is currently in ``status``."""
+    out: Deltas = Counter()
+    if status in _CLOSED:
+        return out
+    out[(TOTALS_DAY, 'open')] += sign
+    if planned_arrival is not None:
+        out[(planned_arrival.date(), 'open_planned')] += sign
+    if status == 'AWAITING_UNLOADING':
+        out[(TOTALS_DAY, 'pending')] += sign
+    elif status == 'ALLOCATED':
+        out[(TOTALS_DAY, 'allocated')] += sign
+    return out
+
+
+def _apply(db: Session, warehouse_id, deltas: Deltas) -> None:
+    rows = [
+        {"warehouse_id": warehouse_id, "day": day, "metric": metric, "value": value}
+        for (day, metric), value in deltas.items()
+        if value
+    ]
+    if not rows:
+        return
+    stmt = pg_insert(InboundKpiCounter).values(rows)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[InboundKpiCounter.warehouse_id, InboundKpiCounter.day, InboundKpiCounter.metric],
+        set_={"value": InboundKpiCounter.value + stmt.excluded.value},
+    ))
+
+
+def _created(status: Optional[str], vendor_type: Optional[str], planned_arrival: Optional[datetime]) -> Deltas:
+    status = status or 'AWAITING_UNLOADING'
+    deltas = _state(status, planned_arrival, +1)
+    deltas[(TOTALS_DAY, 'total')] += 1
+    vendor_type = str(vendor_type or 'SKU').upper()
+    if vendor_type in ('SKU', 'FLAT'):
+        deltas[(TOTALS_DAY, vendor_type.lower())] += 1
+    if status == 'COMPLETED':
+        deltas[(datetime.utcnow().date(), 'completed')] += 1
+    return deltas
+
+
+def record_created(db: Session, rec: InboundReceipt) -> None:
+    """Count a newly created receipt. Call before committing the receipt."""
+    _apply(db, rec.warehouse_id, _created(rec.status, rec.vendor_type, rec.planned_arrival))
+
+
+def record_created_rows(db: Session, rows: Iterable[Mapping[str, Any]]) -> None:
+    """Count receipts bulk-inserted as column dicts, one upsert per warehouse."""
+    by_warehouse: Dict[Any, Deltas] = {}
+    for row in rows:
+        by_warehouse.setdefault(row['warehouse_id'], Counter()).update(
+            _created(row.get('status'), row.get('vendor_type'), row.get('planned_arrival'))
+        )
+    for warehouse_id, deltas in by_warehouse.items():
+        _apply(db, warehouse_id, deltas)
+
+
+def _transition(
+    before: Optional[str], after: Optional[str], planned_arrival: Optional[datetime], before_updated_at: Optional[datetime]
+) -> Deltas:
+    if before == after:
+        return Counter()
+    deltas = _state(before, planned_arrival, -1)
+    deltas.update(_state(after, planned_arrival, +1))
+    if after == 'COMPLETED':
+        deltas[(datetime.utcnow().date(), 'completed')] += 1
+    if before == 'COMPLETED':
+        deltas[((before_updated_at or datetime.utcnow()).date(), 'completed')] -= 1
+    return deltas
+
+
+def change_status(db: Session, rec: InboundReceipt, status: str) -> Optional[str]:
+    """Set ``rec``'s status and move its counter contributions. Call before committing.
+
+    One ``UPDATE ... RETURNING`` locks the row and reports the status it replaced;
+    returns that status (None if the receipt no longer exists).
+    """
+    t = InboundReceipt.__table__
+    prev = (
+        select(t.c.id, t.c.status, t.c.updated_at, t.c.planned_arrival)
+        .where(t.c.id == rec.id)
+        .with_for_update()
+        .subquery("prev")
+    )
+    now = datetime.utcnow()
+    row = db.execute(
+        update(t)
+        .where(t.c.id == prev.c.id)
+        .values(status=status, updated_at=now)
+        .returning(prev.c.status, prev.c.updated_at, prev.c.planned_arrival)
+    ).first()
+    if row is None:
+        return None
+    set_committed_value(rec, 'status', status)
+    set_committed_value(rec, 'updated_at', now)
+    _apply(db, rec.warehouse_id, _transition(row.status, status, row.planned_arrival, row.updated_at))
+    return row.status
+
+
+def read_kpis(db: Session, warehouse_id=None, today: Optional[date] = None) -> Dict[str, int]:
+    """Goods-in KPIs from the counters, for one warehouse or all of them."""
+    today = today or datetime.utcnow().date()
+    c = InboundKpiCounter
+    q = (
+        db.query(c.metric, func.sum(c.value))
+        .filter(or_(
+            c.day == TOTALS_DAY,
+            and_(c.metric == 'completed', c.day == today),
+            and_(c.metric == 'open_planned', c.day < today),
+        ))
+    )
+    if warehouse_id is not None:
+        q = q.filter(c.warehouse_id == warehouse_id)
+    totals = {metric: int(value or 0) for metric, value in q.group_by(c.metric).all()}
+    return {
+        "totalReceipts": totals.get('total', 0),
+        "openReceipts": totals.get('open', 0),
+        "pending": totals.get('pending', 0),
+        "completedToday": totals.get('completed', 0),
+        "lateArrivals": totals.get('open_planned', 0),
+        "skuReceipts": totals.get('sku', 0),
+        "flatReceipts": totals.get('flat', 0),
+        "binsAllocated": totals.get('allocated', 0),
+    }
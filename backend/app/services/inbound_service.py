@@ -1,11 +1,23 @@
 import uuid
 from datetime import datetime
-from sqlalchemy.orm import Session, joinedload
-from typing import Optional
+from sqlalchemy import Integer, cast, column, distinct, func, insert, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Session, joinedload, selectinload
+from typing import List, Optional, Tuple
 from app.models.inbound_receipt import InboundReceipt
 from app.models.inbound_receipt_line import InboundReceiptLine
 from app.models.bin import Bin
 from app.models.rack import Rack
+from app.models.audit_log import AuditLog
+from app.models.customer import Customer
+from app.models.order import Order
+from app.models.order_product import OrderProduct
+from app.models.product import Product
+from app.crud.crud_config import config as cfg
+from app.crud.crud_inbound import format_receipt_code
+from app.services import inbound_kpi_counters as kpi_counters
+from app.services.free_bin_index import free_bins
+from app.services.rack_occupancy import occupancy
 import logging
 
 log = logging.getLogger(__name__)
@@ -19,94 +31,179 @@ def _gen_bin_code(idx: int) -> str:
     return f"BIN-{letter}{num}"
 
 
-def auto_allocate_bins(db: Session, receipt_id: uuid.UUID) -> Optional[InboundReceipt]:
-    rec = db.query(InboundReceipt).get(receipt_id)
-    if not rec:
-        log.warning("auto_allocate_bins: receipt not found id=%s", receipt_id)
-        return None
-    # Build candidate empty bins in same warehouse on active racks
-    q = (
-        db.query(Bin)
+def _warehouse_of(db: Session, rack_id: uuid.UUID):
+    return db.query(Rack.warehouse_id).filter(Rack.id == rack_id).scalar()
+
+
+def _slotting_order():
+    return (Rack.name.asc(), Bin.stack_index.asc(), Bin.bin_index.asc())
+
+
+def _empty_bins_query(db: Session, warehouse_id: uuid.UUID):
+    return (
+        db.query(Bin.id)
         .join(Rack, Bin.rack_id == Rack.id)
-        .filter(Rack.warehouse_id == rec.warehouse_id)
+        .filter(Rack.warehouse_id == warehouse_id)
         .filter(Rack.status == 'active')
         .filter(Bin.status == 'empty')
     )
 
-    # Special rule for FLAT vendors: do not mix SKUs; allocate from racks dedicated to flat (no product bins)
-    # Strategy: prefer racks where no bin has product_id set (either empty or reserved/occupied without product association).
-    # Fallback to all empty bins if none match.
-    if str(getattr(rec, 'vendor_type', '')).upper() == 'FLAT':
-        # Get rack IDs that have any bin with a product_id (indicating SKU mixing)
-        from sqlalchemy import distinct
+
+def _scan_empty_bins(db: Session, warehouse_id: uuid.UUID, count: int, *, flat: bool, exclude: List[uuid.UUID]) -> List[uuid.UUID]:
+    q = _empty_bins_query(db, warehouse_id)
+    if exclude:
+        q = q.filter(~Bin.id.in_(exclude))
+    if flat:
         racks_with_product = (
             db.query(distinct(Bin.rack_id))
             .join(Rack, Bin.rack_id == Rack.id)
-            .filter(Rack.warehouse_id == rec.warehouse_id)
+            .filter(Rack.warehouse_id == warehouse_id)
             .filter(Bin.product_id.isnot(None))
-            .subquery()
         )
-        empty_bins = (
-            q.filter(~Bin.rack_id.in_(db.query(racks_with_product.c.rack_id)))
-             .order_by(Rack.name.asc(), Bin.stack_index.asc(), Bin.bin_index.asc())
-             .all()
+        clean = (
+            q.filter(~Bin.rack_id.in_(racks_with_product))
+            .order_by(*_slotting_order())
+            .limit(count)
+            .with_for_update(of=Bin, skip_locked=True)
+            .all()
+        )
+        if clean:
+            return [r.id for r in clean]
+    rows = (
+        q.order_by(*_slotting_order())
+        .limit(count)
+        .with_for_update(of=Bin, skip_locked=True)
+        .all()
+    )
+    return [r.id for r in rows]
+
+
+def claim_empty_bins(db: Session, warehouse_id: uuid.UUID, count: int, *, flat: bool = False) -> List[uuid.UUID]:
+    """Lock and return up to ``count`` empty bin ids in slotting order.
+
+    Candidates come from the in-memory free-bin index and are locked by primary
+    key; if the index is stale or runs dry, the remainder is claimed with a
+    ``SELECT ... FOR UPDATE SKIP LOCKED LIMIT n`` scan. Either way rows locked by
+    another transaction are skipped instead of waited on, so concurrent
+    allocations never see the same bin. Locks are held until the caller commits.
+
+    For FLAT receipts, racks that already hold product-bound bins are avoided
+    (no SKU mixing); if no such rack has room, any empty bin is used.
+    """
+    if count <= 0:
+        return []
+    claimed: List[uuid.UUID] = []
+    candidates = free_bins.pop_candidates(db, warehouse_id, count, flat=flat)
+    if candidates:
+        rows = (
+            _empty_bins_query(db, warehouse_id)
+            .filter(Bin.id.in_(candidates))
+            .order_by(*_slotting_order())
+            .with_for_update(of=Bin, skip_locked=True)
+            .all()
         )
-        if not empty_bins:
-            # Fallback: no clean racks; use generic empty bins
-            empty_bins = (
-                q.order_by(Rack.name.asc(), Bin.stack_index.asc(), Bin.bin_index.asc()).all()
-            )
-    else:
-        empty_bins = (
-            q.order_by(Rack.name.asc(), Bin.stack_index.asc(), Bin.bin_index.asc()).all()
+        claimed = [r.id for r in rows]
+        if len(claimed) < len(candidates):
+            log.debug("claim_empty_bins: %d stale index candidates in warehouse=%s", len(candidates) - len(claimed), warehouse_id)
+    if len(claimed) < count:
+        extra = _scan_empty_bins(db, warehouse_id, count - len(claimed), flat=flat, exclude=claimed)
+        if extra:
+            # The index missed bins the database has; rebuild it on next use
+            free_bins.invalidate(warehouse_id)
+        claimed.extend(extra)
+    return claimed
+
+
+def _bulk_assign(db: Session, assignments: List[Tuple[uuid.UUID, uuid.UUID, Optional[uuid.UUID], Optional[int]]]) -> list:
+    """Write (line_id, bin_id, product_id, quantity) assignments with two set-based UPDATEs.
+
+    Renders as ``UPDATE ... FROM (VALUES ...)`` on Postgres so the cost is two
+    statements regardless of how many lines are being allocated. Returns the
+    updated bin rows for the free-bin index.
+    """
+    if not assignments:
+        return []
+    alloc = values(
+        column('line_id', PG_UUID(as_uuid=True)),
+        column('bin_id', PG_UUID(as_uuid=True)),
+        column('product_id', PG_UUID(as_uuid=True)),
+        column('quantity', Integer),
+        name='alloc',
+    ).data(assignments)
+    bins = db.execute(
+        update(Bin)
+        .where(Bin.id == alloc.c.bin_id)
+        .values(
+            status='reserved',
+            # Explicit casts: an all-NULL VALUES column would otherwise be typed as text
+            product_id=func.coalesce(cast(alloc.c.product_id, PG_UUID(as_uuid=True)), Bin.product_id),
+            quantity=func.coalesce(cast(alloc.c.quantity, Integer), Bin.quantity),
         )
-    log.info("auto_allocate_bins: candidate empty bins=%d for receipt=%s", len(empty_bins), receipt_id)
-    idx = 0
-    assigned = 0
-    for line in rec.lines:
-        if not line.bin_id:
-            # Find next available empty bin
-            while idx < len(empty_bins) and empty_bins[idx].status != 'empty':
-                idx += 1
-            if idx >= len(empty_bins):
-                log.info("auto_allocate_bins: out of empty bins after assigning %d lines", assigned)
-                break  # no more bins; leave remaining lines unassigned
-            b = empty_bins[idx]
-            line.bin_id = b.id
-            # Mark bin reserved for inbound allocation and associate product/qty when available
-            b.status = 'reserved'
-            try:
-                # For SKU mode, attach product; for FLAT keep product fields empty to avoid mixing policy
-                if str(getattr(rec, 'vendor_type', '')).upper() != 'FLAT' and getattr(line, 'product_id', None):
-                    b.product_id = line.product_id
-                # Quantity reflects allocated quantity for this inbound line
-                if getattr(line, 'quantity', None) is not None:
-                    b.quantity = int(line.quantity)
-            except Exception:
-                # Best-effort; keep allocation even if enrichment fails
-                pass
-            log.debug("auto_allocate_bins: line=%s allocated to bin=%s code=%s", line.id, b.id, getattr(b, 'code', None))
-            idx += 1
-            db.add(line)
-            db.add(b)
-            assigned += 1
-    rec.updated_at = datetime.utcnow()
-    db.add(rec)
-    db.commit()
-    # If all lines have a bin now, progress receipt to READY_FOR_PICKING
+        .returning(Bin.id, Bin.rack_id, Bin.stack_index, Bin.bin_index, Bin.status, Bin.product_id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.execute(
+        update(InboundReceiptLine)
+        .where(InboundReceiptLine.id == alloc.c.line_id)
+        .values(bin_id=alloc.c.bin_id)
+        .execution_options(synchronize_session=False)
+    )
+    return bins
+
+
+def auto_allocate_bins(db: Session, receipt_id: uuid.UUID) -> Optional[InboundReceipt]:
+    rec = db.query(InboundReceipt).get(receipt_id)
+    if not rec:
+        log.warning("auto_allocate_bins: receipt not found id=%s", receipt_id)
+        return None
+    is_flat = str(getattr(rec, 'vendor_type', '')).upper() == 'FLAT'
+    # Only the columns needed for assignment; avoids hydrating lines (and their joined bins)
+    pending = (
+        db.query(InboundReceiptLine.id, InboundReceiptLine.product_id, InboundReceiptLine.quantity)
+        .filter(InboundReceiptLine.receipt_id == receipt_id, InboundReceiptLine.bin_id.is_(None))
+        .order_by(InboundReceiptLine.id)
+        .all()
+    )
+    warehouse_id = rec.warehouse_id
+    bin_ids = claim_empty_bins(db, warehouse_id, len(pending), flat=is_flat)
+    log.info("auto_allocate_bins: claimed %d bins for %d pending lines on receipt=%s", len(bin_ids), len(pending), receipt_id)
+    if len(bin_ids) < len(pending):
+        log.info("auto_allocate_bins: out of empty bins after assigning %d lines", len(bin_ids))
+    # For SKU mode, attach product; for FLAT keep product fields empty to avoid mixing policy.
+    # Quantity reflects allocated quantity for this inbound line.
+    assignments = [
+        (
+            line.id,
+            bin_id,
+            None if is_flat else line.product_id,
+            int(line.quantity) if line.quantity is not None else None,
+        )
+        for line, bin_id in zip(pending, bin_ids)
+    ]
     try:
-        total = len(rec.lines or [])
-        with_bins = sum(1 for l in rec.lines or [] if l.bin_id)
+        reserved = _bulk_assign(db, assignments)
+        # If all lines have a bin now, progress receipt to READY_FOR_PICKING
+        total, with_bins = (
+            db.query(func.count(InboundReceiptLine.id), func.count(InboundReceiptLine.bin_id))
+            .filter(InboundReceiptLine.receipt_id == receipt_id)
+            .one()
+        )
         if total > 0 and with_bins == total:
-            rec.status = 'READY_FOR_PICKING'
-            rec.updated_at = datetime.utcnow()
-            db.add(rec)
-            db.commit()
+            kpi_counters.change_status(db, rec, 'READY_FOR_PICKING')
             log.info("auto_allocate_bins: all lines allocated; progressed receipt %s to READY_FOR_PICKING", receipt_id)
         else:
             log.info("auto_allocate_bins: partial allocation assigned=%d total=%d", with_bins, total)
+        rec.updated_at = datetime.utcnow()
+        db.add(rec)
+        db.commit()
     except Exception:
-        log.exception("auto_allocate_bins: failed to evaluate/progress status for receipt %s", receipt_id)
+        # Popped index candidates may not have been reserved; resync from the DB
+        free_bins.invalidate(warehouse_id)
+        raise
+    free_bins.observe(warehouse_id, reserved)
+    occupancy.mark_dirty({b.rack_id for b in reserved})
+    # Bulk UPDATEs bypass the identity map; drop stale state before reloading
+    db.expire_all()
     # Return with lines+bin eagerly loaded so bin_code serializes
     rec = (
         db.query(InboundReceipt)
@@ -140,15 +237,8 @@ def reassign_line_bin(db: Session, line_id: uuid.UUID) -> Optional[InboundReceip
                 pass
             db.add(current_bin)
             log.debug("reassign_line_bin: freed previous bin=%s for line=%s", current_bin.id, line.id)
-    new_bin = (
-        db.query(Bin)
-        .join(Rack, Bin.rack_id == Rack.id)
-        .filter(Rack.warehouse_id == rec.warehouse_id)
-        .filter(Rack.status == 'active')
-        .filter(Bin.status == 'empty')
-        .order_by(Rack.name.asc(), Bin.stack_index.asc(), Bin.bin_index.asc())
-        .first()
-    )
+    claimed = claim_empty_bins(db, rec.warehouse_id, 1)
+    new_bin = db.query(Bin).get(claimed[0]) if claimed else None
     if not new_bin:
         log.info("reassign_line_bin: no empty bins available in active racks for receipt=%s line=%s", rec.id, line_id)
         return line
@@ -166,6 +256,7 @@ def reassign_line_bin(db: Session, line_id: uuid.UUID) -> Optional[InboundReceip
     db.add(line)
     db.commit()
     db.refresh(line)
+    free_bins.observe(rec.warehouse_id, [b for b in (current_bin, new_bin) if b is not None])
     log.debug("reassign_line_bin: line=%s assigned to new bin=%s code=%s", line.id, new_bin.id, getattr(new_bin, 'code', None))
     return line
 
@@ -175,6 +266,7 @@ def clear_line_bin(db: Session, line_id: uuid.UUID) -> Optional[InboundReceiptLi
     if not line:
         log.warning("clear_line_bin: line not found id=%s", line_id)
         return None
+    b = None
     if line.bin_id:
         b = db.query(Bin).get(line.bin_id)
         if b:
@@ -192,4 +284,109 @@ def clear_line_bin(db: Session, line_id: uuid.UUID) -> Optional[InboundReceiptLi
     db.add(line)
     db.commit()
     db.refresh(line)
+    if b is not None:
+        free_bins.observe(_warehouse_of(db, b.rack_id), [b])
     return line
+
+
+def create_receipts_from_pending_orders(
+    db: Session,
+    warehouse_id: uuid.UUID,
+    *,
+    actor_user_id: Optional[uuid.UUID] = None,
+) -> List[InboundReceipt]:
+    """Create one SKU receipt per vendor from all pending orders of a warehouse.
+
+    One joined query loads every pending order line with its product and customer
+    (locking the orders so a concurrent run skips them), lines are grouped by vendor
+    in memory, receipt seqs are reserved as one block, and receipts, lines, the
+    order status change and audit rows are written in a single transaction.
+    """
+    rows = (
+        db.query(
+            Order.id,
+            Product.vendor_id,
+            Product.sku,
+            Product.name,
+            Customer.name,
+            OrderProduct.quantity,
+        )
+        .join(OrderProduct, OrderProduct.order_id == Order.id)
+        .join(Product, Product.id == OrderProduct.product_id)
+        .outerjoin(Customer, Customer.id == Order.customer_id)
+        .filter(Order.status == "pending", Order.warehouse_id == warehouse_id)
+        .order_by(Order.created_at, Order.id)
+        .with_for_update(of=Order, skip_locked=True)
+        .all()
+    )
+    lines_by_vendor: dict = {}
+    order_ids = set()
+    for order_id, vendor_id, sku, name, customer_name, quantity in rows:
+        if vendor_id is None:
+            continue
+        order_ids.add(order_id)
+        lines_by_vendor.setdefault(vendor_id, []).append({
+            "product_sku": sku,
+            "product_name": name,
+            "customer_name": customer_name,
+            "quantity": int(quantity or 1),
+        })
+    if not lines_by_vendor:
+        db.rollback()
+        return []
+
+    try:
+        wh_cfg, seqs = cfg.consume_receipt_seq_block(db, str(warehouse_id), len(lines_by_vendor))
+        now = datetime.utcnow()
+        receipt_rows, line_rows, audit_rows = [], [], []
+        for seq, (vendor_id, lines) in zip(seqs, lines_by_vendor.items()):
+            receipt_id = uuid.uuid4()
+            receipt_rows.append({
+                "id": receipt_id,
+                "code": format_receipt_code(wh_cfg, seq),
+                "warehouse_id": warehouse_id,
+                "vendor_id": vendor_id,
+                "vendor_type": "SKU",
+                "status": "AWAITING_UNLOADING",
+                "planned_arrival": now,
+                "notes": "Auto-created from pending orders",
+                "created_at": now,
+                "updated_at": now,
+            })
+            line_rows.extend({"id": uuid.uuid4(), "receipt_id": receipt_id, **l} for l in lines)
+            if actor_user_id is not None:
+                audit_rows.append({
+                    "id": uuid.uuid4(),
+                    "actor_user_id": actor_user_id,
+                    "entity_type": "inbound_receipt",
+                    "entity_id": str(receipt_id),
+                    "action": "create_unloading_task",
+                    "changes": {"queue": {"before": None, "after": "UNLOADER"}},
+                    "created_at": now,
+                })
+        db.execute(insert(InboundReceipt), receipt_rows)
+        db.execute(insert(InboundReceiptLine), line_rows)
+        kpi_counters.record_created_rows(db, receipt_rows)
+        db.execute(
+            update(Order)
+            .where(Order.id.in_(order_ids), Order.status == "pending")
+            .values(status="attached")
+            .execution_options(synchronize_session=False)
+        )
+        if audit_rows:
+            db.execute(insert(AuditLog), audit_rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    log.info(
+        "create_receipts_from_pending_orders: warehouse=%s receipts=%d lines=%d orders=%d",
+        warehouse_id, len(receipt_rows), len(line_rows), len(order_ids),
+    )
+    return (
+        db.query(InboundReceipt)
+        .options(selectinload(InboundReceipt.lines))
+        .filter(InboundReceipt.id.in_([r["id"] for r in receipt_rows]))
+        .order_by(InboundReceipt.code)
+        .all()
+    )
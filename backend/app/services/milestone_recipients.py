@@ -0,0 +1,97 @@
+"""
+Cached milestone notification recipients.
+
+Every milestone notifies all active ADMINs plus, for warehouse milestones, that
+warehouse's active manager. ``recipients.get(db, warehouse_id)`` resolves that set
+with one query and keeps it in memory per scope (``system`` or a warehouse) for
+``MILESTONE_RECIPIENT_CACHE_TTL_SECONDS``.
+
+Entries are dropped when an active admin/manager is created, a user's role or
+status changes (``CRUDUser.create`` / ``update`` / ``remove``) or a warehouse's
+manager changes (``CRUDWarehouse.update``). Milestone handlers run in whichever
+worker's outbox dispatcher claims the event, so writers call
+``publish_invalidation`` in their transaction and every worker drops the entry
+once it commits (``MILESTONE_RECIPIENTS_INVALIDATION_CHANNEL``); the TTL bounds
+staleness if a notification is lost.
+"""
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.pg_listener import notify, pg_listener
+from app.models.user import User
+from app.models.warehouse import Warehouse
+
+_SYSTEM = "system"
+
+
+class RecipientCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[float, Tuple[uuid.UUID, ...]]] = {}
+
+    @staticmethod
+    def _key(warehouse_id) -> str:
+        return str(warehouse_id) if warehouse_id else _SYSTEM
+
+    @staticmethod
+    def _load(db: Session, warehouse_id) -> Tuple[uuid.UUID, ...]:
+        recipient = User.role == 'ADMIN'
+        if warehouse_id:
+            manager_id = select(Warehouse.manager_id).where(Warehouse.id == warehouse_id).scalar_subquery()
+            recipient = or_(recipient, User.id == manager_id)
+        rows = db.execute(
+            select(User.id).where(recipient, User.status == 'ACTIVE').order_by(User.id)
+        ).scalars()
+        return tuple(rows)
+
+    def get(self, db: Session, warehouse_id=None) -> Tuple[uuid.UUID, ...]:
+        """Ids of the users to notify for a system (or ``warehouse_id``) milestone."""
+        key = self._key(warehouse_id)
+        ttl = settings.MILESTONE_RECIPIENT_CACHE_TTL_SECONDS
+        if ttl > 0:
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] <= ttl:
+                return entry[1]
+        ids = self._load(db, warehouse_id)
+        if ttl > 0:
+            with self._lock:
+                self._entries[key] = (time.monotonic(), ids)
+        return ids
+
+    def invalidate(self, warehouse_id: Optional[object] = None) -> None:
+        """Drop one warehouse's entry, or everything when ``warehouse_id`` is None."""
+        with self._lock:
+            if warehouse_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(self._key(warehouse_id), None)
+
+    def clear(self) -> None:
+        self.invalidate()
+
+    def publish_invalidation(self, db: Session, warehouse_id: Optional[object] = None) -> None:
+        """Drop the entry (all entries if ``warehouse_id`` is None) in every worker once ``db`` commits.
+
+        Callers also invalidate locally after their commit, so a concurrent load
+        cannot re-cache the old set in this worker.
+        """
+        if settings.MILESTONE_RECIPIENTS_INVALIDATION_CHANNEL:
+            notify(db, settings.MILESTONE_RECIPIENTS_INVALIDATION_CHANNEL, str(warehouse_id) if warehouse_id else "")
+
+
+recipients = RecipientCache()
+
+if settings.MILESTONE_RECIPIENTS_INVALIDATION_CHANNEL:
+    # Payload is a warehouse id, or empty to drop everything
+    pg_listener.subscribe(
+        settings.MILESTONE_RECIPIENTS_INVALIDATION_CHANNEL, lambda payload: recipients.invalidate(payload or None)
+    )
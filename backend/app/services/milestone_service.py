@@ -5,6 +5,7 @@ from app.crud.crud_milestone import milestone as crud_milestone
 from app.schemas.milestone import MilestoneCreate
 from app.models.milestone import MilestoneEventType, MilestoneEntityType
 from app.models.warehouse import Warehouse
+from app.services.outbox import outbox
 import logging
 import uuid
 
@@ -18,7 +19,7 @@ def get_next_milestone(current_count: int) -> int | None:
     """
     for value in MILESTONE_VALUES:
         if current_count == value:  # Adjusted to check for equality only
-            logger.info(f"Next milestone value determined: {value}")
+            logger.info("Next milestone value determined: %s", value)
             return value
     logger.info("No next milestone value found.")
     return None
@@ -80,7 +81,7 @@ def check_and_create_milestone(
             milestone_type=milestone_type or "warehouse_creation",
             user_id=user_id,
         )
-        logger.info(f"🎯 {milestone_in.description}")
+        logger.info("🎯 %s", milestone_in.description)
         crud_milestone.create(db, obj_in=milestone_in)
         return
 
@@ -102,8 +103,205 @@ def check_and_create_milestone(
                 milestone_type=milestone_type or ("warehouse_" + str(event_type)) if warehouse_id else str(event_type),
             )
             crud_milestone.create(db, obj_in=milestone_in)
-            logger.info(f"🎯 {milestone_in.description}")
+            logger.info("🎯 %s", milestone_in.description)
         except Exception as e:
             context = "Warehouse" if warehouse_id else "System"
-            logger.error(f"Failed to create {context}-level milestone: {e}")
-            raise
\ No newline at end of file
+            logger.error("Failed to create %s-level milestone: %s", context, e)
+            raise
+
+# --- Outbox handlers -------------------------------------------------------
+# Create paths publish these events with the counter values taken in their
+# transaction (app.services.entity_counters); the outbox dispatcher runs the
+# milestone checks below off the request path.
+
+def _warehouse_name(db: Session, warehouse_id) -> str:
+    wh = db.get(Warehouse, _as_valid_uuid(warehouse_id)) if _as_valid_uuid(warehouse_id) else None
+    return wh.name if wh else "Warehouse"
+
+
+def _vendor_name(db: Session, vendor_id) -> str:
+    from app.models.vendor import Vendor
+
+    vendor = db.get(Vendor, _as_valid_uuid(vendor_id)) if _as_valid_uuid(vendor_id) else None
+    return vendor.business_name if vendor else "Vendor"
+
+
+def on_order_created(db: Session, event: dict) -> None:
+    # System-wide order count milestone
+    check_and_create_milestone(
+        db,
+        event_type=MilestoneEventType.ORDER_COUNT,
+        entity_type=MilestoneEntityType.ORDER,
+        entity_id=event["order_id"],
+        current_count=event["total_orders"],
+        description="🎉 A new order milestone has been reached!",
+        title="Order milestone",
+        milestone_type="order_count"
+    )
+
+    # Warehouse-specific order count milestone (notifies warehouse manager)
+    wh_orders_count = event.get("warehouse_orders")
+    if event.get("warehouse_id") and get_next_milestone(wh_orders_count) is not None:
+        wh_name = _warehouse_name(db, event["warehouse_id"])
+        check_and_create_milestone(
+            db,
+            event_type=MilestoneEventType.ORDER_COUNT,
+            entity_type=MilestoneEntityType.WAREHOUSE,
+            entity_id=event["warehouse_id"],
+            current_count=wh_orders_count,
+            description=f"🎉 {wh_name} reached {wh_orders_count} orders!",
+            title=f"{wh_name} Order Milestone",
+            milestone_type="warehouse_order_count",
+            warehouse_id=event["warehouse_id"],
+        )
+
+    # Customer order count milestone
+    customer_orders_count = event["customer_orders"]
+    check_and_create_milestone(
+        db,
+        event_type=MilestoneEventType.CUSTOMER_ORDER_COUNT,
+        entity_type=MilestoneEntityType.CUSTOMER,
+        entity_id=event["customer_id"],
+        current_count=customer_orders_count,
+        user_id=event["customer_id"],
+        description=f"🎉 Customer {event['customer_id']} placed their {customer_orders_count}th order!",
+    )
+
+
+def on_product_created(db: Session, event: dict) -> None:
+    # System-level product count milestone (reuse VENDOR_COUNT event type to avoid enum change)
+    total_products = event["total_products"]
+    check_and_create_milestone(
+        db,
+        event_type=MilestoneEventType.VENDOR_COUNT,
+        entity_type=MilestoneEntityType.SYSTEM,
+        entity_id=event["product_id"],
+        current_count=total_products,
+        description=f"📦 Platform now has {total_products} products!",
+        title="Product Milestone",
+        milestone_type="product_count",
+    )
+
+    # Vendor-level product count milestone
+    vendor_products = event.get("vendor_products")
+    if event.get("vendor_id") and get_next_milestone(vendor_products) is not None:
+        vendor_name = _vendor_name(db, event["vendor_id"])
+        check_and_create_milestone(
+            db,
+            event_type=MilestoneEventType.VENDOR_COUNT,
+            entity_type=MilestoneEntityType.VENDOR,
+            entity_id=event["vendor_id"],
+            current_count=vendor_products,
+            description=f"📦 {vendor_name} now lists {vendor_products} products!",
+            title=f"{vendor_name} Product Milestone",
+            milestone_type="vendor_product_count",
+        )
+
+
+def on_store_created(db: Session, event: dict) -> None:
+    # System-level store count milestone (reuse VENDOR_COUNT event type)
+    total_stores = event["total_stores"]
+    check_and_create_milestone(
+        db,
+        event_type=MilestoneEventType.VENDOR_COUNT,
+        entity_type=MilestoneEntityType.SYSTEM,
+        entity_id=event["store_id"],
+        current_count=total_stores,
+        description=f"🎉 Hurray! {total_stores} stores strong and still growing!",
+        title="Store Milestone",
+        milestone_type="store_count"
+    )
+
+    # Vendor-scoped store count milestone
+    vendor_store_count = event.get("vendor_stores")
+    if event.get("vendor_id") and get_next_milestone(vendor_store_count) is not None:
+        vendor_name = _vendor_name(db, event["vendor_id"])
+        check_and_create_milestone(
+            db,
+            event_type=MilestoneEventType.VENDOR_COUNT,
+            entity_type=MilestoneEntityType.VENDOR,
+            entity_id=event["vendor_id"],
+            current_count=vendor_store_count,
+            description=f"🏪 {vendor_name} now has {vendor_store_count} stores!",
+            title=f"{vendor_name} Store Milestone",
+            milestone_type="vendor_store_count",
+        )
+
+
+def on_vendor_created(db: Session, event: dict) -> None:
+    total_vendors = event["total_vendors"]
+    check_and_create_milestone(
+        db,
+        event_type=MilestoneEventType.VENDOR_COUNT,
+        entity_type=MilestoneEntityType.VENDOR,
+        entity_id=event["vendor_id"],
+        current_count=total_vendors,
+        description=f"🎉 We have just welcomed our {total_vendors}th vendor to the platform!",
+        title="Vendor Milestone",
+        milestone_type="vendor_count",
+    )
+
+
+def on_user_created(db: Session, event: dict) -> None:
+    # System-level user count milestone
+    check_and_create_milestone(
+        db,
+        event_type=MilestoneEventType.CUSTOMER_COUNT,
+        entity_type=MilestoneEntityType.CUSTOMER,
+        entity_id=event["user_id"],
+        current_count=event["total_users"],
+        description="🎉 A new system-wide user milestone has been reached!",
+        title="System User Registration Milestone",
+        milestone_type="customer_count"
+    )
+
+    # Warehouse-level user count milestone
+    warehouse_user_count = event.get("warehouse_users")
+    if event.get("warehouse_id") and get_next_milestone(warehouse_user_count) is not None:
+        wh_name = _warehouse_name(db, event["warehouse_id"])
+        check_and_create_milestone(
+            db,
+            event_type=MilestoneEventType.CUSTOMER_COUNT,
+            entity_type=MilestoneEntityType.CUSTOMER,
+            entity_id=event["warehouse_id"],
+            current_count=warehouse_user_count,
+            description=f"🎉 {wh_name} reached {warehouse_user_count} users!",
+            title=f"{wh_name} User Milestone",
+            milestone_type="warehouse_user_count",
+            warehouse_id=event["warehouse_id"]
+        )
+
+
+def on_customer_created(db: Session, event: dict) -> None:
+    total_customers = event["total_customers"]
+    check_and_create_milestone(
+        db,
+        event_type=MilestoneEventType.CUSTOMER_COUNT,
+        entity_type=MilestoneEntityType.SYSTEM,
+        entity_id=None,
+        current_count=total_customers,
+        description=f"🎉 The {total_customers}th customer has joined the platform!",
+    )
+
+
+def on_warehouse_created(db: Session, event: dict) -> None:
+    # A milestone for every warehouse addition
+    check_and_create_milestone(
+        db,
+        event_type=MilestoneEventType.WAREHOUSE_CREATED,
+        entity_type=MilestoneEntityType.SYSTEM,
+        entity_id=event["warehouse_id"],
+        current_count=1,
+        description="🏗️ A new warehouse has been added to the eco-system! 🏢",
+        title="Warehouse creation milestone",
+        milestone_type="warehouse_creation"
+    )
+
+
+outbox.register("order.created", on_order_created)
+outbox.register("product.created", on_product_created)
+outbox.register("store.created", on_store_created)
+outbox.register("vendor.created", on_vendor_created)
+outbox.register("user.created", on_user_created)
+outbox.register("customer.created", on_customer_created)
+outbox.register("warehouse.created", on_warehouse_created)
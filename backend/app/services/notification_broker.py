@@ -0,0 +1,97 @@
+"""
+In-process fan-out of notification events to open streams.
+
+``GET /notifications/me/stream`` subscribes a per-connection asyncio queue for the
+caller's user id. Writers (``CRUDNotification``) queue a Postgres NOTIFY on
+``NOTIFICATION_STREAM_CHANNEL`` in their transaction; every worker's
+``pg_listener`` hands the payload to ``broker.publish``, which delivers it to that
+worker's subscribers for the user. Idle streams cost no queries, only a keepalive
+comment every ``NOTIFICATION_STREAM_KEEPALIVE_SECONDS``.
+
+Events are dicts with ``event`` (``notification`` or ``unread``), ``user_id`` and
+``unread``; ``notification`` events also carry the new notification.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.pg_listener import notify, pg_listener
+
+log = logging.getLogger(__name__)
+
+_Subscriber = Tuple[asyncio.AbstractEventLoop, "asyncio.Queue[Dict[str, Any]]"]
+
+
+def _put(q: "asyncio.Queue[Dict[str, Any]]", event: Dict[str, Any]) -> None:
+    if q.full():
+        # Keep the newest events; the latest unread count wins anyway
+        q.get_nowait()
+    q.put_nowait(event)
+
+
+class NotificationBroker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, Set[_Subscriber]] = {}
+
+    @contextmanager
+    def subscribe(self, user_id) -> Iterator["asyncio.Queue[Dict[str, Any]]"]:
+        """Register a queue for ``user_id`` on the running event loop for the ``with`` block."""
+        sub: _Subscriber = (
+            asyncio.get_running_loop(),
+            asyncio.Queue(maxsize=max(1, settings.NOTIFICATION_STREAM_QUEUE_SIZE)),
+        )
+        key = str(user_id)
+        with self._lock:
+            self._subscribers.setdefault(key, set()).add(sub)
+        try:
+            yield sub[1]
+        finally:
+            with self._lock:
+                subs = self._subscribers.get(key)
+                if subs is not None:
+                    subs.discard(sub)
+                    if not subs:
+                        self._subscribers.pop(key, None)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(subs) for subs in self._subscribers.values())
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        """Deliver ``event`` to the streams of ``event['user_id']`` (callable from any thread)."""
+        with self._lock:
+            subs = list(self._subscribers.get(str(event.get("user_id")), ()))
+        for loop, q in subs:
+            try:
+                loop.call_soon_threadsafe(_put, q, event)
+            except RuntimeError:
+                # Loop already closed; the stream is going away
+                pass
+
+    def _on_notify(self, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            log.warning("notification_broker: ignoring malformed payload")
+            return
+        self.publish(event)
+
+    def emit(self, db: Session, event: Dict[str, Any]) -> None:
+        """Queue ``event`` for every worker's streams once ``db`` commits."""
+        if settings.NOTIFICATION_STREAM_CHANNEL:
+            notify(db, settings.NOTIFICATION_STREAM_CHANNEL, json.dumps(event, default=str))
+
+
+broker = NotificationBroker()
+
+if settings.NOTIFICATION_STREAM_CHANNEL:
+    pg_listener.subscribe(settings.NOTIFICATION_STREAM_CHANNEL, broker._on_notify)
@@ -0,0 +1,162 @@
+"""
+Transactional outbox for side effects of domain writes.
+
+Create paths call ``outbox.publish(db, event_type, payload)`` before committing,
+so the event is stored if and only if the business write commits. Handlers are
+registered per event type with ``outbox.register`` (see
+``app.services.milestone_service``) and run by ``OutboxDispatcher``, a background
+thread started with the app.
+
+The dispatcher claims up to ``OUTBOX_BATCH_SIZE`` due events with
+``FOR UPDATE SKIP LOCKED``, so several workers can run it without handling an
+event twice. A batch is one transaction: each handler gets a session bound to it
+that turns its commits into savepoints, and a handled event is deleted in the same
+transaction as the handler's writes. Each handler runs inside one outer savepoint,
+so a failing handler rolls back everything it wrote (including milestones it
+already "committed"); the event is retried with exponential backoff until
+``OUTBOX_MAX_ATTEMPTS``. ``bind`` overrides the engine (tests point it at theirs).
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.outbox_event import OutboxEvent
+
+log = logging.getLogger(__name__)
+
+Handler = Callable[[Session, Dict[str, Any]], None]
+
+_MAX_BACKOFF_SECONDS = 300
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+class OutboxDispatcher:
+    def __init__(self, bind=None):
+        self.bind = bind
+        self._handlers: Dict[str, Handler] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.handled = 0
+        self.failed = 0
+
+    def register(self, event_type: str, handler: Handler) -> None:
+        self._handlers[event_type] = handler
+
+    def publish(self, db: Session, event_type: str, payload: Dict[str, Any]) -> None:
+        """Add an event to ``db``'s transaction (the caller commits)."""
+        now = datetime.utcnow()
+        db.execute(insert(OutboxEvent).values(
+            event_type=event_type,
+            payload=_jsonable(payload),
+            created_at=now,
+            available_at=now,
+            attempts=0,
+        ))
+
+    def _claim_stmt(self):
+        return (
+            select(OutboxEvent.id, OutboxEvent.event_type, OutboxEvent.payload, OutboxEvent.attempts)
+            .where(
+                OutboxEvent.available_at <= datetime.utcnow(),
+                OutboxEvent.attempts < settings.OUTBOX_MAX_ATTEMPTS,
+            )
+            .order_by(OutboxEvent.id)
+            .limit(settings.OUTBOX_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+
+    def _handle(self, conn, event) -> bool:
+        handler = self._handlers.get(event.event_type)
+        # The session's commits only release inner savepoints; this one spans the whole handler
+        savepoint = conn.begin_nested()
+        db = Session(bind=conn, join_transaction_mode="create_savepoint")
+        try:
+            if handler is None:
+                raise LookupError(f"no handler registered for {event.event_type!r}")
+            handler(db, event.payload or {})
+            db.commit()
+            savepoint.commit()
+            return True
+        except Exception as e:
+            db.rollback()
+            if savepoint.is_active:
+                savepoint.rollback()
+            attempts = event.attempts + 1
+            log.exception("outbox: event %s (%s) failed, attempt %d", event.id, event.event_type, attempts)
+            conn.execute(
+                update(OutboxEvent)
+                .where(OutboxEvent.id == event.id)
+                .values(
+                    attempts=attempts,
+                    last_error=str(e)[:2000],
+                    available_at=datetime.utcnow() + timedelta(seconds=min(2 ** attempts, _MAX_BACKOFF_SECONDS)),
+                )
+            )
+            return False
+        finally:
+            db.close()
+
+    def dispatch_batch(self) -> int:
+        """Handle one batch of due events; returns how many were claimed."""
+        bind = self.bind
+        if bind is None:
+            from app.db.session import engine as bind
+
+        with bind.connect() as conn:
+            with conn.begin():
+                events = conn.execute(self._claim_stmt()).all()
+                done = [event.id for event in events if self._handle(conn, event)]
+                if done:
+                    conn.execute(delete(OutboxEvent).where(OutboxEvent.id.in_(done)))
+        self.handled += len(done)
+        self.failed += len(events) - len(done)
+        return len(events)
+
+    def _run(self) -> None:
+        interval = max(0.01, settings.OUTBOX_POLL_INTERVAL_MS / 1000.0)
+        while not self._stop.is_set():
+            try:
+                claimed = self.dispatch_batch()
+            except Exception:
+                log.exception("outbox: dispatch failed")
+                claimed = 0
+            # Keep draining while batches come back full
+            if claimed < settings.OUTBOX_BATCH_SIZE:
+                self._stop.wait(interval)
+
+    def start(self) -> None:
+        if self._thread is not None or not settings.OUTBOX_DISPATCHER_ENABLED:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="outbox-dispatcher", daemon=True)
+                self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+
+
+outbox = OutboxDispatcher()
+atexit.register(outbox.stop)
@@ -0,0 +1,73 @@
+"""
+Bulk materialization of a rack's stacks x bins_per_stack bin grid.
+
+Reads the rack's existing coordinates and the warehouse config once, builds every
+missing bin code in memory and inserts the rows with multi-row INSERT statements
+inside the caller's transaction, instead of one lookup + commit per cell.
+"""
+from __future__ import annotations
+
+import logging
+import time
+import uuid
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.bin import Bin
+from app.models.rack import Rack
+from app.services.bin_code import bin_code_prefix, format_bin_code
+from app.services.free_bin_index import free_bins
+from app.services.rack_occupancy import occupancy
+
+log = logging.getLogger(__name__)
+
+# Keeps each INSERT well under Postgres' 65535 bind-parameter limit (7 params per row)
+INSERT_CHUNK_ROWS = 5000
+
+
+def materialize_rack_grid(db: Session, rack: Rack, *, commit: bool = True) -> dict:
+    """Create any missing Bin rows for ``rack`` and return a summary.
+
+    With ``commit=False`` the rows are only flushed, so callers can create the
+    rack and its grid in a single transaction.
+    """
+    started = time.perf_counter()
+    existing = {
+        (int(s), int(b))
+        for s, b in db.query(Bin.stack_index, Bin.bin_index).filter(Bin.rack_id == rack.id)
+    }
+    stacks = int(rack.stacks or 0)
+    bps = int(rack.bins_per_stack or 0)
+    prefix = bin_code_prefix(db, rack)
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "rack_id": rack.id,
+            "stack_index": s,
+            "bin_index": b,
+            "code": format_bin_code(prefix, s, b),
+            "status": "empty",
+            "quantity": 0,
+        }
+        for s in range(stacks)
+        for b in range(bps)
+        if (s, b) not in existing
+    ]
+    for i in range(0, len(rows), INSERT_CHUNK_ROWS):
+        db.execute(insert(Bin).values(rows[i:i + INSERT_CHUNK_ROWS]))
+    if commit:
+        db.commit()
+    if rows:
+        free_bins.invalidate(rack.warehouse_id)
+        occupancy.mark_dirty([rack.id])
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+    log.info("materialize_rack_grid: rack=%s created=%d in %.2fms", rack.id, len(rows), elapsed_ms)
+    return {
+        "rack_id": str(rack.id),
+        "rack_name": rack.name,
+        "expected": stacks * bps,
+        "existing": len(existing),
+        "created": len(rows),
+        "elapsed_ms": elapsed_ms,
+    }
@@ -0,0 +1,143 @@
+"""
+Rack occupancy counts (occupied / reserved / blocked / maintenance / empty).
+
+``rack_bin_counts`` computes the counts for any number of racks with a single
+``GROUP BY rack_id`` query. ``OccupancyRollup`` optionally keeps those counts per
+warehouse in memory (``RACK_OCCUPANCY_ROLLUP_ENABLED``) so listing a warehouse's
+racks does not touch ``bins`` at all.
+
+The rollup is kept current incrementally: a session listener records which racks
+had Bin rows inserted, updated or deleted and, once the transaction commits, only
+those racks are recounted on the next read. Bulk Core statements bypass the ORM
+unit of work, so their callers call ``occupancy.mark_dirty`` themselves. Entries
+also expire after ``RACK_OCCUPANCY_ROLLUP_TTL_SECONDS`` to pick up writes made by
+other processes.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import event, func, inspect, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.bin import Bin
+
+log = logging.getLogger(__name__)
+
+# A bin counts as occupied when it is not empty or physically holds a crate
+OCCUPIED_STATUSES = ('occupied', 'reserved', 'blocked', 'maintenance')
+
+_DIRTY_KEY = 'rack_occupancy_dirty'
+
+
+def _zero() -> Dict[str, int]:
+    return {'occupied': 0, 'reserved': 0, 'blocked': 0, 'maintenance': 0, 'empty': 0}
+
+
+def rack_bin_counts(db: Session, rack_ids: Iterable[Any]) -> Dict[Any, Dict[str, int]]:
+    """Return ``{rack_id: counts}`` for ``rack_ids`` using one grouped query."""
+    ids = list(rack_ids)
+    if not ids:
+        return {}
+    rows = (
+        db.query(
+            Bin.rack_id,
+            func.count(Bin.id).filter(
+                or_(Bin.status.in_(OCCUPIED_STATUSES), Bin.crate_id.isnot(None))
+            ),
+            func.count(Bin.id).filter(Bin.status == 'reserved'),
+            func.count(Bin.id).filter(Bin.status == 'blocked'),
+            func.count(Bin.id).filter(Bin.status == 'maintenance'),
+            func.count(Bin.id).filter(Bin.status == 'empty'),
+        )
+        .filter(Bin.rack_id.in_(ids))
+        .group_by(Bin.rack_id)
+        .all()
+    )
+    out = {rid: _zero() for rid in ids}
+    for rack_id, occupied, reserved, blocked, maintenance, empty in rows:
+        out[rack_id] = {
+            'occupied': int(occupied or 0),
+            'reserved': int(reserved or 0),
+            'blocked': int(blocked or 0),
+            'maintenance': int(maintenance or 0),
+            'empty': int(empty or 0),
+        }
+    return out
+
+
+class OccupancyRollup:
+    """Process-wide per-warehouse cache of rack occupancy counts."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        # str(warehouse_id) -> (loaded_at, {rack_id: counts})
+        self._warehouses: Dict[str, tuple] = {}
+
+    def counts_for(self, db: Session, warehouse_id, rack_ids: List[Any]) -> Dict[Any, Dict[str, int]]:
+        """Counts for ``rack_ids`` in ``warehouse_id``, recounting only missing/stale racks."""
+        if not settings.RACK_OCCUPANCY_ROLLUP_ENABLED:
+            return rack_bin_counts(db, rack_ids)
+        key = str(warehouse_id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._warehouses.get(key)
+            if entry is None or now - entry[0] > settings.RACK_OCCUPANCY_ROLLUP_TTL_SECONDS:
+                entry = (now, {})
+                self._warehouses[key] = entry
+            cached = entry[1]
+            missing = [rid for rid in rack_ids if rid not in cached]
+        if missing:
+            fresh = rack_bin_counts(db, missing)
+            with self._lock:
+                cached.update(fresh)
+            log.debug("rack_occupancy: warehouse=%s recounted=%d", warehouse_id, len(missing))
+        return {rid: cached.get(rid, _zero()) for rid in rack_ids}
+
+    def mark_dirty(self, rack_ids: Iterable[Any]) -> None:
+        """Drop cached counts for ``rack_ids`` so they are recounted on next read."""
+        ids = set(rack_ids)
+        if not ids:
+            return
+        with self._lock:
+            for _, cached in self._warehouses.values():
+                for rid in ids:
+                    cached.pop(rid, None)
+
+    def invalidate(self, warehouse_id=None) -> None:
+        with self._lock:
+            if warehouse_id is None:
+                self._warehouses.clear()
+            else:
+                self._warehouses.pop(str(warehouse_id), None)
+
+
+occupancy = OccupancyRollup()
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_dirty_racks(session: Session, flush_context) -> None:
+    racks: Set[Any] = session.info.setdefault(_DIRTY_KEY, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if not isinstance(obj, Bin):
+            continue
+        if obj.rack_id is not None:
+            racks.add(obj.rack_id)
+        # A bin moved to another rack also changes the counts of its old rack
+        racks.update(r for r in inspect(obj).attrs.rack_id.history.deleted if r is not None)
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_dirty_racks(session: Session) -> None:
+    racks: Optional[Set[Any]] = session.info.pop(_DIRTY_KEY, None)
+    if racks:
+        occupancy.mark_dirty(racks)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_dirty_racks(session: Session) -> None:
+    session.info.pop(_DIRTY_KEY, None)
@@ -0,0 +1,174 @@
+"""
+Leased per-warehouse sequence allocator for crate, rack and receipt numbers.
+
+Counters live in ``warehouse_sequences`` (one row per warehouse and kind) rather
+than inside the WarehouseConfig JSON blob. A process reserves a range of numbers
+with a single ``UPDATE ... RETURNING`` committed on a connection from a small
+dedicated pool (``SEQUENCE_LEASE_POOL_SIZE``), so the row lock is held for one
+statement instead of for the caller's whole transaction, leases never compete with
+requests for the main pool, and the caller's transaction is left alone. Numbers
+are then handed out of that range from memory; ``take(..., count=500)`` costs one
+round trip.
+
+Raising a counter from the warehouse config (``sync_from_config``) publishes a
+NOTIFY on ``SEQUENCE_INVALIDATION_CHANNEL`` so every worker drops its leases for
+that warehouse once the change commits.
+
+Trade-off: numbers leased by a process that exits are skipped, and codes from
+different processes interleave. Set ``SEQUENCE_LEASE_SIZE=1`` for gap-free codes.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.pg_listener import notify, pg_listener
+
+log = logging.getLogger(__name__)
+
+# kind -> (max value before wrapping to 1, WarehouseConfig.data key)
+KINDS: Dict[str, Tuple[int, str]] = {
+    'crate': (9999, 'nextCrateSeq'),
+    'rack': (999, 'nextRackSeq'),
+    'receipt': (999999, 'nextReceiptSeq'),
+}
+
+_LEASE_SQL = text(
+    """
+    UPDATE warehouse_sequences
+    SET next_value = ((next_value - 1 + :n) % max_value) + 1
+    WHERE warehouse_id = :wid AND kind = :kind
+    RETURNING next_value, max_value
+    """
+)
+
+_SEED_SQL = text(
+    """
+    INSERT INTO warehouse_sequences (warehouse_id, kind, next_value, max_value)
+    SELECT :wid, :kind, :start, :max_value
+    WHERE EXISTS (SELECT 1 FROM warehouse_configs WHERE warehouse_id = :wid)
+    ON CONFLICT (warehouse_id, kind) DO NOTHING
+    """
+)
+
+
+def _clamp(val, max_value: int) -> int:
+    try:
+        v = int(val) if val is not None else 1
+    except Exception:
+        v = 1
+    return v if 1 <= v <= max_value else 1
+
+
+class SequenceAllocator:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._leased: Dict[Tuple[str, str], Deque[int]] = {}
+        self._engines: Dict[str, Engine] = {}
+
+    def _lease_engine(self, db: Session) -> Engine:
+        """Small pool on the same database as ``db`` (tests bind their own)."""
+        url = db.get_bind().url
+        key = url.render_as_string(hide_password=False)
+        engine = self._engines.get(key)
+        if engine is None:
+            engine = self._engines[key] = create_engine(
+                url,
+                pool_size=max(1, settings.SEQUENCE_LEASE_POOL_SIZE),
+                max_overflow=0,
+                pool_pre_ping=True,
+                connect_args={"options": f"-c lock_timeout={max(0, settings.SEQUENCE_LEASE_LOCK_TIMEOUT_MS)}"},
+            )
+        return engine
+
+    def _lease_size(self, max_value: int) -> int:
+        return max(1, min(int(settings.SEQUENCE_LEASE_SIZE), max_value // 100))
+
+    def _lease(self, db: Session, warehouse_id, kind: str, n: int) -> List[int]:
+        """Reserve ``n`` consecutive values in an autonomous transaction."""
+        max_value, cfg_key = KINDS[kind]
+        params = {"wid": str(warehouse_id), "kind": kind, "n": n}
+        # Committed immediately on the lease pool, independent of the caller's transaction
+        with self._lease_engine(db).begin() as conn:
+            row = conn.execute(_LEASE_SQL, params).first()
+            if row is None:
+                data = conn.execute(
+                    text("SELECT data FROM warehouse_configs WHERE warehouse_id = :wid"), params
+                ).scalar()
+                if data is None:
+                    raise HTTPException(status_code=400, detail="Warehouse configuration missing. Please set it up in System Configuration.")
+                conn.execute(_SEED_SQL, {**params, "start": _clamp(data.get(cfg_key), max_value), "max_value": max_value})
+                row = conn.execute(_LEASE_SQL, params).first()
+        new_next, max_value = int(row[0]), int(row[1])
+        start = ((new_next - 1 - n) % max_value) + 1
+        return [((start - 1 + i) % max_value) + 1 for i in range(n)]
+
+    def take(self, db: Session, warehouse_id, kind: str, count: int = 1) -> List[int]:
+        """Return ``count`` sequence numbers for ``warehouse_id``/``kind``."""
+        if count <= 0:
+            return []
+        key = (str(warehouse_id), kind)
+        with self._lock:
+            pool = self._leased.setdefault(key, deque())
+            out = [pool.popleft() for _ in range(min(count, len(pool)))]
+            missing = count - len(out)
+            if missing:
+                lease = self._lease(db, warehouse_id, kind, max(missing, self._lease_size(KINDS[kind][0])))
+                out.extend(lease[:missing])
+                pool.extend(lease[missing:])
+        return out
+
+    def current(self, db: Session, warehouse_id) -> Dict[str, int]:
+        """Next unleased value per kind, keyed like WarehouseConfig.data (``nextCrateSeq``...)."""
+        rows = db.execute(
+            text("SELECT kind, next_value FROM warehouse_sequences WHERE warehouse_id = :wid"),
+            {"wid": str(warehouse_id)},
+        ).all()
+        return {KINDS[kind][1]: int(value) for kind, value in rows if kind in KINDS}
+
+    def sync_from_config(self, db: Session, warehouse_id, data: dict) -> None:
+        """Raise counters to the next*Seq values in ``data`` (never lowers them).
+
+        Runs in the caller's transaction and drops this process's unused leases; other
+        workers drop theirs when the invalidation NOTIFY arrives after the commit.
+        """
+        for kind, (max_value, cfg_key) in KINDS.items():
+            if data.get(cfg_key) is None:
+                continue
+            db.execute(
+                text(
+                    """
+                    INSERT INTO warehouse_sequences (warehouse_id, kind, next_value, max_value)
+                    VALUES (:wid, :kind, :start, :max_value)
+                    ON CONFLICT (warehouse_id, kind)
+                    DO UPDATE SET next_value = GREATEST(warehouse_sequences.next_value, EXCLUDED.next_value)
+                    """
+                ),
+                {"wid": str(warehouse_id), "kind": kind, "start": _clamp(data.get(cfg_key), max_value), "max_value": max_value},
+            )
+        self.invalidate(warehouse_id)
+        if settings.SEQUENCE_INVALIDATION_CHANNEL:
+            notify(db, settings.SEQUENCE_INVALIDATION_CHANNEL, str(warehouse_id))
+
+    def invalidate(self, warehouse_id: Optional[object] = None) -> None:
+        with self._lock:
+            if warehouse_id is None:
+                self._leased.clear()
+                return
+            for key in [k for k in self._leased if k[0] == str(warehouse_id)]:
+                self._leased.pop(key, None)
+
+
+sequences = SequenceAllocator()
+
+if settings.SEQUENCE_INVALIDATION_CHANNEL:
+    # Payload is a warehouse id
+    pg_listener.subscribe(settings.SEQUENCE_INVALIDATION_CHANNEL, lambda payload: sequences.invalidate(payload or None))
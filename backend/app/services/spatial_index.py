@@ -0,0 +1,258 @@
+"""
+Radius and nearest-neighbour lookups for stores, warehouses and communities.
+
+``SpatialIndex`` keeps, per kind, the coordinates of every row that has them in
+NumPy arrays bucketed into a grid of ``SPATIAL_INDEX_CELL_DEGREES`` cells. A radius
+query visits only the cells overlapping the search bounding box and computes
+haversine distances for those candidates in one vectorized pass; ``nearest``
+widens the radius until it has enough hits. Sorting and filtering never hydrate
+ORM objects, so callers load only the rows they return.
+
+A kind is reloaded on the next read after a commit that inserted, deleted or moved
+one of its rows (session listeners below), and after ``SPATIAL_INDEX_TTL_SECONDS``
+to pick up writes made by other processes. With ``SPATIAL_INDEX_ENABLED`` off,
+lookups prefilter in SQL on the indexed ``(latitude, longitude)`` bounding box and
+rank the candidates the same way.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import and_, event, inspect, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.community import Community
+from app.models.store import Store
+from app.models.warehouse import Warehouse
+
+log = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0
+_KM_PER_DEG_LAT = EARTH_RADIUS_KM * math.pi / 180.0
+_HALF_CIRCUMFERENCE_KM = EARTH_RADIUS_KM * math.pi
+
+# kind -> (model, attributes callers may filter on)
+SOURCES: Dict[str, Tuple[Any, Tuple[str, ...]]] = {
+    "store": (Store, ("vendor_id",)),
+    "warehouse": (Warehouse, ()),
+    "community": (Community, ("warehouse_id",)),
+}
+_KIND_BY_MODEL = {model: kind for kind, (model, _) in SOURCES.items()}
+
+_DIRTY_KEY = 'spatial_index_dirty'
+
+Hit = Tuple[Any, float]  # (row id, distance in km)
+
+
+def haversine_km(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Great-circle distances in km from ``(lat, lon)`` to each point."""
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> Tuple[float, float, List[Tuple[float, float]]]:
+    """``(min_lat, max_lat, lon_ranges)`` enclosing the circle; ranges split at the antimeridian."""
+    dlat = radius_km / _KM_PER_DEG_LAT
+    min_lat, max_lat = lat - dlat, lat + dlat
+    cos_lat = math.cos(math.radians(lat))
+    if min_lat <= -90 or max_lat >= 90 or cos_lat < 1e-6 or dlat / cos_lat >= 180:
+        # A pole is inside the circle (or it is huge): every longitude qualifies
+        return max(min_lat, -90.0), min(max_lat, 90.0), [(-180.0, 180.0)]
+    dlon = dlat / cos_lat
+    west, east = lon - dlon, lon + dlon
+    if west < -180:
+        return min_lat, max_lat, [(west + 360, 180.0), (-180.0, east)]
+    if east > 180:
+        return min_lat, max_lat, [(west, 180.0), (-180.0, east - 360)]
+    return min_lat, max_lat, [(west, east)]
+
+
+def _rank(ids: List[Any], lats: np.ndarray, lons: np.ndarray, lat: float, lon: float,
+          radius_km: float, limit: Optional[int]) -> List[Hit]:
+    if not len(ids):
+        return []
+    dist = haversine_km(lat, lon, lats, lons)
+    inside = np.flatnonzero(dist <= radius_km)
+    order = inside[np.argsort(dist[inside], kind="stable")]
+    if limit is not None:
+        order = order[:limit]
+    return [(ids[i], float(dist[i])) for i in order]
+
+
+@dataclass
+class _Grid:
+    loaded_at: float
+    cell: float
+    ids: List[Any] = field(default_factory=list)
+    lats: np.ndarray = field(default_factory=lambda: np.empty(0))
+    lons: np.ndarray = field(default_factory=lambda: np.empty(0))
+    attrs: Dict[str, np.ndarray] = field(default_factory=dict)
+    cells: Dict[Tuple[int, int], np.ndarray] = field(default_factory=dict)
+
+    def _cell_of(self, lat, lon):
+        return np.floor((lat + 90.0) / self.cell).astype(np.int64), np.floor((lon + 180.0) / self.cell).astype(np.int64)
+
+    def build_cells(self) -> None:
+        if not len(self.ids):
+            return
+        ci, cj = self._cell_of(self.lats, self.lons)
+        buckets: Dict[Tuple[int, int], List[int]] = {}
+        for n, key in enumerate(zip(ci.tolist(), cj.tolist())):
+            buckets.setdefault(key, []).append(n)
+        self.cells = {key: np.asarray(idx, dtype=np.int64) for key, idx in buckets.items()}
+
+    def candidates(self, lat: float, lon: float, radius_km: float) -> np.ndarray:
+        min_lat, max_lat, lon_ranges = bounding_box(lat, lon, radius_km)
+        i0, i1 = (int(math.floor((v + 90.0) / self.cell)) for v in (min_lat, max_lat))
+        spans = [tuple(int(math.floor((v + 180.0) / self.cell)) for v in (w, e)) for w, e in lon_ranges]
+        n_cells = (i1 - i0 + 1) * sum(j1 - j0 + 1 for j0, j1 in spans)
+        if n_cells >= len(self.cells):
+            keys = [k for k in self.cells if i0 <= k[0] <= i1 and any(j0 <= k[1] <= j1 for j0, j1 in spans)]
+        else:
+            keys = [(i, j) for i in range(i0, i1 + 1) for j0, j1 in spans for j in range(j0, j1 + 1) if (i, j) in self.cells]
+        if not keys:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([self.cells[k] for k in keys])
+
+
+class SpatialIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._grids: Dict[str, _Grid] = {}
+
+    @staticmethod
+    def _load(db: Session, kind: str) -> _Grid:
+        model, attr_names = SOURCES[kind]
+        cols = [model.id, model.latitude, model.longitude] + [getattr(model, a) for a in attr_names]
+        rows = db.execute(
+            select(*cols).where(model.latitude.isnot(None), model.longitude.isnot(None))
+        ).all()
+        grid = _Grid(loaded_at=time.monotonic(), cell=max(0.01, float(settings.SPATIAL_INDEX_CELL_DEGREES)))
+        grid.ids = [r[0] for r in rows]
+        grid.lats = np.fromiter((float(r[1]) for r in rows), dtype=np.float64, count=len(rows))
+        grid.lons = np.fromiter((float(r[2]) for r in rows), dtype=np.float64, count=len(rows))
+        grid.attrs = {
+            name: np.array([str(r[3 + n]) if r[3 + n] is not None else "" for r in rows], dtype=object)
+            for n, name in enumerate(attr_names)
+        }
+        grid.build_cells()
+        log.debug("spatial_index: loaded %d %s points", len(rows), kind)
+        return grid
+
+    def _grid(self, db: Session, kind: str) -> _Grid:
+        with self._lock:
+            grid = self._grids.get(kind)
+        if grid is None or time.monotonic() - grid.loaded_at > settings.SPATIAL_INDEX_TTL_SECONDS:
+            grid = self._load(db, kind)
+            with self._lock:
+                self._grids[kind] = grid
+        return grid
+
+    @staticmethod
+    def _filter(grid: _Grid, idx: np.ndarray, filters: Dict[str, Any]) -> np.ndarray:
+        for name, value in filters.items():
+            if value is None:
+                continue
+            if name == "id":
+                wanted = str(value)
+                idx = np.asarray([i for i in idx if str(grid.ids[i]) == wanted], dtype=np.int64)
+            else:
+                idx = idx[grid.attrs[name][idx] == str(value)]
+        return idx
+
+    def _sql_nearby(self, db: Session, kind: str, lat: float, lon: float, radius_km: float,
+                    filters: Dict[str, Any], limit: Optional[int]) -> List[Hit]:
+        model, _ = SOURCES[kind]
+        min_lat, max_lat, lon_ranges = bounding_box(lat, lon, radius_km)
+        stmt = select(model.id, model.latitude, model.longitude).where(
+            model.latitude.between(min_lat, max_lat),
+            or_(*(and_(model.longitude >= w, model.longitude <= e) for w, e in lon_ranges)),
+        )
+        for name, value in filters.items():
+            if value is not None:
+                stmt = stmt.where(getattr(model, name) == value)
+        rows = db.execute(stmt).all()
+        lats = np.fromiter((float(r[1]) for r in rows), dtype=np.float64, count=len(rows))
+        lons = np.fromiter((float(r[2]) for r in rows), dtype=np.float64, count=len(rows))
+        return _rank([r[0] for r in rows], lats, lons, lat, lon, radius_km, limit)
+
+    def nearby(self, db: Session, kind: str, lat: float, lon: float, radius_km: float, *,
+               limit: Optional[int] = None, **filters) -> List[Hit]:
+        """``(id, distance_km)`` of ``kind`` rows within ``radius_km``, nearest first.
+
+        ``filters`` are equality filters on ``id`` or the kind's filterable attributes.
+        """
+        if radius_km < 0:
+            return []
+        if not settings.SPATIAL_INDEX_ENABLED:
+            return self._sql_nearby(db, kind, lat, lon, radius_km, filters, limit)
+        grid = self._grid(db, kind)
+        idx = self._filter(grid, grid.candidates(lat, lon, radius_km), filters)
+        return _rank([grid.ids[i] for i in idx], grid.lats[idx], grid.lons[idx], lat, lon, radius_km, limit)
+
+    def nearest(self, db: Session, kind: str, lat: float, lon: float, k: int = 1, **filters) -> List[Hit]:
+        """The ``k`` ``kind`` rows closest to ``(lat, lon)``."""
+        radius = max(1.0, float(settings.SPATIAL_INDEX_CELL_DEGREES) * _KM_PER_DEG_LAT)
+        while True:
+            hits = self.nearby(db, kind, lat, lon, radius, limit=k, **filters)
+            # Everything within ``radius`` was seen, so k hits are the k nearest overall
+            if len(hits) >= k or radius >= _HALF_CIRCUMFERENCE_KM:
+                return hits
+            radius = min(radius * 4, _HALF_CIRCUMFERENCE_KM)
+
+    def rows(self, db: Session, kind: str, hits: List[Hit]) -> list:
+        """ORM rows for ``hits`` in hit order (one ``IN`` query)."""
+        if not hits:
+            return []
+        model, _ = SOURCES[kind]
+        by_id = {obj.id: obj for obj in db.query(model).filter(model.id.in_([h[0] for h in hits])).all()}
+        return [by_id[h[0]] for h in hits if h[0] in by_id]
+
+    def invalidate(self, kind: Optional[str] = None) -> None:
+        with self._lock:
+            if kind is None:
+                self._grids.clear()
+            else:
+                self._grids.pop(kind, None)
+
+
+spatial = SpatialIndex()
+
+
+def _moved(obj) -> bool:
+    state = inspect(obj)
+    _, attr_names = SOURCES[_KIND_BY_MODEL[type(obj)]]
+    return any(state.attrs[name].history.has_changes() for name in ("latitude", "longitude", *attr_names))
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_dirty_kinds(session: Session, flush_context) -> None:
+    kinds: Set[str] = session.info.setdefault(_DIRTY_KEY, set())
+    for obj in (*session.new, *session.deleted):
+        kind = _KIND_BY_MODEL.get(type(obj))
+        if kind is not None:
+            kinds.add(kind)
+    for obj in session.dirty:
+        kind = _KIND_BY_MODEL.get(type(obj))
+        if kind is not None and _moved(obj):
+            kinds.add(kind)
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_dirty_kinds(session: Session) -> None:
+    for kind in session.info.pop(_DIRTY_KEY, None) or ():
+        spatial.invalidate(kind)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _drop_dirty_kinds(session: Session) -> None:
+    session.info.pop(_DIRTY_KEY, None)
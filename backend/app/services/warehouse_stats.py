@@ -0,0 +1,154 @@
+"""
+Dashboard aggregates for racks/bins and inbound receipts.
+
+Each aggregate is a single scan using conditional aggregates
+(``COUNT(*) FILTER (WHERE ...)``). ``refresh_snapshots`` stores the same numbers
+per warehouse in ``warehouse_snapshots`` so dashboards can read them without
+touching ``bins`` or ``inbound_receipts``.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import distinct, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.bin import Bin
+from app.models.inbound_receipt import InboundReceipt
+from app.models.rack import Rack
+from app.models.warehouse import Warehouse
+from app.models.warehouse_snapshot import WarehouseSnapshot
+
+log = logging.getLogger(__name__)
+
+_CLOSED_RECEIPT_STATUSES = ("COMPLETED", "CANCELLED")
+KPI_KEYS = (
+    "totalReceipts", "openReceipts", "pending", "completedToday",
+    "lateArrivals", "skuReceipts", "flatReceipts", "binsAllocated",
+)
+
+
+def bin_stats(db: Session, warehouse_id) -> Dict[str, Any]:
+    """Rack and bin availability counts for one warehouse in a single query."""
+    active = Rack.status == 'active'
+    row = (
+        db.query(
+            func.count(distinct(Rack.id)),
+            func.count(distinct(Rack.id)).filter(active),
+            func.count(Bin.id),
+            func.count(Bin.id).filter(Bin.status == 'empty'),
+            func.count(Bin.id).filter(active, Bin.status == 'empty'),
+            func.count(Bin.id).filter(active, Bin.status == 'reserved'),
+            func.count(Bin.id).filter(active, Bin.status == 'occupied'),
+            func.count(Bin.id).filter(active, Bin.status == 'blocked'),
+            func.count(Bin.id).filter(active, Bin.status == 'maintenance'),
+        )
+        .select_from(Rack)
+        .outerjoin(Bin, Bin.rack_id == Rack.id)
+        .filter(Rack.warehouse_id == warehouse_id)
+        .one()
+    )
+    (total_racks, active_racks, total_bins, empty_all,
+     empty_active, reserved_active, occupied_active, blocked_active, maintenance_active) = (int(v or 0) for v in row)
+    return {
+        "warehouse_id": str(warehouse_id),
+        "racks": {"total": total_racks, "active": active_racks},
+        "bins_all_racks": {"total": total_bins, "empty": empty_all},
+        "bins_on_active_racks": {
+            "empty": empty_active,
+            "reserved": reserved_active,
+            "occupied": occupied_active,
+            "blocked": blocked_active,
+            "maintenance": maintenance_active,
+        },
+    }
+
+
+def inbound_kpis(db: Session, warehouse_id=None, today: Optional[date] = None) -> Dict[str, int]:
+    """Goods-in KPI counts in a single query, optionally for one warehouse."""
+    today = today or datetime.utcnow().date()
+    # Range bounds instead of func.date(...) so the timestamp indexes stay usable
+    day_start = datetime.combine(today, time.min)
+    day_end = day_start + timedelta(days=1)
+    is_open = ~InboundReceipt.status.in_(_CLOSED_RECEIPT_STATUSES)
+    q = db.query(
+        func.count(InboundReceipt.id),
+        func.count(InboundReceipt.id).filter(is_open),
+        func.count(InboundReceipt.id).filter(InboundReceipt.status == "AWAITING_UNLOADING"),
+        func.count(InboundReceipt.id).filter(
+            InboundReceipt.status == "COMPLETED",
+            InboundReceipt.updated_at >= day_start,
+            InboundReceipt.updated_at < day_end,
+        ),
+        # planned arrival earlier than today and still not completed/cancelled
+        func.count(InboundReceipt.id).filter(
+            InboundReceipt.planned_arrival < day_start,
+            is_open,
+        ),
+        func.count(InboundReceipt.id).filter(InboundReceipt.vendor_type == "SKU"),
+        func.count(InboundReceipt.id).filter(InboundReceipt.vendor_type == "FLAT"),
+        func.count(InboundReceipt.id).filter(InboundReceipt.status == "ALLOCATED"),
+    )
+    if warehouse_id is not None:
+        q = q.filter(InboundReceipt.warehouse_id == warehouse_id)
+    return dict(zip(KPI_KEYS, (int(v or 0) for v in q.one())))
+
+
+def snapshot_bin_stats(db: Session, warehouse_id) -> Optional[Dict[str, Any]]:
+    snap = db.query(WarehouseSnapshot).get(warehouse_id)
+    if snap is None:
+        return None
+    return {**snap.bin_stats, "refreshed_at": snap.refreshed_at.isoformat()}
+
+
+def snapshot_inbound_kpis(db: Session, warehouse_id=None, today: Optional[date] = None) -> Optional[Dict[str, int]]:
+    """Snapshot KPIs for one warehouse (or summed over all), or None when no snapshot exists.
+
+    ``completedToday`` is only taken from snapshots refreshed today.
+    """
+    today = today or datetime.utcnow().date()
+    q = db.query(WarehouseSnapshot.inbound_kpis, WarehouseSnapshot.refreshed_at)
+    if warehouse_id is not None:
+        q = q.filter(WarehouseSnapshot.warehouse_id == warehouse_id)
+    snaps = q.all()
+    if not snaps:
+        return None
+    out = dict.fromkeys(KPI_KEYS, 0)
+    for kpis, refreshed_at in snaps:
+        for key in KPI_KEYS:
+            if key == "completedToday" and refreshed_at.date() != today:
+                continue
+            out[key] += int((kpis or {}).get(key) or 0)
+    return out
+
+
+def refresh_snapshots(db: Session, warehouse_id=None) -> int:
+    """Recompute snapshots for one warehouse (or all) and upsert them. Returns the count."""
+    q = db.query(Warehouse.id)
+    if warehouse_id is not None:
+        q = q.filter(Warehouse.id == warehouse_id)
+    today = datetime.utcnow().date()
+    refreshed = 0
+    for (wid,) in q.all():
+        now = datetime.utcnow()
+        stmt = pg_insert(WarehouseSnapshot).values(
+            warehouse_id=wid,
+            bin_stats=bin_stats(db, wid),
+            inbound_kpis=inbound_kpis(db, wid, today=today),
+            refreshed_at=now,
+        )
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[WarehouseSnapshot.warehouse_id],
+            set_={
+                "bin_stats": stmt.excluded.bin_stats,
+                "inbound_kpis": stmt.excluded.inbound_kpis,
+                "refreshed_at": stmt.excluded.refreshed_at,
+            },
+        ))
+        refreshed += 1
+    db.commit()
+    log.info("warehouse_stats: refreshed %d snapshot(s)", refreshed)
+    return refreshed
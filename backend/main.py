@@ -11,8 +11,11 @@ from app.db.session import SessionLocal
 from app.crud.crud_user import user as crud_user
 from app.schemas.user import UserCreate, UserRole, UserStatus
 import logging
-from jose import jwt
-from app.core import security
+from app.core.auth_context import AuthContextMiddleware
+from app.core.pg_listener import pg_listener
+from app.services.audit_sink import audit_sink
+from app.services.outbox import outbox
+from app.services import milestone_service  # noqa: F401  registers the outbox handlers
 
 # Try to import Pydantic v2 core exceptions if available
 try:
@@ -40,6 +43,10 @@ origins = settings.BACKEND_CORS_ORIGINS or [
     "http://localhost:5173",
     "http://127.0.0.1:5173",
 ]
+# Decode the bearer token once per request (shared with the auth deps) and
+# enforce VIEWER read-only; added first so CORS headers wrap its 403s
+app.add_middleware(AuthContextMiddleware)
+
 # If wildcard requested, allow all
 allow_all = any(o == "*" for o in origins)
 app.add_middleware(
@@ -48,36 +55,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Keyset-paginated lists return the next page token in a header
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(api_router, prefix="/api/v1")
 
-# Global middleware to enforce VIEWER read-only
-@app.middleware("http")
-async def viewer_read_only_middleware(request, call_next):
-    try:
-        # Only enforce for modifying methods and API routes
-        if request.method.upper() in {"POST", "PUT", "PATCH", "DELETE"} and str(request.url.path).startswith("/api/v1"):
-            # Allow auth endpoints
-            if request.url.path.endswith("/login/access-token") or request.url.path.endswith("/login/refresh-token"):
-                return await call_next(request)
-            auth = request.headers.get("Authorization", "")
-            if auth.lower().startswith("bearer "):
-                token = auth.split(" ", 1)[1]
-                try:
-                    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[security.ALGORITHM])
-                    role = str(payload.get("role") or payload.get("rol") or "").upper()
-                    # If token doesn't include role, downstream deps will catch; be lenient here
-                    if role == "VIEWER":
-                        return JSONResponse(status_code=403, content={"detail": "VIEWER cannot modify data"})
-                except Exception:
-                    # If token invalid, let downstream auth handlers respond
-                    pass
-        return await call_next(request)
-    except Exception as e:
-        logger.exception("Middleware error: %s", e)
-        return JSONResponse(status_code=500, content={"detail": "Internal server error"})
-
 # Bootstrap superuser on startup (idempotent)
 @app.on_event("startup")
 def create_superuser_if_missing():
@@ -104,6 +87,29 @@ def create_superuser_if_missing():
     finally:
         db.close()
 
+# Shared LISTEN/NOTIFY consumer (cross-worker cache invalidation etc.)
+@app.on_event("startup")
+def start_pg_listener():
+    pg_listener.start()
+
+@app.on_event("shutdown")
+def stop_pg_listener():
+    pg_listener.stop()
+
+@app.on_event("shutdown")
+def flush_audit_sink():
+    # Write audit entries still queued by request handlers
+    audit_sink.stop()
+
+# Milestone checks published by create paths run here, off the request path
+@app.on_event("startup")
+def start_outbox_dispatcher():
+    outbox.start()
+
+@app.on_event("shutdown")
+def stop_outbox_dispatcher():
+    outbox.stop()
+
 # Custom OpenAPI schema to ensure Bearer Authentication is visible
 def custom_openapi():
     if app.openapi_schema:
@@ -1,14 +1,16 @@
 # filepath: backend/tests/conftest.py
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 import random
 import logging
 
-from app.api.deps import get_db
+from app.api.deps import get_async_db, get_db
 from app.core.config import settings
+from app.core.pg_listener import pg_listener
 from app.db.base import Base
 from main import app
 from app import crud
@@ -19,11 +21,26 @@ from app.schemas.customer import CustomerCreate
 from app.schemas.vendor import VendorCreate
 from app.schemas.warehouse import WarehouseCreate
 from app.schemas.product import ProductCreate
+from app.services.audit_sink import audit_sink
+from app.services.outbox import outbox
 from tests.utils import random_email, random_lower_string
 
 # --- Test Database Setup ---
 engine = create_engine(str(settings.TEST_DATABASE_URL), poolclass=StaticPool)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Async endpoints read the same test database; NullPool since each TestClient runs its own event loop
+async_engine = create_async_engine(
+    make_url(str(settings.TEST_DATABASE_URL)).set(drivername="postgresql+asyncpg"), poolclass=NullPool
+)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+# Audit entries go to the test database, written inline so tests can assert on them
+settings.AUDIT_ASYNC_ENABLED = False
+audit_sink.bind = engine
+# No dispatcher thread on the shared test connection; tests run outbox.dispatch_batch() themselves
+settings.OUTBOX_DISPATCHER_ENABLED = False
+outbox.bind = engine
+# Startup LISTENs on the test database, not DATABASE_URL
+pg_listener.bind = engine
 logging.basicConfig(level=logging.INFO)
 log = logging.getLogger(__name__)
 
@@ -31,6 +48,9 @@ log = logging.getLogger(__name__)
 def setup_test_db():
     """Creates the test database tables before tests run, and drops them after."""
     Base.metadata.create_all(bind=engine)
+    # audit_logs is partitioned; one catch-all partition is enough for tests
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE IF NOT EXISTS audit_logs_default PARTITION OF audit_logs DEFAULT"))
     yield
     Base.metadata.drop_all(bind=engine)
 
@@ -49,7 +69,12 @@ def client(db: Session) -> TestClient:
     def override_get_db():
         yield db
 
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as async_db:
+            yield async_db
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
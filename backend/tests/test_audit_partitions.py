@@ -0,0 +1,77 @@
+from datetime import date
+
+from app.services import audit_partitions
+
+
+class _Result:
+    def __init__(self, value=None, rows=(), rowcount=0):
+        self._value, self._rows, self.rowcount = value, list(rows), rowcount
+
+    def scalar(self):
+        return self._value
+
+    def scalars(self):
+        return iter(self._rows)
+
+
+class FakeDB:
+    """Answers the catalog/EXISTS queries and records every other statement."""
+
+    def __init__(self, attached, stranded=()):
+        self.attached = list(attached)
+        self.stranded = set(stranded)
+        self.statements = []
+        self.commits = 0
+
+    def execute(self, stmt, params=None):
+        sql = " ".join(str(stmt).split())
+        if "FROM pg_inherits" in sql:
+            return _Result(rows=self.attached)
+        if sql.startswith("SELECT EXISTS"):
+            return _Result(value=params["lo"] in self.stranded)
+        self.statements.append(sql)
+        return _Result(rowcount=3)
+
+    def commit(self):
+        self.commits += 1
+
+
+def test_ensure_partitions_creates_missing_months_only():
+    db = FakeDB(["audit_logs_y2026m10", "audit_logs_default"])
+    created = audit_partitions.ensure_partitions(db, months_ahead=2, today=date(2026, 10, 16))
+    assert created == ["audit_logs_y2026m11", "audit_logs_y2026m12"]
+    assert db.statements == [
+        'CREATE TABLE IF NOT EXISTS "audit_logs_y2026m11" PARTITION OF audit_logs '
+        "FOR VALUES FROM ('2026-11-01') TO ('2026-12-01')",
+        'CREATE TABLE IF NOT EXISTS "audit_logs_y2026m12" PARTITION OF audit_logs '
+        "FOR VALUES FROM ('2026-12-01') TO ('2027-01-01')",
+    ]
+    assert db.commits == 1
+
+
+def test_ensure_partitions_moves_rows_out_of_the_default_partition():
+    db = FakeDB(["audit_logs_default"], stranded={date(2027, 1, 1)})
+    created = audit_partitions.ensure_partitions(db, months_ahead=0, today=date(2027, 1, 5))
+    assert created == ["audit_logs_y2027m01"]
+    assert [s.split(" PARTITION")[0] if s.startswith("CREATE") else s.split(" WHERE")[0] for s in db.statements] == [
+        'ALTER TABLE audit_logs DETACH PARTITION "audit_logs_default"',
+        'CREATE TABLE IF NOT EXISTS "audit_logs_y2027m01"',
+        'WITH moved AS (DELETE FROM "audit_logs_default"',
+        'ALTER TABLE audit_logs ATTACH PARTITION "audit_logs_default" DEFAULT',
+    ]
+    assert db.statements[2].endswith('INSERT INTO "audit_logs_y2027m01" SELECT * FROM moved')
+
+
+def test_detach_older_than_retires_whole_months_past_retention():
+    attached = ["audit_logs_y2024m09", "audit_logs_y2024m10", "audit_logs_y2024m11", "audit_logs_default"]
+    db = FakeDB(attached)
+    retired = audit_partitions.detach_older_than(db, 24, today=date(2026, 11, 3))
+    assert retired == ["audit_logs_y2024m09", "audit_logs_y2024m10"]
+    assert db.statements == [
+        'ALTER TABLE audit_logs DETACH PARTITION "audit_logs_y2024m09"',
+        'ALTER TABLE audit_logs DETACH PARTITION "audit_logs_y2024m10"',
+    ]
+
+    db = FakeDB(attached)
+    audit_partitions.detach_older_than(db, 24, drop=True, today=date(2026, 11, 3))
+    assert db.statements[1] == 'DROP TABLE "audit_logs_y2024m09"'
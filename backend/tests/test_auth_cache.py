@@ -0,0 +1,31 @@
+import uuid
+
+from app.core.auth_cache import Principal, PrincipalCache
+from app.core.config import settings
+
+
+def _principal() -> Principal:
+    return Principal(id=uuid.uuid4(), email="a@b.c", name="A", role="ADMIN", status="ACTIVE", warehouse_id=None)
+
+
+def test_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_CACHE_MAX_ENTRIES", 2)
+    cache = PrincipalCache()
+    a, b, c = _principal(), _principal(), _principal()
+    cache.put(a)
+    cache.put(b)
+    assert cache.get(a.id) == a  # a is now most recently used
+    cache.put(c)
+    assert cache.get(b.id) is None
+    assert cache.get(a.id) == a and cache.get(c.id) == c
+
+
+def test_invalidate_and_ttl(monkeypatch):
+    cache = PrincipalCache()
+    p = _principal()
+    cache.put(p)
+    cache.invalidate(p.id)
+    assert cache.get(p.id) is None
+    monkeypatch.setattr(settings, "AUTH_CACHE_TTL_SECONDS", -1)
+    cache.put(p)
+    assert cache.get(p.id) is None
@@ -0,0 +1,93 @@
+import threading
+import uuid
+
+from app.services.free_bin_index import FreeBinIndex, _WarehouseBins
+
+
+def _state_with(racks: dict) -> _WarehouseBins:
+    state = _WarehouseBins(loaded_at=0.0)
+    for rack_id, rank in racks.items():
+        state.racks[rack_id] = (rank, True)
+    return state
+
+
+def test_pop_follows_slotting_order():
+    """Free bins come out ordered by rack (DB name order), stack index, then bin index."""
+    r1, r2 = uuid.uuid4(), uuid.uuid4()
+    state = _state_with({r1: 0, r2: 1})
+    b_late, b_first, b_second = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    state.push(b_late, (1, 0, 0), r2)
+    state.push(b_second, (0, 0, 1), r1)
+    state.push(b_first, (0, 0, 0), r1)
+    assert [state.pop(flat=False) for _ in range(4)] == [b_first, b_second, b_late, None]
+
+
+def test_flat_pop_skips_racks_holding_product():
+    """FLAT allocation only uses racks with no product-bound bin."""
+    dirty, clean = uuid.uuid4(), uuid.uuid4()
+    state = _state_with({dirty: 0, clean: 1})
+    b_dirty, b_clean = uuid.uuid4(), uuid.uuid4()
+    state.push(b_dirty, (0, 0, 0), dirty)
+    state.push(b_clean, (1, 0, 0), clean)
+    state.set_product(dirty, uuid.uuid4(), True)
+    assert state.pop(flat=True) == b_clean
+    assert state.pop(flat=True) is None
+    assert state.pop(flat=False) == b_dirty
+
+
+def test_rack_becomes_flat_eligible_when_product_cleared():
+    """Clearing the last product bin returns a rack's free bins to the FLAT heap."""
+    rack = uuid.uuid4()
+    state = _state_with({rack: 0})
+    product_bin, free_bin = uuid.uuid4(), uuid.uuid4()
+    state.set_product(rack, product_bin, True)
+    state.push(free_bin, (0, 0, 1), rack)
+    assert state.pop(flat=True) is None
+    state.set_product(rack, product_bin, False)
+    assert state.pop(flat=True) == free_bin
+
+
+def test_discarded_bins_are_not_returned():
+    """Bins taken elsewhere are dropped lazily from the heap."""
+    rack = uuid.uuid4()
+    state = _state_with({rack: 0})
+    taken, free = uuid.uuid4(), uuid.uuid4()
+    state.push(taken, (0, 0, 0), rack)
+    state.push(free, (0, 0, 1), rack)
+    state.discard(taken)
+    assert state.pop(flat=False) == free
+    assert state.pop(flat=False) is None
+
+
+def test_load_runs_outside_the_lock_and_invalidation_discards_it():
+    """Other warehouses stay usable during a load; a load raced by invalidate is dropped."""
+    index = FreeBinIndex(ttl_seconds=300)
+    rack, free = uuid.uuid4(), uuid.uuid4()
+    seen_lock_free = []
+
+    def _lock_is_free():
+        # Probe from another thread: the registry lock is re-entrant
+        result = []
+
+        def probe():
+            result.append(index._lock.acquire(blocking=False))
+            if result[0]:
+                index._lock.release()
+
+        t = threading.Thread(target=probe)
+        t.start()
+        t.join()
+        return result[0]
+
+    def _load(db, warehouse_id):
+        seen_lock_free.append(_lock_is_free())
+        state = _state_with({rack: 0})
+        state.push(free, (0, 0, 0), rack)
+        if warehouse_id == "raced":
+            index.invalidate("raced")
+        return state
+
+    index._load = _load
+    assert index.pop_candidates(None, "raced", 1) == []
+    assert index.pop_candidates(None, "wh", 1) == [free]
+    assert seen_lock_free == [True, True]
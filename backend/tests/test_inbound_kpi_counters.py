@@ -0,0 +1,41 @@
+from datetime import date, datetime
+
+from app.services.inbound_kpi_counters import TOTALS_DAY, _state, _transition
+
+
+def test_open_receipt_contributes_open_and_planned_day():
+    """An open receipt counts as open, pending and late-candidate on its planned day."""
+    deltas = _state("AWAITING_UNLOADING", datetime(2026, 3, 4, 15, 30), +1)
+    assert deltas == {
+        (TOTALS_DAY, "open"): 1,
+        (TOTALS_DAY, "pending"): 1,
+        (date(2026, 3, 4), "open_planned"): 1,
+    }
+
+
+def test_status_change_moves_gauges():
+    """Moving AWAITING_UNLOADING -> ALLOCATED nets out the open count."""
+    deltas = _state("AWAITING_UNLOADING", None, -1)
+    deltas.update(_state("ALLOCATED", None, +1))
+    assert {k: v for k, v in deltas.items() if v} == {
+        (TOTALS_DAY, "pending"): -1,
+        (TOTALS_DAY, "allocated"): 1,
+    }
+
+
+def test_closed_receipt_contributes_nothing():
+    assert not _state("COMPLETED", datetime(2026, 3, 4), +1)
+
+
+def test_reopening_a_completed_receipt_takes_back_its_completion():
+    """COMPLETED -> ALLOCATED reopens the receipt and uncounts the day it was completed."""
+    deltas = _transition("COMPLETED", "ALLOCATED", None, datetime(2026, 3, 4, 9, 0))
+    assert {k: v for k, v in deltas.items() if v} == {
+        (TOTALS_DAY, "open"): 1,
+        (TOTALS_DAY, "allocated"): 1,
+        (date(2026, 3, 4), "completed"): -1,
+    }
+
+
+def test_same_status_is_not_a_transition():
+    assert not _transition("COMPLETED", "COMPLETED", None, datetime(2026, 3, 4))
@@ -0,0 +1,55 @@
+import ast
+import json
+import logging
+import pathlib
+
+from app.core.logging_config import JsonFormatter, NonBlockingQueueHandler, SamplingFilter
+
+APP_DIR = pathlib.Path(__file__).resolve().parents[1] / "app"
+_LEVELS = {"debug", "info", "warning", "error", "exception", "critical"}
+
+
+def _record(name="app.api.endpoints.crates", level=logging.INFO, msg="crate %s", args=("c1",)):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+def test_json_formatter_includes_message_and_extras():
+    rec = _record()
+    rec.request_id = "r-1"
+    out = json.loads(JsonFormatter().format(rec))
+    assert out["msg"] == "crate c1"
+    assert out["logger"] == "app.api.endpoints.crates"
+    assert out["level"] == "INFO" and out["request_id"] == "r-1"
+
+
+def test_sampling_uses_longest_prefix_and_never_drops_warnings():
+    f = SamplingFilter({"app": 1.0, "app.api.endpoints": 0.0})
+    assert not f.filter(_record())
+    assert f.filter(_record(name="app.services.inbound_service"))
+    assert f.filter(_record(level=logging.WARNING))
+
+
+def test_queue_handler_drops_when_full():
+    import queue
+
+    h = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    before = NonBlockingQueueHandler.dropped
+    h.handle(_record())
+    h.handle(_record())
+    assert h.queue.get_nowait().msg == "crate c1"
+    assert NonBlockingQueueHandler.dropped == before + 1
+
+
+def test_app_logging_calls_use_lazy_formatting():
+    offenders = []
+    for path in APP_DIR.rglob("*.py"):
+        for node in ast.walk(ast.parse(path.read_text(encoding="utf-8"))):
+            if (
+                isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Attribute)
+                and node.func.attr in _LEVELS
+                and node.args
+                and isinstance(node.args[0], ast.JoinedStr)
+            ):
+                offenders.append(f"{path.relative_to(APP_DIR)}:{node.lineno}")
+    assert not offenders, "use %-style args instead of f-strings in log calls: " + ", ".join(offenders)
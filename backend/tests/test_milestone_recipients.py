@@ -0,0 +1,58 @@
+import uuid
+
+from app.core.config import settings
+from app.services.milestone_recipients import RecipientCache
+
+
+def _counting_cache(monkeypatch):
+    cache = RecipientCache()
+    loads = []
+
+    def _load(db, warehouse_id):
+        loads.append(warehouse_id)
+        return (uuid.uuid4(),)
+
+    monkeypatch.setattr(cache, "_load", _load)
+    return cache, loads
+
+
+def test_recipients_cached_per_scope(monkeypatch):
+    cache, loads = _counting_cache(monkeypatch)
+    wh = uuid.uuid4()
+    system = cache.get(None)
+    assert cache.get(None) == system
+    cache.get(None, wh)
+    cache.get(None, wh)
+    assert loads == [None, wh]
+
+
+def test_invalidate_one_warehouse_or_all(monkeypatch):
+    cache, loads = _counting_cache(monkeypatch)
+    wh = uuid.uuid4()
+    cache.get(None)
+    cache.get(None, wh)
+    cache.invalidate(wh)
+    cache.get(None)
+    cache.get(None, wh)
+    assert loads == [None, wh, wh]
+    cache.clear()
+    cache.get(None)
+    assert loads == [None, wh, wh, None]
+    monkeypatch.setattr(settings, "MILESTONE_RECIPIENT_CACHE_TTL_SECONDS", 0)
+    cache.get(None)
+    cache.get(None)
+    assert loads[-2:] == [None, None]
+
+
+def test_publish_invalidation_notifies_warehouse_or_everything(monkeypatch):
+    monkeypatch.setattr(settings, "MILESTONE_RECIPIENTS_INVALIDATION_CHANNEL", "recipients")
+    sent = []
+
+    class FakeDB:
+        def execute(self, stmt, params):
+            sent.append((params["channel"], params["payload"]))
+
+    wh = uuid.uuid4()
+    RecipientCache().publish_invalidation(FakeDB(), wh)
+    RecipientCache().publish_invalidation(FakeDB())
+    assert sent == [("recipients", str(wh)), ("recipients", "")]
@@ -0,0 +1,39 @@
+import asyncio
+import json
+import threading
+import uuid
+
+from app.core.config import settings
+from app.services.notification_broker import NotificationBroker
+
+
+def test_publish_from_another_thread_reaches_only_that_user():
+    broker = NotificationBroker()
+    me, other = uuid.uuid4(), uuid.uuid4()
+
+    async def main():
+        with broker.subscribe(me) as mine, broker.subscribe(other) as theirs:
+            t = threading.Thread(target=broker._on_notify, args=(json.dumps({"event": "unread", "user_id": str(me), "unread": 3}),))
+            t.start()
+            t.join()
+            event = await asyncio.wait_for(mine.get(), timeout=1)
+            assert event["unread"] == 3
+            assert theirs.empty()
+        assert broker.subscriber_count() == 0
+
+    asyncio.run(main())
+
+
+def test_full_queue_keeps_newest(monkeypatch):
+    monkeypatch.setattr(settings, "NOTIFICATION_STREAM_QUEUE_SIZE", 2)
+    broker = NotificationBroker()
+    me = uuid.uuid4()
+
+    async def main():
+        with broker.subscribe(me) as q:
+            for n in range(4):
+                broker.publish({"event": "unread", "user_id": str(me), "unread": n})
+            await asyncio.sleep(0)
+            assert [q.get_nowait()["unread"] for _ in range(q.qsize())] == [2, 3]
+
+    asyncio.run(main())
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.pool import StaticPool
+
+from app.db import base  # noqa: F401
+from app.core.config import settings
+from app.models.outbox_event import OutboxEvent
+from app.services.outbox import OutboxDispatcher
+
+
+def _dispatcher():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    with engine.begin() as conn:
+        # JSONB/Identity don't exist in SQLite; same table shape for the dispatcher's statements
+        conn.execute(text(
+            "CREATE TABLE outbox_events (id INTEGER PRIMARY KEY, event_type VARCHAR(100) NOT NULL,"
+            " payload JSON NOT NULL, created_at DATETIME NOT NULL, available_at DATETIME NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0, last_error TEXT)"
+        ))
+        conn.execute(text("CREATE TABLE side_effects (name VARCHAR(50) NOT NULL)"))
+    return OutboxDispatcher(bind=engine), engine
+
+
+def _publish(dispatcher, engine, event_type, payload):
+    from sqlalchemy.orm import Session
+
+    with Session(engine) as db:
+        dispatcher.publish(db, event_type, payload)
+        db.commit()
+
+
+def _side_effect(db, name):
+    db.execute(text("INSERT INTO side_effects (name) VALUES (:name)"), {"name": name})
+    db.commit()
+
+
+def test_claim_skips_locked_rows_and_respects_limits(monkeypatch):
+    monkeypatch.setattr(settings, "OUTBOX_BATCH_SIZE", 7)
+    sql = str(OutboxDispatcher()._claim_stmt().compile(dialect=postgresql.dialect()))
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "outbox_events.available_at <=" in sql and "outbox_events.attempts <" in sql
+    assert "ORDER BY outbox_events.id" in sql and "LIMIT" in sql
+
+
+def test_handled_events_are_deleted():
+    dispatcher, engine = _dispatcher()
+    dispatcher.register("thing.created", lambda db, payload: _side_effect(db, payload["name"]))
+    _publish(dispatcher, engine, "thing.created", {"name": "a"})
+    _publish(dispatcher, engine, "thing.created", {"name": "b"})
+
+    assert dispatcher.dispatch_batch() == 2
+    with engine.connect() as conn:
+        assert conn.execute(select(OutboxEvent.id)).all() == []
+        assert sorted(conn.execute(text("SELECT name FROM side_effects")).scalars()) == ["a", "b"]
+    assert dispatcher.handled == 2 and dispatcher.failed == 0
+
+
+def test_failed_handler_is_rolled_back_and_retried_with_backoff():
+    dispatcher, engine = _dispatcher()
+
+    def handler(db, payload):
+        # First write "commits" before the second step fails; both must be undone
+        _side_effect(db, "system")
+        raise RuntimeError("customer milestone failed")
+
+    dispatcher.register("order.created", handler)
+    dispatcher.register("thing.created", lambda db, payload: _side_effect(db, "other"))
+    _publish(dispatcher, engine, "order.created", {"order_id": "o1"})
+    _publish(dispatcher, engine, "thing.created", {})
+
+    before = datetime.utcnow()
+    assert dispatcher.dispatch_batch() == 2
+    with engine.connect() as conn:
+        assert list(conn.execute(text("SELECT name FROM side_effects")).scalars()) == ["other"]
+        event = conn.execute(select(OutboxEvent)).one()
+    assert event.event_type == "order.created"
+    assert event.attempts == 1 and "customer milestone failed" in event.last_error
+    assert event.available_at >= before + timedelta(seconds=2)
+    assert dispatcher.handled == 1 and dispatcher.failed == 1
+
+    # Not due yet: the next batch leaves it alone
+    assert dispatcher.dispatch_batch() == 0
+
+
+def test_events_past_max_attempts_are_not_claimed(monkeypatch):
+    monkeypatch.setattr(settings, "OUTBOX_MAX_ATTEMPTS", 1)
+    dispatcher, engine = _dispatcher()
+    _publish(dispatcher, engine, "unknown.event", {})
+
+    assert dispatcher.dispatch_batch() == 1
+    with engine.begin() as conn:
+        conn.execute(OutboxEvent.__table__.update().values(available_at=datetime.utcnow() - timedelta(seconds=1)))
+    assert dispatcher.dispatch_batch() == 0
@@ -0,0 +1,23 @@
+from app.db.pool_metrics import PoolMetrics
+
+
+class _Record:
+    def __init__(self):
+        self.info = {}
+
+
+def test_reset_keeps_connections_in_use():
+    """A reset starts a new window without losing track of checked-out connections."""
+    metrics = PoolMetrics()
+    held, returned = _Record(), _Record()
+    metrics.on_checkout(None, held, None)
+    metrics.on_checkout(None, returned, None)
+    metrics.on_checkin(None, returned)
+
+    metrics.reset()
+    assert metrics.checkouts == 0 and metrics.in_use == 1 and metrics.max_in_use == 1
+
+    metrics.on_checkout(None, _Record(), None)
+    assert metrics.in_use == 2 and metrics.max_in_use == 2
+    metrics.on_checkin(None, held)
+    assert metrics.in_use == 1
@@ -0,0 +1,64 @@
+import random
+import time
+import uuid
+
+import numpy as np
+
+from app.services import spatial_index
+from app.services.spatial_index import SpatialIndex, _Grid, haversine_km
+
+
+def _index(monkeypatch, points, vendors=None):
+    def _load(db, kind):
+        grid = _Grid(loaded_at=time.monotonic(), cell=0.25)
+        grid.ids = [uuid.uuid4() for _ in points]
+        grid.lats = np.array([p[0] for p in points], dtype=np.float64)
+        grid.lons = np.array([p[1] for p in points], dtype=np.float64)
+        grid.attrs = {"vendor_id": np.array(vendors or [""] * len(points), dtype=object)}
+        grid.build_cells()
+        return grid
+
+    index = SpatialIndex()
+    monkeypatch.setattr(index, "_load", _load)
+    return index
+
+
+def _brute(index, lat, lon, radius):
+    grid = index._grid(None, "store")
+    dist = haversine_km(lat, lon, grid.lats, grid.lons)
+    return sorted(grid.ids[i] for i in np.flatnonzero(dist <= radius))
+
+
+def test_radius_query_matches_brute_force(monkeypatch):
+    rnd = random.Random(7)
+    points = [(12.9 + rnd.uniform(-1, 1), 77.6 + rnd.uniform(-1, 1)) for _ in range(2000)]
+    index = _index(monkeypatch, points)
+    for radius in (0.5, 5, 25, 150):
+        hits = index.nearby(None, "store", 12.95, 77.55, radius)
+        assert sorted(h[0] for h in hits) == _brute(index, 12.95, 77.55, radius)
+        assert [h[1] for h in hits] == sorted(h[1] for h in hits)
+
+
+def test_antimeridian_and_pole(monkeypatch):
+    index = _index(monkeypatch, [(0.0, 179.95), (0.0, -179.95), (89.99, 10.0), (89.99, -170.0)])
+    assert len(index.nearby(None, "store", 0.0, 180.0, 20)) == 2
+    assert len(index.nearby(None, "store", 89.999, 0.0, 5)) == 2
+
+
+def test_nearest_and_filters(monkeypatch):
+    index = _index(monkeypatch, [(10.0, 10.0), (10.0, 11.0), (10.0, 40.0)], vendors=["a", "b", "a"])
+    grid = index._grid(None, "store")
+    assert [h[0] for h in index.nearest(None, "store", 10.0, 10.1, k=2)] == grid.ids[:2]
+    assert [h[0] for h in index.nearest(None, "store", 10.0, 11.0, k=1, vendor_id="a")] == [grid.ids[0]]
+    assert [h[0] for h in index.nearest(None, "store", 10.0, 11.0, k=5, id=grid.ids[2])] == [grid.ids[2]]
+
+
+def test_invalidate_on_commit():
+    index = spatial_index.spatial
+    index._grids["store"] = _Grid(loaded_at=time.monotonic(), cell=0.25)
+    from sqlalchemy.orm import Session
+
+    session = Session()
+    session.info[spatial_index._DIRTY_KEY] = {"store"}
+    spatial_index._apply_dirty_kinds(session)
+    assert "store" not in index._grids
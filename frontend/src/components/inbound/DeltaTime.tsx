@@ -1,8 +1,8 @@
 import React, { useEffect, useState } from 'react';
-import { Receipt } from '../../types/inbound';
+import { ReceiptHeader } from '../../types/inbound';
 
 interface Props {
-  receipt: Receipt;
+  receipt: ReceiptHeader;
   refreshMs?: number; // default 30s
 }
 
@@ -1,27 +1,41 @@
 import { useCallback, useEffect, useMemo, useState } from 'react';
-import { Receipt, ReceiptFilter, GoodsInKpis } from '../types/inbound';
-import { listReceipts, computeKpis } from '../services/inboundService';
+import { ReceiptSummary, ReceiptFilter, GoodsInKpis } from '../types/inbound';
+import { listReceiptHeaders, computeKpis } from '../services/inboundService';
 
 export function useInboundData(initialFilter?: ReceiptFilter) {
   const [filter, setFilter] = useState<ReceiptFilter>(initialFilter || {});
-  const [receipts, setReceipts] = useState<Receipt[]>([]);
+  const [receipts, setReceipts] = useState<ReceiptSummary[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | undefined>();
   const [kpis, setKpis] = useState<GoodsInKpis | null>(null);
   const [loading, setLoading] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
+  // First page only; further pages come from loadMore
   const load = useCallback(async () => {
     setLoading(true); setError(null);
     try {
-      const [r, k] = await Promise.all([
-        listReceipts(filter),
+      const [page, k] = await Promise.all([
+        listReceiptHeaders(filter),
         computeKpis(),
       ]);
-      setReceipts(r); setKpis(k);
+      setReceipts(page.receipts); setNextCursor(page.nextCursor); setKpis(k);
     } catch (e: any) {
       setError(e.message || 'Failed to load inbound data');
     } finally { setLoading(false); }
   }, [filter]);
 
+  const loadMore = useCallback(async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true); setError(null);
+    try {
+      const page = await listReceiptHeaders(filter, nextCursor);
+      setReceipts(prev => [...prev, ...page.receipts]); setNextCursor(page.nextCursor);
+    } catch (e: any) {
+      setError(e.message || 'Failed to load more receipts');
+    } finally { setLoadingMore(false); }
+  }, [filter, nextCursor, loadingMore]);
+
   useEffect(() => { load(); }, [load]);
 
   const setPartialFilter = useCallback((p: Partial<ReceiptFilter>) => {
@@ -29,8 +43,11 @@ export function useInboundData(initialFilter?: ReceiptFilter) {
   }, []);
 
   const groupedByStatus = useMemo(() => {
-    return receipts.reduce<Record<string, Receipt[]>>((acc, r) => { (acc[r.status] ||= []).push(r); return acc; }, {});
+    return receipts.reduce<Record<string, ReceiptSummary[]>>((acc, r) => { (acc[r.status] ||= []).push(r); return acc; }, {});
   }, [receipts]);
 
-  return { filter, setFilter: setPartialFilter, receipts, kpis, groupedByStatus, loading, error, reload: load };
+  return {
+    filter, setFilter: setPartialFilter, receipts, kpis, groupedByStatus, loading, error, reload: load,
+    loadMore, hasMore: !!nextCursor, loadingMore,
+  };
 }
@@ -9,24 +9,24 @@ import { useWarehouseSelection } from '../../hooks/useWarehouseSelection';
 import { Receipt, ReceiptLine } from '../../types/inbound';
 import { StatusChip } from '../../components/inbound/StatusChip';
 import DeltaTime from '../../components/inbound/DeltaTime';
-import { progressReceipt, autoAllocateReceiptBins, reassignLineBin, clearLineBin } from '../../services/inboundService';
+import { getReceipt, progressReceipt, autoAllocateReceiptBins, reassignLineBin, clearLineBin } from '../../services/inboundService';
 import * as notify from '../../lib/notify';
 import LoadingOverlay from '../../components/LoadingOverlay';
 import { getAllocationStatus } from '../../utils/binUtils';
 
 // Receipts eligible for bin allocation are those that completed QC and moved to ALLOCATED
-const eligibleStatuses: Array<Receipt['status']> = ['ALLOCATED'];
+const eligibleStatus: Receipt['status'] = 'ALLOCATED';
 
 const BinAllocation: React.FC = () => {
-  const { receipts, kpis, loading, error, reload, setFilter, filter } = useInboundData();
+  const { receipts, kpis, loading, error, reload, setFilter, filter, loadMore, hasMore, loadingMore } = useInboundData({ status: eligibleStatus });
   const { warehouses, warehouseId, setWarehouseId, allowSelection } = useWarehouseSelection();
   const [search, setSearch] = useState(filter.search || '');
   const [show, setShow] = useState<Receipt | null>(null);
   const [page, setPage] = useState(1);
   const [pageSize, setPageSize] = useState(25);
 
-  const list = useMemo(() => receipts.filter(r => eligibleStatuses.includes(r.status)), [receipts]);
-  const pendingLines = useMemo(() => list.reduce((acc, r) => acc + r.lines.filter(l => !l.bin_id || !l.bin_code).length, 0), [list]);
+  const list = receipts;
+  const pendingLines = useMemo(() => list.reduce((acc, r) => acc + r.unassigned_lines, 0), [list]);
   const paged = useMemo(() => {
     const start = (page - 1) * pageSize;
     return list.slice(start, start + pageSize);
@@ -36,7 +36,27 @@ const BinAllocation: React.FC = () => {
     setFilter({ search: search || undefined, warehouseId: warehouseId || undefined });
   }
 
-  useEffect(() => { setPage(1); }, [search, warehouseId, list.length]);
+  useEffect(() => { setPage(1); }, [search, warehouseId]);
+  useEffect(() => {
+    setPage(p => Math.min(p, Math.max(1, Math.ceil(list.length / pageSize))));
+  }, [list.length, pageSize, page]);
+
+  async function nextPage() {
+    if (page * pageSize >= list.length) {
+      if (!hasMore) return;
+      await loadMore();
+    }
+    setPage(page + 1);
+  }
+
+  // List rows are headers only; fetch the lines before allocating
+  async function openReceipt(id: string) {
+    try {
+      setShow(await getReceipt(id));
+    } catch (e: any) {
+      notify.error(e?.response?.data?.detail || 'Failed to load receipt');
+    }
+  }
 
   return (
     <div className="inbound-page">
@@ -103,7 +123,7 @@ const BinAllocation: React.FC = () => {
         footer={list.length > 0 ? (
           <>
             <div className="empty-hint">
-              {`Showing ${(page - 1) * pageSize + 1}-${Math.min(page * pageSize, list.length)} of ${list.length}`}
+              {`Showing ${(page - 1) * pageSize + 1}-${Math.min(page * pageSize, list.length)} of ${list.length}${hasMore ? '+' : ''}`}
             </div>
             <div style={{display:'flex', alignItems:'center', gap:8}}>
               <button
@@ -119,8 +139,8 @@ const BinAllocation: React.FC = () => {
               <button
                 className="icon-btn"
                 aria-label="Next page"
-                onClick={() => setPage(p => (p * pageSize < list.length ? p + 1 : p))}
-                disabled={page * pageSize >= list.length}
+                onClick={nextPage}
+                disabled={loadingMore || (page * pageSize >= list.length && !hasMore)}
                 title="Next"
               >
                 <ChevronRight size={16} />
@@ -162,8 +182,8 @@ const BinAllocation: React.FC = () => {
             </thead>
             <tbody>
               {paged.map(r => {
-                const unassigned = r.lines.filter(l => !l.bin_id || !l.bin_code).length;
-                const allocationStatus = getAllocationStatus(r.lines);
+                const unassigned = r.unassigned_lines;
+                const allocationStatus = getAllocationStatus(r.line_count, unassigned);
                 const allocationColor = allocationStatus === 'Allocated' ? 'var(--color-success)' 
                   : allocationStatus === 'Partial' ? 'var(--color-warning)' 
                   : 'var(--color-text-soft)';
@@ -172,13 +192,13 @@ const BinAllocation: React.FC = () => {
                     <td>{r.code || r.id}</td>
                     <td>{r.vendor_name} ({r.vendor_type})</td>
                     <td><StatusChip status={r.status} /></td>
-                    <td>{r.lines.length}</td>
+                    <td>{r.line_count}</td>
                     <td style={{color: allocationColor}}>{allocationStatus}</td>
                     <td style={{color: unassigned>0 ? 'var(--color-warning)' : 'var(--color-text-soft)'}}>{unassigned}</td>
                     <td>{r.planned_arrival ? new Date(r.planned_arrival).toLocaleTimeString([], {hour:'2-digit', minute:'2-digit'}) : '-'}</td>
                     <td><DeltaTime receipt={r} refreshMs={30000} /></td>
                     <td style={{textAlign:'right'}}>
-                      <button className="btn-primary-token" onClick={()=>setShow(r)}>Allocate Bins</button>
+                      <button className="btn-primary-token" onClick={()=>openReceipt(r.id)}>Allocate Bins</button>
                     </td>
                   </tr>
                 );
@@ -5,7 +5,7 @@ import KpiCard from '../../components/KpiCard';
 import EmptyState from '../../components/EmptyState';
 import { StatusChip } from '../../components/inbound/StatusChip';
 import { Receipt, ReceiptStatus } from '../../types/inbound';
-import { progressReceipt, receiptStatusFlow, updateReceiptStatus, createReceipt, autoCreateReceiptsBatch } from '../../services/inboundService';
+import { getReceipt, progressReceipt, receiptStatusFlow, updateReceiptStatus, createReceipt, autoCreateReceiptsBatch } from '../../services/inboundService';
 import DeltaTime from '../../components/inbound/DeltaTime';
 import '../../pages/inbound/Inbound.css';
 import { useWarehouseSelection } from '../../hooks/useWarehouseSelection';
@@ -20,7 +20,7 @@ import { Table, TableBody, TableCell, TableHead, TableHeader, TableRow } from '.
 import LoadingOverlay from '../../components/LoadingOverlay';
 
 function GoodsIn(): JSX.Element {
-  const { receipts, kpis, loading, error, reload, setFilter, filter } = useInboundData();
+  const { receipts, kpis, loading, error, reload, setFilter, filter, loadMore, hasMore, loadingMore } = useInboundData();
   const [showModal, setShowModal] = useState(false);
   const [selected, setSelected] = useState<Receipt | null>(null);
   const [search, setSearch] = useState(filter.search || '');
@@ -91,6 +91,15 @@ function GoodsIn(): JSX.Element {
     setFilter({ search, status: statusFilter || undefined, vendorType: undefined, warehouseId: warehouseId || undefined });
   }
 
+  // List rows are headers only; fetch the lines when a receipt is opened
+  async function openReceipt(id: string) {
+    try {
+      setSelected(await getReceipt(id));
+    } catch (e: any) {
+      notify.error(e?.response?.data?.detail || 'Failed to load receipt');
+    }
+  }
+
   async function handleProgress(r: Receipt) {
     try {
       const updated = await progressReceipt(r.id);
@@ -217,7 +226,19 @@ function GoodsIn(): JSX.Element {
     return filteredSorted.slice(start, start + pageSize);
   }, [filteredSorted, page, pageSize]);
 
-  useEffect(() => { setPage(1); }, [search, warehouseId, vendorFilter, sort, filteredSorted.length]);
+  useEffect(() => { setPage(1); }, [search, warehouseId, vendorFilter, sort]);
+  // Keep the page in range when the list shrinks (reload, vendor filter on a fresh page)
+  useEffect(() => {
+    setPage(p => Math.min(p, Math.max(1, Math.ceil(filteredSorted.length / pageSize))));
+  }, [filteredSorted.length, pageSize, page]);
+
+  async function nextPage() {
+    if (page * pageSize >= filteredSorted.length) {
+      if (!hasMore) return;
+      await loadMore();
+    }
+    setPage(page + 1);
+  }
 
   const addEmptyLine = () => {
     if (selectedCustomer) {
@@ -389,7 +410,7 @@ function GoodsIn(): JSX.Element {
         footer={receipts.length > 0 ? (
           <>
             <div className="empty-hint">
-              {`Showing ${(page - 1) * pageSize + 1}-${Math.min(page * pageSize, filteredSorted.length)} of ${filteredSorted.length}`}
+              {`Showing ${(page - 1) * pageSize + 1}-${Math.min(page * pageSize, filteredSorted.length)} of ${filteredSorted.length}${hasMore ? '+' : ''}`}
             </div>
             <div style={{display:'flex', alignItems:'center', gap:8}}>
               <button
@@ -405,8 +426,8 @@ function GoodsIn(): JSX.Element {
               <button
                 className="icon-btn"
                 aria-label="Next page"
-                onClick={() => setPage(p => (p * pageSize < filteredSorted.length ? p + 1 : p))}
-                disabled={page * pageSize >= filteredSorted.length}
+                onClick={nextPage}
+                disabled={loadingMore || (page * pageSize >= filteredSorted.length && !hasMore)}
                 title="Next"
               >
                 <ChevronRight size={16} />
@@ -447,12 +468,12 @@ function GoodsIn(): JSX.Element {
             </TableHeader>
             <TableBody>
               {paged.map(r => (
-                  <TableRow key={r.id} onClick={() => setSelected(r)} style={{cursor:'pointer'}} className="appearing">
+                  <TableRow key={r.id} onClick={() => openReceipt(r.id)} style={{cursor:'pointer'}} className="appearing">
           <TableCell>{r.code || r.reference || r.id}</TableCell>
                     <TableCell>{r.vendor_name}</TableCell>
                     <TableCell>{r.vendor_type}</TableCell>
                     <TableCell><StatusChip status={r.status} /></TableCell>
-                    <TableCell>{r.lines.length}</TableCell>
+                    <TableCell>{r.line_count}</TableCell>
                     <TableCell>{r.planned_arrival ? new Date(r.planned_arrival).toLocaleTimeString([], {hour:'2-digit', minute:'2-digit'}) : '-'}</TableCell>
                     <TableCell><DeltaTime receipt={r} refreshMs={30000} /></TableCell>
                   </TableRow>
@@ -7,7 +7,7 @@ import KpiCard from '../../components/KpiCard';
 import { useInboundData } from '../../hooks/useInboundData';
 import { useWarehouseSelection } from '../../hooks/useWarehouseSelection';
 import { Receipt, ReceiptLine, ReceiptStatus } from '../../types/inbound';
-import { computeKpis, flagLineIssues, progressReceipt, updateReceiptStatus, setReceivedQty, acknowledgeDiff, setDamageOrigin } from '../../services/inboundService';
+import { computeKpis, getReceipt, flagLineIssues, progressReceipt, updateReceiptStatus, setReceivedQty, acknowledgeDiff, setDamageOrigin } from '../../services/inboundService';
 import { getSystemConfig, getWarehouseConfig } from '../../services/configService';
 import { StatusChip } from '../../components/inbound/StatusChip';
 import DeltaTime from '../../components/inbound/DeltaTime';
@@ -15,18 +15,18 @@ import * as notify from '../../lib/notify';
 import LoadingOverlay from '../../components/LoadingOverlay';
 
 // QC should start post-unloading at the bay
-const qcStatuses: ReceiptStatus[] = ['MOVED_TO_BAY'];
+const qcStatus: ReceiptStatus = 'MOVED_TO_BAY';
 
 const QualityCheck: React.FC = () => {
-  const { receipts, kpis, loading, error, reload, setFilter, filter } = useInboundData();
+  const { receipts, kpis, loading, error, reload, setFilter, filter, loadMore, hasMore, loadingMore } = useInboundData({ status: qcStatus });
   const [search, setSearch] = useState(filter.search || '');
   const [show, setShow] = useState<Receipt | null>(null);
   const { warehouses, warehouseId, setWarehouseId, allowSelection } = useWarehouseSelection();
   const [page, setPage] = useState(1);
   const [pageSize, setPageSize] = useState(25);
 
-  const qcList = useMemo(() => receipts.filter(r => qcStatuses.includes(r.status)), [receipts]);
-  const exceptionsCount = useMemo(() => qcList.reduce((acc, r) => acc + r.lines.filter(l => ((l.received_qty ?? l.quantity) !== l.quantity) || (l.damaged||0) > 0).length, 0), [qcList]);
+  const qcList = receipts;
+  const exceptionsCount = useMemo(() => qcList.reduce((acc, r) => acc + r.qc_diff_lines, 0), [qcList]);
   const paged = useMemo(() => {
     const start = (page - 1) * pageSize;
     return qcList.slice(start, start + pageSize);
@@ -36,7 +36,27 @@ const QualityCheck: React.FC = () => {
     setFilter({ search: search || undefined, warehouseId: warehouseId || undefined });
   }
 
-  useEffect(() => { setPage(1); }, [search, warehouseId, qcList.length]);
+  useEffect(() => { setPage(1); }, [search, warehouseId]);
+  useEffect(() => {
+    setPage(p => Math.min(p, Math.max(1, Math.ceil(qcList.length / pageSize))));
+  }, [qcList.length, pageSize, page]);
+
+  async function nextPage() {
+    if (page * pageSize >= qcList.length) {
+      if (!hasMore) return;
+      await loadMore();
+    }
+    setPage(page + 1);
+  }
+
+  // List rows are headers only; fetch the lines before opening QC
+  async function openReceipt(id: string) {
+    try {
+      setShow(await getReceipt(id));
+    } catch (e: any) {
+      notify.error(e?.response?.data?.detail || 'Failed to load receipt');
+    }
+  }
 
   return (
     <div className="inbound-page">
@@ -104,7 +124,7 @@ const QualityCheck: React.FC = () => {
         footer={qcList.length > 0 ? (
           <>
             <div className="empty-hint" style={{visibility: qcList.length ? 'visible' : 'hidden'}}>
-              {qcList.length ? `Showing ${(page - 1) * pageSize + 1}-${Math.min(page * pageSize, qcList.length)} of ${qcList.length}` : '—'}
+              {qcList.length ? `Showing ${(page - 1) * pageSize + 1}-${Math.min(page * pageSize, qcList.length)} of ${qcList.length}${hasMore ? '+' : ''}` : '—'}
             </div>
             <div style={{display:'flex', alignItems:'center', gap:8}}>
               <button
@@ -120,8 +140,8 @@ const QualityCheck: React.FC = () => {
               <button
                 className="icon-btn"
                 aria-label="Next page"
-                onClick={() => setPage(p => (p * pageSize < qcList.length ? p + 1 : p))}
-                disabled={page * pageSize >= qcList.length}
+                onClick={nextPage}
+                disabled={loadingMore || (page * pageSize >= qcList.length && !hasMore)}
                 title="Next"
               >
                 <ChevronRight size={16} />
@@ -162,18 +182,18 @@ const QualityCheck: React.FC = () => {
             </thead>
             <tbody>
               {paged.map(r => {
-                const excLines = r.lines.filter(l => (l.damaged||0) > 0 || (l.missing||0) > 0).length;
+                const excLines = r.exception_lines;
                 return (
                   <tr key={r.id} className="appearing">
                     <td>{r.code || r.id}</td>
                     <td>{r.vendor_name} ({r.vendor_type})</td>
                     <td><StatusChip status={r.status} /></td>
-                    <td>{r.lines.length}</td>
+                    <td>{r.line_count}</td>
                     <td style={{color: excLines>0 ? 'var(--color-error)' : 'var(--color-text-soft)'}}>{excLines}</td>
                     <td>{r.planned_arrival ? new Date(r.planned_arrival).toLocaleTimeString([], {hour:'2-digit', minute:'2-digit'}) : '-'}</td>
                     <td><DeltaTime receipt={r} refreshMs={30000} /></td>
                     <td style={{textAlign:'right'}}>
-                      <button className="btn-primary-token" onClick={()=>setShow(r)}>Open QC</button>
+                      <button className="btn-primary-token" onClick={()=>openReceipt(r.id)}>Open QC</button>
                     </td>
                   </tr>
                 );
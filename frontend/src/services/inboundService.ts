@@ -1,6 +1,6 @@
 // Inbound service that calls backend APIs (no mocks)
 import api from './api'
-import { Receipt, ReceiptFilter, GoodsInKpis, ReceiptLine } from '../types/inbound'
+import { Receipt, ReceiptSummary, ReceiptFilter, GoodsInKpis, ReceiptLine } from '../types/inbound'
 
 // Public status flow used by UI timelines
 export const receiptStatusFlow: Array<Receipt['status']> = [
@@ -12,7 +12,13 @@ export const receiptStatusFlow: Array<Receipt['status']> = [
   'COMPLETED',
 ]
 
-export async function listReceipts(filter?: ReceiptFilter): Promise<Receipt[]> {
+export interface ReceiptPage {
+  receipts: ReceiptSummary[]
+  nextCursor?: string
+}
+
+// One keyset page of receipt headers; pass nextCursor back to get the following page
+export async function listReceiptHeaders(filter?: ReceiptFilter, cursor?: string): Promise<ReceiptPage> {
   const params: any = {}
   if (filter?.warehouseId) params.warehouse_id = filter.warehouseId
   if (filter?.vendorType) params.vendor_type = filter.vendorType
@@ -20,8 +26,9 @@ export async function listReceipts(filter?: ReceiptFilter): Promise<Receipt[]> {
   if (filter?.search) params.search = filter.search
   if (filter?.dateFrom) params.date_from = filter.dateFrom
   if (filter?.dateTo) params.date_to = filter.dateTo
-  const res = await api.get('/inbound/receipts', { params })
-  return res.data
+  if (cursor) params.cursor = cursor
+  const res = await api.get('/inbound/receipts:headers', { params })
+  return { receipts: res.data || [], nextCursor: res.headers['x-next-cursor'] || undefined }
 }
 
 export async function getReceipt(id: string): Promise<Receipt> {
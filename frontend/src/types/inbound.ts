@@ -51,6 +51,16 @@ export interface Receipt {
   overs_policy?: { hold_days: number; after: 'DISPOSE' | 'CHARITY' };
 }
 
+export type ReceiptHeader = Omit<Receipt, 'lines'>;
+
+// List-view row from GET /inbound/receipts:headers; load lines with getReceipt(id)
+export interface ReceiptSummary extends ReceiptHeader {
+  line_count: number;
+  unassigned_lines: number; // lines without a bin
+  exception_lines: number; // lines with damaged or missing units
+  qc_diff_lines: number; // lines whose received qty differs or that have damage
+}
+
 export interface ASN {
   id: string;
   vendor_id: string;
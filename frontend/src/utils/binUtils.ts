@@ -47,15 +47,14 @@ export function isBinAvailable(bin: { status?: string }): boolean {
 
 /**
  * Gets the proper allocation status based on bin assignments
- * @param lines - Array of receipt lines
+ * @param lineCount - number of receipt lines
+ * @param unassigned - lines without a bin
  * @returns allocation status
  */
-export function getAllocationStatus(lines: Array<{ bin_id?: string; bin_code?: string }>): 'Not Started' | 'Partial' | 'Allocated' {
-  const totalLines = lines.length;
-  // Consider a line allocated only when both id and human-friendly code are available
-  const allocatedLines = lines.filter(l => l.bin_id && l.bin_code).length;
-  
+export function getAllocationStatus(lineCount: number, unassigned: number): 'Not Started' | 'Partial' | 'Allocated' {
+  const allocatedLines = lineCount - unassigned;
+
   if (allocatedLines === 0) return 'Not Started';
-  if (allocatedLines === totalLines) return 'Allocated';
+  if (allocatedLines === lineCount) return 'Allocated';
   return 'Partial';
 }